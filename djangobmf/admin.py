@@ -6,7 +6,9 @@ from __future__ import unicode_literals
 from django.contrib import admin
 
 from djangobmf.models import Configuration
+from djangobmf.models import CSVRenderer
 from djangobmf.models import Document
+from djangobmf.models import Job
 from djangobmf.models import Report
 from djangobmf.models import PDFRenderer
 
@@ -15,12 +17,13 @@ from djangobmf.forms import ReportUpdateForm
 
 
 admin.site.register(Configuration)
+admin.site.register(CSVRenderer)
 admin.site.register(PDFRenderer)
 
 
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
-    list_display = ('name', 'contenttype', 'renderer_ct', 'enabled', 'has_object')
+    list_display = ('name', 'contenttype', 'renderer_ct', 'enabled', 'has_object', 'schedule', 'next_snapshot')
     list_filter = ('enabled', 'has_object')
 
     def get_form(self, request, obj=None, **kwargs):
@@ -30,6 +33,13 @@ class ReportAdmin(admin.ModelAdmin):
             return ReportCreateForm
 
 
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('task', 'key', 'attempts', 'max_attempts', 'available', 'failed')
+    list_filter = ('failed', 'task')
+    readonly_fields = ('task', 'arguments', 'key', 'attempts', 'max_attempts', 'available', 'error', 'created')
+
+
 @admin.register(Document)
 class DocumentAdmin(admin.ModelAdmin):
     list_display = ('name', 'mimetype', 'size', 'sha1', 'is_static', 'content_type')
@@ -41,6 +41,14 @@ class BMFConfig(AppConfig):
                     if module_has_submodule(app_config.module, module):
                         raise
 
+        # revoke stateless tokens, when permissions change
+        from djangobmf.core.identity import connect_signals
+        connect_signals()
+
+        # update the search index, when objects of spanned relations change
+        from djangobmf.core.search import connect_signals as connect_search_signals
+        connect_search_signals()
+
     def get_module(self, model):
         """
         returs a module instance when called with a model class
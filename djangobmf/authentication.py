@@ -7,6 +7,8 @@ from django.contrib.auth import get_user_model
 from django.utils.translation import ugettext as _
 
 from djangobmf.conf import settings
+from djangobmf.core.identity import get_user
+from djangobmf.core.identity import get_version
 from djangobmf.utils.jwt import decode_handler
 
 from rest_framework.authentication import get_authorization_header
@@ -47,22 +49,28 @@ class JWTAuthentication(BaseAuthentication):
             msg = _('Credentials string should not contain spaces')
             raise AuthenticationFailed(msg)
 
-        # authenticate user
-        try:
-            payload = decode_handler(auth[1])
-        except jwt.ExpiredSignature:
-            msg = _('Signature has expired')
-            raise AuthenticationFailed(msg)
-        except jwt.DecodeError:
-            msg = _('Error decoding signature')
-            raise AuthenticationFailed(msg)
-        except jwt.InvalidTokenError:
-            raise AuthenticationFailed()
-
-        user = self.authenticate_credentials(payload)
+        # the token was already verified during this request
+        cached = getattr(getattr(request, '_request', request), '_bmf_jwt', None)
+        if cached and cached[0] == auth[1]:
+            user, data = cached[1], cached[2]
+        else:
+            # authenticate user
+            try:
+                data = decode_handler(auth[1])
+            except jwt.ExpiredSignature:
+                msg = _('Signature has expired')
+                raise AuthenticationFailed(msg)
+            except jwt.DecodeError:
+                msg = _('Error decoding signature')
+                raise AuthenticationFailed(msg)
+            except jwt.InvalidTokenError:
+                raise AuthenticationFailed()
+
+            user = self.authenticate_credentials(data)
+            setattr(getattr(request, '_request', request), '_bmf_jwt', (auth[1], user, data))
 
         if payload:
-            return (user, payload)
+            return (user, data)
         else:
             return (user, auth[1])
 
@@ -70,6 +78,13 @@ class JWTAuthentication(BaseAuthentication):
         """
         Returns an active user that matches the payload's user id and email.
         """
+        if settings.AUTH_STATELESS and 'uid' in payload:
+            version = get_version(payload['uid'])
+            # if the version counter was evicted from the cache, the user is
+            # loaded from the database
+            if version is not None:
+                return self.authenticate_claims(payload, version)
+
         User = get_user_model()  # noqa
         username = payload.get('username', None)
         # employee = payload.get('employee', None)
@@ -89,3 +104,24 @@ class JWTAuthentication(BaseAuthentication):
             raise AuthenticationFailed(msg)
 
         return user
+
+    def authenticate_claims(self, payload, version):
+        """
+        Returns the user of a stateless token without a database query, if the
+        token was not revoked by a change of the user's permissions.
+        """
+        if version != payload.get('ver'):
+            msg = _('Token has been revoked')
+            raise AuthenticationFailed(msg)
+
+        try:
+            user = get_user(payload, version)
+        except get_user_model().DoesNotExist:
+            msg = _('User is invalid')
+            raise AuthenticationFailed(msg)
+
+        if not user.is_active:
+            msg = _('User is disabled')
+            raise AuthenticationFailed(msg)
+
+        return user
@@ -32,10 +32,26 @@ class Settings(object):
     def USE_CELERY(self):  # noqa
         return getattr(djsettings, 'BMF_USE_CELERY', False)
 
+    @property
+    def TASK_BACKEND(self):  # noqa
+        return getattr(djsettings, 'BMF_TASK_BACKEND', None)
+
+    @property
+    def TASK_THREADS(self):  # noqa
+        return getattr(djsettings, 'BMF_TASK_THREADS', 4)
+
+    @property
+    def TASK_VISIBILITY_TIMEOUT(self):  # noqa
+        return getattr(djsettings, 'BMF_TASK_VISIBILITY_TIMEOUT', 300)
+
     @property
     def CACHE_DEFAULT_CONNECTION(self):  # noqa
         return getattr(djsettings, 'BMF_CACHE_DEFAULT_CONNECTION', 'default')
 
+    @property
+    def SEARCH_BACKEND(self):  # noqa
+        return getattr(djsettings, 'BMF_SEARCH_BACKEND', None)
+
     @property
     def CONTRIB_ACCOUNT(self):  # noqa
         if not hasattr(djsettings, 'BMF_CONTRIB_ACCOUNT'):
@@ -190,6 +206,18 @@ class Settings(object):
             setattr(djsettings, 'BMF_DOCUMENT_SENDTYPE', None)
         return getattr(djsettings, 'BMF_DOCUMENT_SENDTYPE')
 
+    @property
+    def DOCUMENT_PREVIEW_SIZES(self):  # noqa
+        return getattr(djsettings, 'BMF_DOCUMENT_PREVIEW_SIZES', {'thumbnail': 128, 'page': 1024})
+
+    @property
+    def DOCUMENT_PREVIEW_PDFTOPPM(self):  # noqa
+        return getattr(djsettings, 'BMF_DOCUMENT_PREVIEW_PDFTOPPM', 'pdftoppm')
+
+    @property
+    def DOCUMENT_PREVIEW_TIMEOUT(self):  # noqa
+        return getattr(djsettings, 'BMF_DOCUMENT_PREVIEW_TIMEOUT', 30)
+
     @property
     def DOCUMENT_PERMISSIONS_FILE(self):  # noqa
         if not hasattr(djsettings, 'BMF_DOCUMENT_PERMISSIONS_FILE'):
@@ -202,10 +230,35 @@ class Settings(object):
             setattr(djsettings, 'BMF_DOCUMENT_PERMISSIONS_DIR', djsettings.FILE_UPLOAD_DIRECTORY_PERMISSIONS)
         return getattr(djsettings, 'BMF_DOCUMENT_PERMISSIONS_DIR')
 
+    @property
+    def REPORT_WORKERS(self):  # noqa
+        return getattr(djsettings, 'BMF_REPORT_WORKERS', None)
+
+    @property
+    def REPORT_LANGUAGES(self):  # noqa
+        return getattr(djsettings, 'BMF_REPORT_LANGUAGES', None) or [djsettings.LANGUAGE_CODE]
+
+    @property
+    def REPORT_SNAPSHOTS_KEEP(self):  # noqa
+        return getattr(djsettings, 'BMF_REPORT_SNAPSHOTS_KEEP', 10)
+
+    @property
+    def CHANGES_DELAY(self):  # noqa
+        return getattr(djsettings, 'BMF_CHANGES_DELAY', 5)
+
+    @property
+    def CHANGES_WINDOW(self):  # noqa
+        return getattr(djsettings, 'BMF_CHANGES_WINDOW', 60)
+
+    @property
+    def EMAIL_BASE_URL(self):  # noqa
+        return getattr(djsettings, 'BMF_EMAIL_BASE_URL', '')
+
     @property
     def REPORTING(self):  # noqa
         return getattr(djsettings, 'BMF_REPORTING', {
             'pdf': ['djangobmf.models.PDFRenderer'],
+            'csv': ['djangobmf.models.CSVRenderer'],
         })
 
     @property
@@ -236,6 +289,14 @@ class Settings(object):
     def AUTH_ALGORITHMS(self):  # noqa
         return getattr(djsettings, 'BMF_AUTH_ALGORITHMS', ['HS256'])
 
+    @property
+    def AUTH_STATELESS(self):  # noqa
+        return getattr(djsettings, 'BMF_AUTH_STATELESS', False)
+
+    @property
+    def AUTH_USER_CACHE_TTL(self):  # noqa
+        return getattr(djsettings, 'BMF_AUTH_USER_CACHE_TTL', 60)
+
     def patch(self):
         """
         This function is used to update django.conf.settings in the testrunner.
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf_accounting', '0006_symmetrical_false'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='account',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modified', null=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modified', null=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='transactionitem',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modified', null=True, db_index=True),
+        ),
+    ]
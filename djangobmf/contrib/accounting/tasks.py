@@ -7,7 +7,7 @@ from django.apps import apps
 from django.db.models import Sum
 
 from djangobmf.conf import settings
-from djangobmf.decorators import optional_celery
+from djangobmf.core.tasks import task
 
 from decimal import Decimal
 
@@ -49,6 +49,6 @@ def _calc_account_balance(pk):
         _calc_account_balance(obj.pk)
 
 
-@optional_celery
+@task(key='balance:account:{0}')
 def calc_account_balance(pk):
     _calc_account_balance(pk)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf_customer', '0004_update_to_onetoonefield'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modified', null=True, db_index=True),
+        ),
+    ]
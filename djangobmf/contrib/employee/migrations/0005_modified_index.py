@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf_employee', '0004_changes_email_field'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employee',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modified', null=True, db_index=True),
+        ),
+    ]
@@ -55,3 +55,4 @@ class InvoiceReport(PDFReport):
     model = Invoice
     verbose_name = _('Print Invoice')
     has_object = True
+    prerender_states = ['open']
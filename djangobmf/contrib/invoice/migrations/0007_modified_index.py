@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf_invoice', '0006_products_to_frameworkmodelclass'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='invoice',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modified', null=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='invoiceproduct',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modified', null=True, db_index=True),
+        ),
+    ]
@@ -54,6 +54,7 @@ class BaseInvoice(BMFModel):
     class BMFMeta:
         workflow = InvoiceWorkflow
         serializer = InvoiceSerializer
+        report_related = ['invoice_products', 'invoice_address', 'shipping_address']
 
     @staticmethod
     def post_save(sender, instance, created, raw, *args, **kwargs):
@@ -95,6 +96,7 @@ class AbstractInvoice(BaseInvoice):
     class BMFMeta(BaseInvoice.BMFMeta):
         has_files = True
         has_comments = True
+        report_related = BaseInvoice.BMFMeta.report_related + ['employee']
 
     def bmfget_customer(self):
         if hasattr(self, 'customer'):
@@ -55,3 +55,4 @@ class QuotationReport(PDFReport):
     model = Quotation
     verbose_name = _('Print Quotation')
     has_object = True
+    prerender_states = ['send']
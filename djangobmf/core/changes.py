@@ -0,0 +1,147 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.utils import timezone
+
+from djangobmf.conf import settings as bmfsettings
+from djangobmf.core.filter_queryset import FilterQueryset
+
+from datetime import datetime
+from datetime import timedelta
+
+
+CURSOR_FORMAT = '%Y%m%d%H%M%S%f'
+
+
+class Cursor(object):
+    """
+    The position in the change feed of a model: the modification time and
+    primary key of the last changed object and the last tombstone
+    """
+
+    def __init__(self, modified=None, pk=0, tombstone=0):
+        self.modified = modified
+        self.pk = pk
+        self.tombstone = tombstone
+
+    def __str__(self):
+        if self.modified is None:
+            modified = '0'
+        else:
+            modified = self.modified
+            if timezone.is_aware(modified):
+                modified = timezone.make_naive(modified, timezone.utc)
+            modified = modified.strftime(CURSOR_FORMAT)
+        return '%s-%s-%s' % (modified, self.pk, self.tombstone)
+
+    @classmethod
+    def parse(cls, value):
+        """
+        returns the cursor of a string. Raises a ValueError, if the string
+        is not a valid cursor
+        """
+        if not value:
+            return cls()
+
+        modified, pk, tombstone = value.split('-')
+        if modified == '0':
+            modified = None
+        else:
+            modified = datetime.strptime(modified, CURSOR_FORMAT)
+            if settings.USE_TZ:
+                modified = timezone.make_aware(modified, timezone.utc)
+        return cls(modified, int(pk), int(tombstone))
+
+
+def is_restricted(model):
+    """
+    returns True, if the objects of the model are filtered per user
+    """
+    bmfmeta = getattr(model, '_bmfmeta', None)
+    return bmfmeta is not None and type(bmfmeta.filter_queryset) is not FilterQueryset
+
+
+def get_changes(queryset, cursor, limit, delay=None, window=None, restricted=None):
+    """
+    returns the changed objects of the queryset and the deleted objects of its
+    model after the cursor, ordered by time, as a list of ``(action, pk)``
+    tuples (action is ``created``, ``updated`` or ``deleted``), the next cursor
+    and a flag, if more changes are available.
+
+    If the objects of the model are filtered per user (``restricted``), the
+    deleted objects are only returned to clients, which synced the feed before
+    the objects were deleted. A new client does not learn the ids of objects,
+    which it never could see.
+
+    Changes of the last ``delay`` seconds (``BMF_CHANGES_DELAY``) are not
+    returned, so transactions, which are not committed yet, are not skipped.
+    At the end of the feed, the cursor is moved back by ``window`` seconds
+    (``BMF_CHANGES_WINDOW``), because the changes of transactions, which
+    were committed later, are ordered before the cursor.
+    """
+    Tombstone = apps.get_model(bmfsettings.APP_LABEL, 'Tombstone')
+    if restricted is None:
+        restricted = is_restricted(queryset.model)
+    if delay is None:
+        delay = bmfsettings.CHANGES_DELAY
+    if window is None:
+        window = bmfsettings.CHANGES_WINDOW
+    until = timezone.now() - timedelta(seconds=delay)
+
+    objects = queryset.filter(modified__isnull=False, modified__lte=until)
+    if cursor.modified is not None:
+        objects = objects.filter(Q(modified__gt=cursor.modified) | Q(modified=cursor.modified, pk__gt=cursor.pk))
+    objects = list(objects.order_by('modified', 'pk').values_list('pk', 'modified', 'created')[:limit + 1])
+
+    tombstones = Tombstone.objects.filter(
+        object_ct=ContentType.objects.get_for_model(queryset.model),
+        pk__gt=cursor.tombstone,
+        deleted__lte=until,
+    )
+    if restricted:
+        if cursor.modified is None:
+            tombstones = tombstones.none()
+        else:
+            tombstones = tombstones.filter(deleted__gt=cursor.modified)
+    tombstones = list(tombstones.order_by('pk').values_list('pk', 'object_id', 'deleted')[:limit + 1])
+
+    # objects created after the cursor are new to the client
+    start = cursor.modified
+
+    changes = []
+    cursor = Cursor(cursor.modified, cursor.pk, cursor.tombstone)
+    i = j = 0
+    while len(changes) < limit and (i < len(objects) or j < len(tombstones)):
+        if j >= len(tombstones) or (i < len(objects) and objects[i][1] <= tombstones[j][2]):
+            pk, modified, created = objects[i]
+            if start is None or (created is not None and created > start):
+                changes.append(('created', pk))
+            else:
+                changes.append(('updated', pk))
+            cursor.modified, cursor.pk = modified, pk
+            i += 1
+        else:
+            pk, object_id, deleted = tombstones[j]
+            changes.append(('deleted', object_id))
+            cursor.tombstone = pk
+            j += 1
+
+    more = i < len(objects) or j < len(tombstones)
+
+    if not more and window:
+        rescan = until - timedelta(seconds=window)
+        if cursor.modified is not None and cursor.modified > rescan:
+            cursor.modified, cursor.pk = rescan, 0
+        last = Tombstone.objects.filter(
+            object_ct=ContentType.objects.get_for_model(queryset.model),
+            deleted__lte=rescan,
+        ).order_by('-pk').values_list('pk', flat=True)[:1]
+        cursor.tombstone = min(cursor.tombstone, last[0] if last else 0)
+
+    return changes, cursor, more
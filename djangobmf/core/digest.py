@@ -0,0 +1,144 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.conf import settings as djsettings
+from django.contrib.contenttypes.models import ContentType
+from django.core.mail import get_connection
+from django.core.urlresolvers import reverse
+from django.db.models import F
+from django.db.models import Q
+from django.utils import timezone
+from django.utils import translation
+
+from djangobmf.conf import settings
+from djangobmf.core.email import EmailMessage
+from djangobmf.core.email import get_templates
+
+from collections import OrderedDict
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+TEMPLATE_BASE = 'djangobmf/notification/digest'
+
+
+def get_model():
+    return apps.get_model(settings.APP_LABEL, 'Notification')
+
+
+def get_user_language(user):
+    """
+    returns the language of the digest. User models with a ``language``
+    attribute can select a language, otherwise ``LANGUAGE_CODE`` is used
+    """
+    return getattr(user, 'language', None) or djsettings.LANGUAGE_CODE
+
+
+def get_pending(until=None):
+    """
+    returns the unread notifications, which changed since the last digest
+    """
+    queryset = get_model().objects.filter(
+        Q(emailed__isnull=True) | Q(emailed__lt=F('modified')),
+        unread=True,
+        triggered=True,
+        user__isnull=False,
+        watch_id__isnull=False,
+    ).exclude(user__email='')
+    if until is not None:
+        queryset = queryset.filter(modified__lte=until)
+    return queryset
+
+
+def get_item(notification):
+    title = notification.title
+    if title is None:
+        obj = notification.watch_object
+        if obj is None:
+            return None
+        title = '%s' % obj
+
+    model = ContentType.objects.get_for_id(notification.watch_ct_id).model_class()
+    if model is None:
+        return None
+
+    return {
+        'title': title,
+        'model': model._meta.verbose_name,
+        'url': settings.EMAIL_BASE_URL + reverse('djangobmf:notification', kwargs={
+            'app': model._meta.app_label,
+            'model': model._meta.model_name,
+            'pk': notification.watch_id,
+        }),
+        'modified': notification.modified,
+        'notification': notification,
+    }
+
+
+def render_digests(notifications, templates):
+    """
+    returns the digest messages and the primary keys of their notifications.
+    The users are grouped by language, so the translation is activated once
+    per language
+    """
+    users = OrderedDict()
+    for notification in notifications:
+        users.setdefault(notification.user, []).append(notification)
+
+    languages = OrderedDict()
+    for user in users:
+        languages.setdefault(get_user_language(user), []).append(user)
+
+    messages = []
+    pks = []
+    for language, language_users in languages.items():
+        with translation.override(language):
+            for user in language_users:
+                items = [i for i in map(get_item, users[user]) if i is not None]
+                pks.extend(n.pk for n in users[user])
+                if not items:
+                    continue
+                messages.append(EmailMessage(
+                    to=[user.email],
+                    templates=templates,
+                    context={'user': user, 'items': items, 'count': len(items)},
+                ))
+    return messages, pks
+
+
+def send_digests(batch_size=500, connection=None):
+    """
+    sends a digest of their unread notifications to all users with one
+    connection to the mail server. returns the number of sent messages
+    """
+    Notification = get_model()
+    now = timezone.now()
+    templates = get_templates(TEMPLATE_BASE)
+
+    users = list(get_pending(now).order_by('user').values_list('user', flat=True).distinct())
+    if not users:
+        return 0
+
+    connection = connection or get_connection()
+    connection.open()
+
+    count = 0
+    try:
+        for i in range(0, len(users), batch_size):
+            notifications = get_pending(now).filter(user__in=users[i:i + batch_size]) \
+                .select_related('user') \
+                .order_by('user', '-modified')
+
+            messages, pks = render_digests(notifications, templates)
+            if messages:
+                count += connection.send_messages(messages) or 0
+            Notification.objects.filter(pk__in=pks).update(emailed=now)
+    finally:
+        connection.close()
+
+    logger.debug('Sent %s notification digests', count)
+    return count
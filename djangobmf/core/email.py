@@ -10,24 +10,35 @@ from django.utils.translation import activate
 from django.utils.translation import get_language
 
 
+def get_templates(template_base):
+    """
+    returns the compiled subject, plain and html templates of ``template_base``,
+    missing templates are ``None``. The result can be used for many messages
+    """
+    templates = {
+        'subject': template_base + '.subject',
+        'plain': template_base + '.plain',
+        'html': template_base + '.html',
+    }
+    for key, value in templates.items():
+        try:
+            templates[key] = get_template(value)
+        except TemplateDoesNotExist:
+            templates[key] = None
+    return templates
+
+
 class EmailMessage(EmailMultiAlternatives):
 
     def __init__(self, *args, **kwargs):
 
         template_base = kwargs.pop('template_base', None)
-        if template_base:
-            templates = {
-                'subject': template_base + '.subject',
-                'plain': template_base + '.plain',
-                'html': template_base + '.html',
-            }
-            for key, value in templates.items():
-                try:
-                    templates[key] = get_template(value)
-                except TemplateDoesNotExist:
-                    templates[key] = None
-        else:
-            templates = {}
+        templates = kwargs.pop('templates', None)
+        if templates is None:
+            if template_base:
+                templates = get_templates(template_base)
+            else:
+                templates = {}
 
         language = kwargs.pop('language', None)
         old_language = get_language()
@@ -34,6 +34,14 @@ class Employee(object):
         # append this class to the user class
         user.djangobmf = self
 
+    def preload(self, employee, team):
+        """
+        sets the employee and the team ids, i.e. from the claims of a token
+        """
+        self._employee = employee
+        self._team = team
+        self._evalteam = True
+
     @property
     def employee(self):
         if not self.has_employee or self._employee:
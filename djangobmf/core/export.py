@@ -0,0 +1,92 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.utils.encoding import force_str
+
+from djangobmf.core.serializers.values import ValuesSerializer
+from djangobmf.utils.serializers import DjangoBMFEncoder
+
+import csv
+import json
+
+
+class Echo(object):
+    """
+    File-like object which returns the written value instead of
+    buffering it, used to stream the output of ``csv.writer``
+    """
+
+    def write(self, value):
+        return value
+
+
+def get_chunks(queryset, chunk_size):
+    """
+    Splits the queryset in chunks of ``chunk_size`` objects. Every chunk
+    is selected by a primary key range, so memory usage does not depend
+    on the size of the queryset.
+    """
+    queryset = queryset.order_by('pk')
+    last = None
+
+    while True:
+        pks = queryset if last is None else queryset.filter(pk__gt=last)
+        pks = list(pks.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+
+        if last is None:
+            yield queryset.filter(pk__lte=pks[-1])
+        else:
+            yield queryset.filter(pk__gt=last, pk__lte=pks[-1])
+        last = pks[-1]
+
+
+def get_rows(serializer, queryset, chunk_size):
+    """
+    yields the objects of the queryset as dictionaries, serialized by the
+    serializer (an instance without data, which provides the fields and
+    the context)
+    """
+    values = ValuesSerializer.compile(serializer)
+
+    for chunk in get_chunks(queryset, chunk_size):
+        if values is None:
+            data = serializer.__class__(chunk.iterator(), many=True, context=serializer.context).data
+        else:
+            data = values.to_representation(values.get_queryset(chunk).iterator())
+
+        for row in data:
+            yield row
+
+
+def stream_csv(rows, delimiter=',', header=True):
+    """
+    yields the rows as lines of a csv file. The columns are taken from
+    the first row
+    """
+    writer = csv.writer(Echo(), delimiter=force_str(delimiter))
+    columns = None
+
+    for row in rows:
+        if columns is None:
+            columns = list(row.keys())
+            if header:
+                yield writer.writerow([force_str(key) for key in columns])
+
+        values = []
+        for key in columns:
+            value = row[key]
+            if value is None:
+                value = ''
+            elif isinstance(value, (list, dict)):
+                value = json.dumps(value, cls=DjangoBMFEncoder)
+            values.append(force_str(value))
+        yield writer.writerow(values)
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoBMFEncoder) + '\n'
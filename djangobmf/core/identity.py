@@ -0,0 +1,187 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import signals
+
+from djangobmf.conf import settings
+from djangobmf.core.employee import Employee
+
+import copy
+import time
+import logging
+logger = logging.getLogger(__name__)
+
+
+VERSION_CACHE_KEY = 'djangobmf.identity.version.%s'
+GLOBAL_VERSION_CACHE_KEY = 'djangobmf.identity.version'
+
+# maximal number of users in the process cache
+USER_CACHE_SIZE = 1000
+
+# users by their primary key: (expires, version, user, employee)
+_users = {}
+
+
+def get_cache():
+    return caches[settings.CACHE_DEFAULT_CONNECTION]
+
+
+def get_initial_version():
+    # a recreated counter (i.e. after it was evicted) is larger than the old one
+    return int(time.time() * 1000000)
+
+
+def get_version(pk):
+    """
+    returns the permission version of a user as a list of the global
+    version and the version of the user or ``None``, if it is not cached
+    """
+    keys = [GLOBAL_VERSION_CACHE_KEY, VERSION_CACHE_KEY % pk]
+    values = get_cache().get_many(keys)
+    if len(values) < 2:
+        return None
+    return [values[key] for key in keys]
+
+
+def create_version(pk):
+    """
+    returns the permission version of a user and creates missing counters
+    """
+    cache = get_cache()
+    cache.add(GLOBAL_VERSION_CACHE_KEY, get_initial_version(), None)
+    cache.add(VERSION_CACHE_KEY % pk, get_initial_version(), None)
+    return get_version(pk)
+
+
+def bump_version(pk=None):
+    """
+    increments the permission version of the user with the primary key
+    ``pk`` (or of all users), which revokes their stateless tokens
+    """
+    cache = get_cache()
+    key = GLOBAL_VERSION_CACHE_KEY if pk is None else VERSION_CACHE_KEY % pk
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, get_initial_version(), None)
+
+    if pk is None:
+        _users.clear()
+    else:
+        _users.pop(pk, None)
+
+
+def get_claims(user):
+    """
+    returns the identity claims of a stateless token
+    """
+    employee = Employee(user)
+    try:
+        obj = employee.employee
+    except ObjectDoesNotExist:
+        obj = None
+
+    return {
+        'uid': user.pk,
+        'employee': obj.pk if obj else None,
+        'teams': list(employee.team) if obj else [],
+        'ver': create_version(user.pk),
+    }
+
+
+def get_user(claims, version):
+    """
+    returns the user of the claims with a preloaded ``Employee``. The user,
+    its permissions and employee are cached in the process for
+    ``BMF_AUTH_USER_CACHE_TTL`` seconds or until the version changes.
+    Raises ``DoesNotExist`` if the user was deleted
+    """
+    pk = claims['uid']
+    now = time.time()
+
+    entry = _users.get(pk)
+    if entry is None or entry[0] < now or entry[1] != version:
+        user = get_user_model()._default_manager.get(pk=pk)
+        # the permissions are cached on the instance and shared by its copies
+        user.get_all_permissions()
+
+        employee = None
+        if claims.get('employee'):
+            try:
+                employee = apps.get_model(settings.CONTRIB_EMPLOYEE)._default_manager.get(pk=claims['employee'])
+            except (LookupError, ObjectDoesNotExist):
+                pass
+
+        if len(_users) >= USER_CACHE_SIZE:
+            _users.clear()
+        entry = (now + settings.AUTH_USER_CACHE_TTL, version, user, employee)
+        _users[pk] = entry
+
+    user = copy.copy(entry[2])
+    Employee(user).preload(entry[3], claims.get('teams', []))
+    return user
+
+
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # logins only update the last_login field
+    if update_fields and set(update_fields) <= set(['last_login']):
+        return
+    bump_version(instance.pk)
+
+
+def user_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        bump_version(instance.pk)
+    elif pk_set:
+        for pk in pk_set:
+            bump_version(pk)
+    else:
+        # the users of a cleared group are unknown
+        bump_version()
+
+
+def global_changed(*args, **kwargs):
+    bump_version()
+
+
+def employee_changed(sender, instance, **kwargs):
+    if instance.user_id:
+        bump_version(instance.user_id)
+
+
+def connect_signals():
+    """
+    revokes the stateless tokens of users, when their permissions,
+    employee or teams change
+    """
+    User = get_user_model()  # noqa
+    signals.post_save.connect(user_changed, sender=User, weak=False)
+    signals.post_delete.connect(user_changed, sender=User, weak=False)
+    signals.m2m_changed.connect(user_relations_changed, sender=User.groups.through, weak=False)
+    signals.m2m_changed.connect(user_relations_changed, sender=User.user_permissions.through, weak=False)
+    signals.m2m_changed.connect(global_changed, sender=Group.permissions.through, weak=False)
+    signals.post_delete.connect(global_changed, sender=Group, weak=False)
+
+    try:
+        employee = apps.get_model(settings.CONTRIB_EMPLOYEE)
+        signals.post_save.connect(employee_changed, sender=employee, weak=False)
+        signals.post_delete.connect(employee_changed, sender=employee, weak=False)
+    except LookupError:
+        pass
+
+    # team memberships are rare, all tokens are revoked
+    try:
+        member = apps.get_model(settings.CONTRIB_TEAM).members.through
+        signals.post_save.connect(global_changed, sender=member, weak=False)
+        signals.post_delete.connect(global_changed, sender=member, weak=False)
+    except LookupError:
+        pass
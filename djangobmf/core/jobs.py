@@ -0,0 +1,186 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.db import IntegrityError
+from django.db import connections
+from django.db import router
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from djangobmf.conf import settings
+from djangobmf.core.tasks import discard_pending
+from djangobmf.core.tasks import get_task
+from djangobmf.core.tasks import run_pending
+from djangobmf.utils.serializers import DjangoBMFEncoder
+
+from datetime import timedelta
+from multiprocessing.pool import ThreadPool
+
+import json
+import time
+import traceback
+import logging
+logger = logging.getLogger(__name__)
+
+
+# seconds until the first retry of a failed job (doubled with every attempt)
+RETRY_DELAY = 60
+
+
+def get_model():
+    return apps.get_model(settings.APP_LABEL, 'Job')
+
+
+def enqueue(task, args=(), kwargs=None, key=None):
+    """
+    stores a job of the task in the current transaction. Returns ``None``
+    if a pending job with the same key exists
+    """
+    Job = get_model()
+    kwargs = kwargs or {}
+
+    job = Job(
+        task=task.name,
+        arguments=json.dumps({'args': list(args), 'kwargs': kwargs}, cls=DjangoBMFEncoder),
+        key=key or task.get_key(args, kwargs),
+        max_attempts=task.retries + 1,
+    )
+
+    if job.key is None:
+        job.save()
+        return job
+
+    try:
+        with transaction.atomic(using=router.db_for_write(Job)):
+            job.save()
+    except IntegrityError:
+        logger.debug('Job %s is already queued', job.key)
+        return None
+    return job
+
+
+def claim(limit=1, timeout=None):
+    """
+    claims up to ``limit`` available jobs, which are hidden from other
+    workers for ``timeout`` seconds (default: ``BMF_TASK_VISIBILITY_TIMEOUT``).
+    The key of a claimed job is removed, so the task can be queued again
+    while it is running
+    """
+    Job = get_model()
+    using = router.db_for_write(Job)
+    now = timezone.now()
+
+    queryset = Job.objects.filter(failed=False, available__lte=now).order_by('available', 'pk')
+    values = {
+        'available': now + timedelta(seconds=timeout or settings.TASK_VISIBILITY_TIMEOUT),
+        'attempts': F('attempts') + 1,
+        'key': None,
+    }
+
+    if getattr(connections[using].features, 'has_select_for_update_skip_locked', False):
+        with transaction.atomic(using=using):
+            pks = list(queryset.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Job.objects.filter(pk__in=pks).update(**values)
+    else:
+        # a conditional update claims a job only once
+        pks = []
+        for pk, available in queryset.values_list('pk', 'available')[:limit]:
+            if Job.objects.filter(pk=pk, available=available).update(**values):
+                pks.append(pk)
+
+    return list(Job.objects.filter(pk__in=pks))
+
+
+def execute(job):
+    """
+    runs a claimed job in a transaction. Finished jobs are deleted, failed
+    jobs are retried with an exponential backoff until ``max_attempts`` is
+    reached. returns True, if the job was successful
+    """
+    Job = job.__class__
+
+    try:
+        task = get_task(job.task)
+        data = json.loads(job.arguments)
+        with transaction.atomic(using=router.db_for_write(Job)):
+            task.run(*data['args'], **data['kwargs'])
+        run_pending()
+    except Exception:
+        discard_pending()
+        logger.exception('Job %s (%s) failed', job.pk, job.task)
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(failed=True, error=error)
+        else:
+            delay = RETRY_DELAY * 2 ** (job.attempts - 1)
+            Job.objects.filter(pk=job.pk).update(
+                available=timezone.now() + timedelta(seconds=delay),
+                error=error,
+            )
+        return False
+
+    Job.objects.filter(pk=job.pk).delete()
+    return True
+
+
+class Worker(object):
+    """
+    Executes the jobs of the database queue with a pool of ``threads``
+    """
+
+    def __init__(self, threads=1, timeout=None, poll=1.0, callback=None):
+        self.threads = threads
+        self.timeout = timeout
+        self.poll = poll
+        self.callback = callback
+        self.stopped = False
+
+    def execute(self, job):
+        try:
+            return execute(job)
+        finally:
+            if self.threads > 1:
+                # every thread has its own database connections
+                connections.close_all()
+
+    def run_once(self, pool=None):
+        """
+        executes one batch of jobs and returns the number of jobs
+        """
+        jobs = claim(self.threads, self.timeout)
+        if pool is not None:
+            results = pool.map(self.execute, jobs)
+        else:
+            results = [self.execute(job) for job in jobs]
+
+        if self.callback and jobs:
+            self.callback(len(jobs), results.count(False))
+        return len(jobs)
+
+    def run(self, burst=False):
+        """
+        executes jobs until the worker is stopped (or the queue is empty,
+        if ``burst`` is set). returns the number of executed jobs
+        """
+        pool = ThreadPool(self.threads) if self.threads > 1 else None
+        count = 0
+        try:
+            while not self.stopped:
+                executed = self.run_once(pool)
+                count += executed
+                if not executed:
+                    if burst:
+                        break
+                    time.sleep(self.poll)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return count
+
+    def stop(self, *args):
+        self.stopped = True
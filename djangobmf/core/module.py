@@ -11,10 +11,12 @@ from django.core.exceptions import ImproperlyConfigured
 from django.db.models import signals
 from django.http import Http404
 from django.utils import six
+from django.utils import translation
 from django.utils.text import slugify
 
 from rest_framework.reverse import reverse
 
+from djangobmf.conf import settings as bmfsettings
 from djangobmf.core.relationship import DocumentRelationship
 from djangobmf.core.serializers.document import DocumentSerializer
 from djangobmf.core.workflow import Workflow
@@ -270,10 +272,26 @@ class Module(object):
     def add_class_report(self, report):
         """
         """
-        self._class_reports[report.__name__] = {
+        name = report.__module__ + '.' + report.__name__
+        self._class_reports[name] = {
             'class': report,
+            'view': None,
         }
 
+    def get_snapshot_report(self, slug):
+        """
+        returns the report ``slug`` and its report class, if it is not
+        connected to an object
+        """
+        obj = self.bmfconfig.get_model("Report").objects.get(
+            contenttype=self.get_contenttype(),
+            enabled=True,
+            slug=slug,
+        )
+        if obj.renderer_view not in self._class_reports or not obj.renderer:
+            raise Http404
+        return obj, self._class_reports[obj.renderer_view]['class']
+
     # --- Object specific reports ---------------------------------------------
 
     def get_object_reports(self):
@@ -298,8 +316,10 @@ class Module(object):
                 self.bmfconfig.get_model("Report").objects.filter(pk=data['pk']).update(enabled=False)
         return items
 
-    def get_object_report(self, slug):
+    def get_object_report_data(self, slug):
         """
+        returns the registered report (with ``class`` and ``view``) and the
+        renderer of the report ``slug``
         """
         obj = self.bmfconfig.get_model("Report").objects.get(
             contenttype=self.get_contenttype(),
@@ -311,15 +331,48 @@ class Module(object):
             raise Http404
 
         if obj.renderer_view in self._object_reports:
-            report = self._object_reports[obj.renderer_view]
-
-            if not report["view"]:
-                report["view"] = report["class"].as_view()
-
-            return report['view'], obj.renderer
+            return self._object_reports[obj.renderer_view], obj.renderer
         else:
             raise Http404
 
+    def get_object_report(self, slug):
+        """
+        """
+        report, renderer = self.get_object_report_data(slug)
+
+        if not report["view"]:
+            report["view"] = report["class"].as_view()
+
+        return report['view'], renderer
+
+    def has_prerender_reports(self, state):
+        """
+        returns True, if a report should be rendered, when an object
+        reaches the workflow state
+        """
+        return any(state in report['class'].prerender_states for report in self._object_reports.values())
+
+    def prerender_object_reports(self, obj, state):
+        """
+        renders and stores all reports of the object, which are configured
+        to be rendered in the workflow state, in the ``BMF_REPORT_LANGUAGES``
+        """
+        qs = self.bmfconfig.get_model("Report").objects.filter(
+            contenttype=self.get_contenttype(),
+            enabled=True
+        )
+        count = 0
+        for report in qs:
+            if report.renderer_view not in self._object_reports or not report.renderer:
+                continue
+            cls = self._object_reports[report.renderer_view]['class']
+            if state in cls.prerender_states:
+                for language in bmfsettings.REPORT_LANGUAGES:
+                    with translation.override(language):
+                        cls.prerender(obj, report.renderer, report.slug)
+                count += 1
+        return count
+
     def add_object_report(self, report):
         """
         """
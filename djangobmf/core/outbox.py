@@ -0,0 +1,174 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.db import router
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import DateTimeField
+from django.db.models import Value
+from django.db.models import When
+from django.utils import timezone
+
+from djangobmf.conf import settings
+from djangobmf.core.tasks import is_async
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# functions, which are called with every processed event
+consumers = []
+
+
+def consumer(func):
+    """
+    Decorator which registers a function, which is called with every event
+    (in order) after its activity was created
+    """
+    consumers.append(func)
+    return func
+
+
+def get_model():
+    return apps.get_model(settings.APP_LABEL, 'Event')
+
+
+def record_event(sender, instance, action, user=None, text=None):
+    """
+    writes an event of the object in the current transaction. With a task
+    queue the drainer is scheduled, otherwise only this event is processed
+    """
+    from djangobmf.tasks import drain_events
+
+    event = get_model().objects.create(
+        parent_ct=ContentType.objects.get_for_model(sender),
+        parent_id=instance.pk,
+        action=action,
+        user=user,
+        text=text,
+    )
+    if is_async():
+        drain_events()
+    else:
+        # the request does not lock or process the events of other requests,
+        # these are left to ``manage.py bmf_events``
+        process([event], router.db_for_write(event.__class__))
+    return event
+
+
+def create_activities(events, using=None):
+    """
+    creates the activities of the events, which are dated to the creation
+    of their events, and returns them
+    """
+    Activity = apps.get_model(settings.APP_LABEL, 'Activity')
+
+    activities = [
+        Activity(
+            user_id=event.user_id,
+            parent_ct_id=event.parent_ct_id,
+            parent_id=event.parent_id,
+            action=event.action,
+            text=event.text,
+        )
+        for event in events
+    ]
+    if not activities:
+        return activities
+
+    if getattr(connections[using or router.db_for_write(Activity)].features, 'can_return_ids_from_bulk_insert', False):
+        Activity.objects.bulk_create(activities)
+    else:
+        # without the primary keys of a bulk insert, the activities can not
+        # be matched to their events safely
+        for activity in activities:
+            activity.save()
+
+    # modified is set automatically to the current time
+    Activity.objects.filter(pk__in=[activity.pk for activity in activities]).update(modified=Case(
+        *[When(pk=activity.pk, then=Value(event.created)) for event, activity in zip(events, activities)],
+        output_field=DateTimeField()
+    ))
+    for event, activity in zip(events, activities):
+        activity.modified = event.created
+
+    return activities
+
+
+def call_consumers(event, using=None):
+    """
+    calls the consumers with the event. An error of a consumer is
+    logged and does not stop the other consumers
+    """
+    for func in consumers:
+        try:
+            with transaction.atomic(using=using):
+                func(event)
+        except Exception:
+            logger.exception('Consumer %s failed to process event %s', func.__name__, event.pk)
+
+
+def process(events, using=None):
+    """
+    creates the activities of the events, notifies the watching users,
+    calls the consumers and marks the events as processed
+    """
+    from djangobmf.tasks.notification import djangobmf_user_watch
+
+    for event, activity in zip(events, create_activities(events, using)):
+        try:
+            with transaction.atomic(using=using):
+                djangobmf_user_watch.run(activity.pk)
+        except Exception:
+            logger.exception('Can not notify the users of activity %s', activity.pk)
+        call_consumers(event, using)
+
+    get_model().objects.filter(pk__in=[event.pk for event in events]).update(processed=timezone.now())
+
+
+def drain(batch_size=500):
+    """
+    processes the pending events in order. returns the number of
+    processed events
+    """
+    Event = get_model()
+    using = router.db_for_write(Event)
+
+    count = 0
+    while True:
+        with transaction.atomic(using=using):
+            events = list(Event.objects.select_for_update().filter(processed__isnull=True).order_by('pk')[:batch_size])
+            if not events:
+                break
+            process(events, using)
+
+        count += len(events)
+        if len(events) < batch_size:
+            break
+    return count
+
+
+def replay(start, batch_size=500):
+    """
+    calls the consumers with all processed events from the primary key
+    ``start``. returns the number of events
+    """
+    Event = get_model()
+    using = router.db_for_write(Event)
+
+    count = 0
+    queryset = Event.objects.filter(processed__isnull=False).order_by('pk')
+    while True:
+        events = list(queryset.filter(pk__gte=start)[:batch_size])
+        for event in events:
+            call_consumers(event, using)
+        count += len(events)
+        if len(events) < batch_size:
+            break
+        start = events[-1].pk + 1
+    return count
@@ -49,3 +49,25 @@ class DocumentPermission(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         return request.user.has_perms(self.get_perms(request, view), obj)
+
+
+class DocumentUploadPermission(DocumentPermission):
+    """
+    every request of a chunked upload needs the permission to add documents
+    """
+    _methods_map_document = {
+        'GET': ['%(bmf)s.add_%(document)s'],
+        'OPTIONS': ['%(bmf)s.add_%(document)s'],
+        'HEAD': ['%(bmf)s.add_%(document)s'],
+        'POST': ['%(bmf)s.add_%(document)s'],
+        'PUT': ['%(bmf)s.add_%(document)s'],
+        'DELETE': ['%(bmf)s.add_%(document)s'],
+    }
+    _methods_map_related = {
+        'GET': ['%(app)s.view_%(model)s', '%(app)s.addfile_%(model)s'],
+        'OPTIONS': ['%(app)s.view_%(model)s', '%(app)s.addfile_%(model)s'],
+        'HEAD': ['%(app)s.view_%(model)s', '%(app)s.addfile_%(model)s'],
+        'POST': ['%(app)s.view_%(model)s', '%(app)s.addfile_%(model)s'],
+        'PUT': ['%(app)s.view_%(model)s', '%(app)s.addfile_%(model)s'],
+        'DELETE': ['%(app)s.view_%(model)s', '%(app)s.addfile_%(model)s'],
+    }
@@ -0,0 +1,193 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.files.base import ContentFile
+
+from djangobmf.conf import settings
+from djangobmf.storage import default_storage
+
+from io import BytesIO
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import logging
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+    PILLOW = True
+except ImportError:
+    PILLOW = False
+
+
+PREVIEW_PREFIX = '.previews'
+
+
+def render_image(fileobj, size):
+    image = Image.open(fileobj)
+    image.load()
+    return image
+
+
+def check_call(args, timeout):
+    """
+    runs a command like ``subprocess.check_call``, but kills it after
+    ``timeout`` seconds. A killed command raises a ``CalledProcessError``
+    """
+    process = subprocess.Popen(args)
+
+    def kill():
+        try:
+            process.kill()
+        except OSError:
+            # the process exited
+            pass
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        retcode = process.wait()
+    finally:
+        timer.cancel()
+
+    if retcode:
+        raise subprocess.CalledProcessError(retcode, args)
+
+
+def render_pdf(fileobj, size):
+    """
+    renders the first page of a pdf file with ``pdftoppm``, which is killed
+    after ``BMF_DOCUMENT_PREVIEW_TIMEOUT`` seconds
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        source = os.path.join(directory, 'source.pdf')
+        with open(source, 'wb') as f:
+            shutil.copyfileobj(fileobj, f)
+
+        check_call([
+            settings.DOCUMENT_PREVIEW_PDFTOPPM,
+            '-f', '1', '-l', '1', '-singlefile', '-png',
+            '-scale-to', str(size),
+            source, os.path.join(directory, 'page'),
+        ], settings.DOCUMENT_PREVIEW_TIMEOUT)
+
+        image = Image.open(os.path.join(directory, 'page.png'))
+        image.load()
+        return image
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+# renderers by the prefix of the mimetype
+RENDERERS = [
+    ('image/', render_image),
+    ('application/pdf', render_pdf),
+]
+
+
+def get_renderer(mimetype):
+    if not mimetype or mimetype == 'image/svg+xml':
+        return None
+    for prefix, renderer in RENDERERS:
+        if mimetype.startswith(prefix):
+            return renderer
+    return None
+
+
+def can_preview(document):
+    return PILLOW and bool(document.sha1) and document.file_exists and get_renderer(document.mimetype) is not None
+
+
+def get_preview_name(sha1, size):
+    """
+    previews are named by the content of the file and their size, so
+    identical files share their previews and a changed file gets new ones
+    """
+    return '%s/%s/%s-%s.jpg' % (PREVIEW_PREFIX, sha1[:2], sha1, size)
+
+
+def get_preview(document, size):
+    """
+    returns the name of an existing preview or ``None``
+    """
+    name = get_preview_name(document.sha1, size)
+    if default_storage.exists(name):
+        return name
+    return None
+
+
+def to_rgb(image):
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        return background
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
+
+
+def render_previews(document):
+    """
+    creates all missing previews of a document. The file is decoded once
+    in the largest size, the smaller previews are scaled from it.
+    returns the number of created previews
+    """
+    if not can_preview(document):
+        return 0
+
+    sizes = sorted(set(settings.DOCUMENT_PREVIEW_SIZES.values()), reverse=True)
+    missing = [size for size in sizes if not get_preview(document, size)]
+    if not missing:
+        return 0
+
+    renderer = get_renderer(document.mimetype)
+    try:
+        with default_storage.open(document.file.name, 'rb') as f:
+            image = to_rgb(renderer(f, missing[0]))
+    except (IOError, OSError, ValueError, subprocess.CalledProcessError) as e:
+        logger.info('Can not create a preview of document %s: %s', document.pk, e)
+        return 0
+
+    count = 0
+    for size in missing:
+        image.thumbnail((size, size), Image.LANCZOS)
+        buf = BytesIO()
+        image.save(buf, 'JPEG', quality=85, optimize=True)
+
+        name = get_preview_name(document.sha1, size)
+        saved = default_storage.save(name, ContentFile(buf.getvalue()))
+        if saved != name:
+            # the preview was created concurrently
+            default_storage.delete(saved)
+        count += 1
+    return count
+
+
+def remove_stale_previews():
+    """
+    removes the previews of files, which are not used by any document.
+    returns the number of removed previews
+    """
+    from djangobmf.models import Document
+
+    if not default_storage.exists(PREVIEW_PREFIX):
+        return 0
+
+    count = 0
+    for directory in default_storage.listdir(PREVIEW_PREFIX)[0]:
+        path = '%s/%s' % (PREVIEW_PREFIX, directory)
+        files = default_storage.listdir(path)[1]
+        sha1s = set(f.split('-', 1)[0] for f in files)
+        used = set(Document.objects.filter(sha1__in=sha1s).values_list('sha1', flat=True))
+        for filename in files:
+            if filename.split('-', 1)[0] not in used:
+                default_storage.delete('%s/%s' % (path, filename))
+                count += 1
+    return count
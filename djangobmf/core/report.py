@@ -0,0 +1,478 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.base import File
+from django.db import connections
+from django.db.models import Count
+from django.db.models import Max
+from django.utils import timezone
+from django.utils import translation
+from django.utils.encoding import force_bytes
+
+from djangobmf import get_version
+from djangobmf.conf import settings
+from djangobmf.core.tasks import is_worker
+from djangobmf.storage import default_storage
+
+from io import BytesIO
+from datetime import timedelta
+from multiprocessing import Pool
+from multiprocessing import cpu_count
+
+import hashlib
+import tempfile
+import uuid
+import zipfile
+import logging
+logger = logging.getLogger(__name__)
+
+try:
+    from PyPDF2 import PdfFileMerger
+    PYPDF2 = True
+except ImportError:
+    PYPDF2 = False
+
+try:
+    from xhtml2pdf import pisa
+    XHTML2PDF = True
+except ImportError:
+    XHTML2PDF = False
+
+
+ARTIFACT_PREFIX = '.reports'
+
+SNAPSHOT_PREFIX = '.snapshots'
+
+BATCH_PREFIX = '.batches'
+
+# seconds until a rendered batch is removed
+BATCH_KEEP = 24 * 3600
+
+
+def get_artifact_dir(obj, slug):
+    return '%s/%s.%s/%s/%s' % (
+        ARTIFACT_PREFIX,
+        obj._meta.app_label,
+        obj._meta.model_name,
+        slug,
+        obj.pk,
+    )
+
+
+def get_related_version(obj):
+    """
+    returns the latest modification and the number of the related objects
+    in ``report_related`` of the model, as a string
+    """
+    related = getattr(getattr(obj, '_bmfmeta', None), 'report_related', [])
+    if not related:
+        return ''
+
+    aggregates = {}
+    for i, lookup in enumerate(related):
+        aggregates['modified%s' % i] = Max('%s__modified' % lookup)
+        aggregates['count%s' % i] = Count('%s__pk' % lookup, distinct=True)
+    values = obj.__class__._default_manager.filter(pk=obj.pk).aggregate(**aggregates)
+
+    return ','.join('%s/%s' % (
+        values['modified%s' % i].isoformat() if values['modified%s' % i] else '-',
+        values['count%s' % i],
+    ) for i in range(len(related)))
+
+
+def get_artifact_version(obj, renderer):
+    """
+    returns the version of a rendered report, which changes with the object,
+    its related objects (``report_related``), the renderer, the active language
+    and the installed version of djangobmf (templates). Returns ``None``, if the
+    report can not be stored
+    """
+    modified = getattr(obj, 'modified', None)
+    version = renderer.get_version() if hasattr(renderer, 'get_version') else None
+
+    if not modified or not version:
+        return None
+
+    return hashlib.sha1(('%s|%s|%s.%s|%s|%s|%s' % (
+        modified.isoformat(),
+        get_related_version(obj),
+        renderer._meta.app_label,
+        renderer._meta.model_name,
+        version,
+        translation.get_language(),
+        get_version(dev=False),
+    )).encode('utf-8')).hexdigest()
+
+
+def get_artifact(obj, slug, version):
+    """
+    returns the name of the stored report or ``None``
+    """
+    directory = get_artifact_dir(obj, slug)
+    if not default_storage.exists(directory):
+        return None
+
+    for filename in default_storage.listdir(directory)[1]:
+        if filename.split('.', 1)[0] == version:
+            return '%s/%s' % (directory, filename)
+    return None
+
+
+def save_artifact(obj, slug, version, suffix, data):
+    """
+    stores a rendered report and removes older versions
+    """
+    directory = get_artifact_dir(obj, slug)
+    name = '%s/%s.%s' % (directory, version, suffix)
+
+    saved = default_storage.save(name, ContentFile(data))
+    for filename in default_storage.listdir(directory)[1]:
+        if '%s/%s' % (directory, filename) != name:
+            default_storage.delete('%s/%s' % (directory, filename))
+    return name if saved == name else None
+
+
+def remove_stale_artifacts():
+    """
+    removes the stored reports of deleted objects. returns the number of
+    removed files
+    """
+    if not default_storage.exists(ARTIFACT_PREFIX):
+        return 0
+
+    count = 0
+    for label in default_storage.listdir(ARTIFACT_PREFIX)[0]:
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError):
+            model = None
+
+        for slug in default_storage.listdir('%s/%s' % (ARTIFACT_PREFIX, label))[0]:
+            path = '%s/%s/%s' % (ARTIFACT_PREFIX, label, slug)
+            pks = default_storage.listdir(path)[0]
+            if model:
+                existing = set(str(pk) for pk in model._default_manager.filter(
+                    pk__in=[pk for pk in pks if pk.isdigit()],
+                ).values_list('pk', flat=True))
+            else:
+                existing = set()
+
+            for pk in pks:
+                if pk in existing:
+                    continue
+                for filename in default_storage.listdir('%s/%s' % (path, pk))[1]:
+                    default_storage.delete('%s/%s/%s' % (path, pk, filename))
+                    count += 1
+    return count
+
+
+# Batch rendering ==============================================================
+
+# the report, which is rendered by a worker process
+_worker = {}
+
+
+def get_report(model, slug):
+    """
+    returns the report class and the renderer of the report ``slug``
+    """
+    module = apps.get_app_config(settings.APP_LABEL).get_module(model)
+    report, renderer = module.get_object_report_data(slug)
+    return report['class'], renderer
+
+
+def render_object(cls, renderer, obj, slug):
+    """
+    returns the stored or a newly rendered report as ``(suffix, data)``
+    """
+    version = get_artifact_version(obj, renderer)
+    name = get_artifact(obj, slug, version) if version else None
+    if name:
+        with default_storage.open(name, 'rb') as f:
+            return name.rsplit('.', 1)[-1], f.read()
+
+    suffix, mime, data, send = cls.prerender(obj, renderer, slug)
+    if not isinstance(data, bytes):
+        data = b''.join(force_bytes(chunk) for chunk in data)
+    return suffix, data
+
+
+def init_worker(app_label, model_name, slug):
+    """
+    loads the report, the renderer's options, the template and the
+    fonts of xhtml2pdf once per worker process
+    """
+    model = apps.get_model(app_label, model_name)
+    cls, renderer = get_report(model, slug)
+
+    renderer.get_options()
+    renderer.get_template({'template_name': cls().report_template_name()})
+    if XHTML2PDF:
+        pisa.pisaDocument(BytesIO(b'<html><body><p>-</p></body></html>'), BytesIO())
+
+    _worker.update({'model': model, 'cls': cls, 'renderer': renderer, 'slug': slug})
+
+
+def render_worker(pk):
+    model = _worker['model']
+    try:
+        obj = model._default_manager.get(pk=pk)
+    except model.DoesNotExist:
+        return pk, None, None
+    suffix, data = render_object(_worker['cls'], _worker['renderer'], obj, slug=_worker['slug'])
+    return pk, suffix, data
+
+
+def render_reports(model, slug, pks, workers=None):
+    """
+    renders the report ``slug`` of all objects and yields ``(pk, suffix, data)``
+    in the order of ``pks``. The reports are rendered by a pool of ``workers``
+    processes (default: ``BMF_REPORT_WORKERS`` or one per CPU) in the processes
+    of a task queue. In a web process (i.e. with the sync or thread backend) or
+    inside a transaction they are rendered in this process, because the workers
+    could not see uncommitted objects.
+    """
+    if not is_worker():
+        workers = 1
+    elif workers is None:
+        workers = settings.REPORT_WORKERS or cpu_count()
+    workers = min(workers, len(pks))
+
+    if workers <= 1 or any(connection.in_atomic_block for connection in connections.all()):
+        cls, renderer = get_report(model, slug)
+        objects = model._default_manager.in_bulk(pks)
+        for pk in pks:
+            if pk not in objects:
+                yield pk, None, None
+                continue
+            suffix, data = render_object(cls, renderer, objects[pk], slug)
+            yield pk, suffix, data
+        return
+
+    # the workers need to open their own database connections
+    connections.close_all()
+
+    pool = Pool(workers, init_worker, (model._meta.app_label, model._meta.model_name, slug))
+    try:
+        for result in pool.imap(render_worker, pks):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def write_pdf(results, fileobj):
+    """
+    merges the rendered pdf files into one. The files are spooled to disk
+    instead of being kept in memory until the merge
+    """
+    merger = PdfFileMerger()
+    files = []
+    try:
+        for pk, suffix, data in results:
+            if suffix == 'pdf':
+                f = tempfile.TemporaryFile()
+                f.write(data)
+                f.seek(0)
+                files.append(f)
+                merger.append(f)
+        merger.write(fileobj)
+    finally:
+        for f in files:
+            f.close()
+
+
+def write_zip(results, fileobj, filename):
+    """
+    writes the rendered reports to a zip archive
+    """
+    archive = zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_STORED)
+    try:
+        for pk, suffix, data in results:
+            if data is not None:
+                archive.writestr('%s-%s.%s' % (filename, pk, suffix), data)
+    finally:
+        archive.close()
+
+
+def get_batch_name(user, token, filetype):
+    return '%s/%s/%s.%s' % (BATCH_PREFIX, user.pk, token, filetype)
+
+
+def start_batch(model, slug, pks, filetype, user):
+    """
+    schedules the rendering of the reports to one file, which is available
+    for the user. returns the token of the batch
+    """
+    from djangobmf.tasks.report import render_report_batch
+
+    token = uuid.uuid4().hex
+    name = get_batch_name(user, token, filetype)
+    default_storage.save(name + '.pending', ContentFile(b''))
+    render_report_batch(model._meta.app_label, model._meta.model_name, slug, pks, filetype, name)
+    return token
+
+
+def write_batch(model, slug, pks, filetype, fileobj):
+    """
+    renders the reports of the objects to a pdf file or a zip archive
+    """
+    results = render_reports(model, slug, pks)
+    if filetype == 'pdf':
+        write_pdf(results, fileobj)
+    else:
+        write_zip(results, fileobj, slug)
+    fileobj.seek(0)
+
+
+def create_batch(model, slug, pks, filetype, name):
+    """
+    renders the reports of the objects to a pdf file or a zip archive and
+    stores it as ``name``. A failed batch is marked with a ``.failed`` file
+    """
+    output = tempfile.TemporaryFile()
+    try:
+        write_batch(model, slug, pks, filetype, output)
+        default_storage.save(name, File(output))
+    except Exception:
+        default_storage.save(name + '.failed', ContentFile(b''))
+        raise
+    finally:
+        output.close()
+        default_storage.delete(name + '.pending')
+
+
+def get_batch(user, token, filetype):
+    """
+    returns the state of a batch (``'done'``, ``'pending'``, ``'failed'`` or
+    ``None``, if it does not exist) and the name of its file
+    """
+    name = get_batch_name(user, token, filetype)
+    for state, suffix in (('done', ''), ('pending', '.pending'), ('failed', '.failed')):
+        if default_storage.exists(name + suffix):
+            return state, name
+    return None, name
+
+
+def purge_batches(now=None):
+    """
+    removes the batches older than ``BATCH_KEEP`` seconds. returns the
+    number of removed files
+    """
+    if not default_storage.exists(BATCH_PREFIX):
+        return 0
+
+    limit = (now or timezone.now()) - timedelta(seconds=BATCH_KEEP)
+    if timezone.is_aware(limit):
+        limit = timezone.make_naive(limit, timezone.get_default_timezone())
+
+    count = 0
+    for directory in default_storage.listdir(BATCH_PREFIX)[0]:
+        for filename in default_storage.listdir('%s/%s' % (BATCH_PREFIX, directory))[1]:
+            name = '%s/%s/%s' % (BATCH_PREFIX, directory, filename)
+            if default_storage.modified_time(name) < limit:
+                default_storage.delete(name)
+                count += 1
+    return count
+
+
+# Snapshots ====================================================================
+
+def spool(data):
+    """
+    returns the (streamed) output of a renderer as a file
+    """
+    if isinstance(data, bytes):
+        return ContentFile(data)
+
+    f = tempfile.TemporaryFile()
+    for chunk in data:
+        f.write(force_bytes(chunk))
+    f.seek(0)
+    return File(f)
+
+
+def create_snapshot(report):
+    """
+    renders the report (which is not connected to an object) and stores
+    it together with its dataset as ndjson. Only the last
+    ``BMF_REPORT_SNAPSHOTS_KEEP`` snapshots of the report are kept.
+    returns the new snapshot
+    """
+    from djangobmf.core.export import get_rows
+    from djangobmf.core.export import stream_ndjson
+
+    model = report.contenttype.model_class()
+    module = apps.get_app_config(settings.APP_LABEL).get_module(model)
+    report, cls = module.get_snapshot_report(report.slug)
+
+    created = timezone.now()
+    queryset, (suffix, mime, data, send) = cls.render_snapshot(report.renderer, report.slug)
+
+    directory = '%s/%s' % (SNAPSHOT_PREFIX, report.pk)
+    timestamp = created.strftime('%Y%m%d%H%M%S')
+
+    f = spool(data)
+    try:
+        name = default_storage.save('%s/%s.%s' % (directory, timestamp, suffix), f)
+    finally:
+        f.close()
+
+    rows = [0]
+
+    def count(iterator):
+        for row in iterator:
+            rows[0] += 1
+            yield row
+
+    serializer = model._bmfmeta.serializer_class(context={'request': None})
+    f = spool(stream_ndjson(count(get_rows(serializer, queryset, 2000))))
+    try:
+        dataset = default_storage.save('%s/%s.ndjson' % (directory, timestamp), f)
+    finally:
+        f.close()
+
+    snapshot = report.snapshots.create(
+        name=name,
+        dataset=dataset,
+        mimetype=mime,
+        size=default_storage.size(name),
+        rows=rows[0],
+        created=created,
+    )
+
+    for old in report.snapshots.order_by('-created', '-pk')[settings.REPORT_SNAPSHOTS_KEEP:]:
+        old.delete()
+
+    return snapshot
+
+
+def create_due_snapshots(callback, now=None):
+    """
+    claims all reports, which are due for a snapshot, by moving their next
+    snapshot forward, and calls ``callback`` with the report's primary key.
+    Concurrent runs do not claim the same report twice. returns the number
+    of claimed reports
+    """
+    Report = apps.get_model(settings.APP_LABEL, 'Report')
+    now = now or timezone.now()
+
+    count = 0
+    for report in Report.objects.filter(enabled=True, next_snapshot__lte=now):
+        try:
+            claimed = Report.objects.filter(pk=report.pk, next_snapshot=report.next_snapshot).update(
+                next_snapshot=report.get_next_snapshot(now),
+            )
+            if not claimed:
+                continue
+            callback(report.pk)
+        except Exception:
+            logger.exception('Can not create a snapshot of report %s', report.pk)
+            continue
+        count += 1
+    return count
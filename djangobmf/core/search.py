@@ -0,0 +1,475 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections
+from django.db import router
+from django.db.models import Case
+from django.db.models import IntegerField
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models import When
+from django.db.models import signals
+from django.db.models.functions import Length
+from django.utils.encoding import force_text
+from django.utils.module_loading import import_string
+
+from djangobmf.conf import settings
+from djangobmf.models import SearchIndex
+
+from functools import reduce
+
+import operator
+import re
+import logging
+logger = logging.getLogger(__name__)
+
+
+BACKENDS = {
+    'postgresql': 'djangobmf.core.search.PostgresSearchBackend',
+    'sqlite': 'djangobmf.core.search.SQLiteSearchBackend',
+}
+
+WORDS = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_query(
+        query_string, findterms=re.compile(r'"([^"]+)"|(\S+)').findall,
+        normspace=re.compile(r'\s{2,}').sub):
+    '''
+    Splits the query string in invidual keywords, getting rid of unecessary spaces
+    and grouping quoted words together.
+
+    Example:
+    > normalize_query('  some random  words "with   quotes  " and   spaces')
+    ['some', 'random', 'words', 'with quotes', 'and', 'spaces']
+
+    '''
+    return [normspace(' ', (t[0] or t[1]).strip()) for t in findterms(query_string)]
+
+
+def construct_search(field_name):
+    if field_name.startswith('^'):
+        return "%s__istartswith" % field_name[1:]
+    elif field_name.startswith('='):
+        return "%s__iexact" % field_name[1:]
+    elif field_name.startswith('@'):
+        return "%s__search" % field_name[1:]
+    else:
+        return "%s__icontains" % field_name
+
+
+def get_search_fields(model):
+    """
+    returns the ``search_fields`` of a model without their lookup prefixes
+    """
+    bmfmeta = getattr(model, '_bmfmeta', None)
+    return [f.lstrip('^=@') for f in getattr(bmfmeta, 'search_fields', [])]
+
+
+def get_search_text(instance):
+    """
+    returns the lowercased values of all search fields of an instance
+    """
+    values = []
+    for name in get_search_fields(instance.__class__):
+        value = instance
+        for attr in name.split('__'):
+            try:
+                value = getattr(value, attr)
+            except ObjectDoesNotExist:
+                value = None
+            if value is None:
+                break
+        if value is not None:
+            values.append(force_text(value))
+    return ' '.join(values).lower()
+
+
+def get_search_relations(model):
+    """
+    returns a list of ``(related model, lookup)`` for the relations, which
+    are spanned by the search fields of a model (i.e. ``(User, 'user')``
+    for ``user__username``)
+    """
+    relations = []
+    for name in get_search_fields(model):
+        parts = name.split('__')[:-1]
+        current = model
+        for i, part in enumerate(parts):
+            current = current._meta.get_field(part).related_model
+            if current is None:
+                break
+            relation = (current, '__'.join(parts[:i + 1]))
+            if relation not in relations:
+                relations.append(relation)
+    return relations
+
+
+def update_related(model, lookup):
+    """
+    returns a signal handler, which updates the index of all objects of
+    ``model``, that are related to the saved instance by ``lookup``
+    """
+    def post_save(sender, instance, raw=False, **kwargs):
+        backend = get_backend()
+        if backend is None or raw:
+            return
+        for obj in model._default_manager.filter(**{lookup: instance.pk}).iterator():
+            backend.update(obj)
+    return post_save
+
+
+def connect_signals():
+    """
+    connects the related models of search fields, which span a relation,
+    so that their changes are written to the index
+    """
+    for model in apps.get_models():
+        for related, lookup in get_search_relations(model):
+            signals.post_save.connect(
+                update_related(model, lookup),
+                sender=related,
+                weak=False,
+                dispatch_uid='djangobmf.search.%s.%s.%s' % (model._meta.app_label, model._meta.model_name, lookup),
+            )
+
+
+def rank_text(text, terms):
+    """
+    ranks a (lowercased) text from the search index. Matches at the beginning
+    of the text are ranked higher than matches at the beginning of a word,
+    which are ranked higher than other matches
+    """
+    rank = 0
+    words = text.split()
+    for term in terms:
+        term = term.lower()
+        if text.startswith(term):
+            rank += 3
+        elif any(word.startswith(term) for word in words):
+            rank += 2
+        elif term in text:
+            rank += 1
+    return rank
+
+
+def get_rank_expression(terms):
+    """
+    returns the rank of ``rank_text`` as an expression on the ``text``
+    column of the search index
+    """
+    rank = None
+    for term in terms:
+        term = term.lower()
+        expression = Case(
+            When(text__startswith=term, then=Value(3)),
+            When(text__contains=' %s' % term, then=Value(2)),
+            When(text__contains=term, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        rank = expression if rank is None else rank + expression
+    return rank
+
+
+def get_label(instance):
+    """
+    returns the label of an instance, which is stored in the search index
+    """
+    return force_text(instance)[:255]
+
+
+def escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class SearchBackend(object):
+    """
+    Stores the text of the search fields in the ``SearchIndex`` model,
+    which is searched with ``contains`` lookups on one column instead
+    of one lookup per search field and table.
+
+    Databases with full-text support overwrite ``filter_term``
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def get_contenttype(self, model):
+        return ContentType.objects.get_for_model(model)
+
+    def update(self, instance):
+        """
+        updates the index of an instance, called after every save
+        """
+        text = get_search_text(instance)
+        label = get_label(instance)
+        try:
+            obj = SearchIndex.objects.get(
+                contenttype=self.get_contenttype(instance.__class__),
+                object_id=instance.pk,
+            )
+            if obj.text == text and obj.label == label:
+                return
+            obj.text = text
+            obj.label = label
+        except SearchIndex.DoesNotExist:
+            obj = SearchIndex(
+                contenttype=self.get_contenttype(instance.__class__),
+                object_id=instance.pk,
+                text=text,
+                label=label,
+            )
+        obj.save()
+        self.update_index(obj)
+
+    def delete(self, model, pk):
+        """
+        removes an object from the index, called after every delete
+        """
+        queryset = SearchIndex.objects.filter(
+            contenttype=self.get_contenttype(model),
+            object_id=pk,
+        )
+        self.delete_index(list(queryset.values_list('pk', flat=True)))
+        queryset.delete()
+
+    def rebuild(self, model):
+        """
+        rebuilds the index for all objects of a model
+        """
+        self.delete_index(list(SearchIndex.objects.filter(
+            contenttype=self.get_contenttype(model),
+        ).values_list('pk', flat=True)))
+        SearchIndex.objects.filter(contenttype=self.get_contenttype(model)).delete()
+
+        count = 0
+        for instance in model._default_manager.iterator():
+            self.update(instance)
+            count += 1
+        return count
+
+    def update_index(self, obj):
+        """
+        hook to update a full-text index after obj was saved
+        """
+        pass
+
+    def delete_index(self, pks):
+        """
+        hook to remove entries from a full-text index
+        """
+        pass
+
+    def filter_term(self, queryset, term):
+        return queryset.filter(text__contains=term.lower())
+
+    def get_queryset(self, terms):
+        """
+        returns a ``SearchIndex``-queryset, which matches all terms
+        """
+        queryset = SearchIndex.objects.all()
+        for term in terms:
+            queryset = self.filter_term(queryset, term)
+        return queryset
+
+    def get_index(self, model, terms):
+        return self.get_queryset(terms).filter(contenttype=self.get_contenttype(model))
+
+    def filter(self, queryset, terms):
+        return queryset.filter(pk__in=self.get_index(queryset.model, terms).values('object_id'))
+
+    def rank(self, queryset, terms, limit):
+        """
+        returns a list of ``(rank, pk, label)`` of the best matches in queryset.
+        The matches are ranked by the database like ``rank_text``, so only
+        the best ``limit`` rows are loaded from the index
+        """
+        index = self.get_index(queryset.model, terms) \
+            .filter(object_id__in=queryset.values('pk')) \
+            .annotate(rank=get_rank_expression(terms), length=Length('text')) \
+            .order_by('-rank', 'length', 'object_id') \
+            .values_list('rank', 'length', 'object_id', 'label')[:limit]
+
+        items = list(index)
+
+        # objects indexed without a label
+        labels = {}
+        missing = [pk for rank, length, pk, label in items if not label]
+        if missing:
+            objects = queryset.model._default_manager.in_bulk(missing)
+            labels = dict((pk, get_label(obj)) for pk, obj in objects.items())
+
+        return [(rank, pk, label or labels.get(pk, '')) for rank, length, pk, label in items]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Searches the index via a ``tsvector`` with prefix matching. If the trigram
+    index was created (the ``pg_trgm`` extension was installed before the
+    migrations), terms are also matched as substrings with ``LIKE``
+    """
+
+    def __init__(self, connection):
+        super(PostgresSearchBackend, self).__init__(connection)
+        self.trgm_index = '%s_trgm' % SearchIndex._meta.db_table
+        self._has_trgm = None
+
+    @property
+    def has_trgm(self):
+        if self._has_trgm is None:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute("SELECT COUNT(*) FROM pg_indexes WHERE indexname = %s", [self.trgm_index])
+                self._has_trgm = bool(cursor.fetchone()[0])
+            finally:
+                cursor.close()
+        return self._has_trgm
+
+    def filter_term(self, queryset, term):
+        words = WORDS.findall(term.lower())
+        if not words:
+            return super(PostgresSearchBackend, self).filter_term(queryset, term)
+
+        column = '%s.%s' % (
+            self.connection.ops.quote_name(SearchIndex._meta.db_table),
+            self.connection.ops.quote_name('text'),
+        )
+        where = "to_tsvector('simple', %s) @@ to_tsquery('simple', %%s)" % column
+        params = [' & '.join('%s:*' % word for word in words)]
+
+        # without the trigram index, a LIKE would scan the whole table
+        if self.has_trgm:
+            where = '(%s OR %s LIKE %%s)' % (where, column)
+            params.append('%%%s%%' % escape_like(term.lower()))
+
+        return queryset.extra(where=[where], params=params)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Keeps a copy of the index in a FTS5 table (if sqlite was compiled with FTS5)
+    and searches it with prefix queries. Only terms without any word characters
+    are matched as substrings with ``LIKE``
+    """
+
+    def __init__(self, connection):
+        super(SQLiteSearchBackend, self).__init__(connection)
+        self.fts_table = '%s_fts' % SearchIndex._meta.db_table
+        self._has_fts = None
+
+    @property
+    def has_fts(self):
+        if self._has_fts is None:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name=%s",
+                    [self.fts_table],
+                )
+                self._has_fts = bool(cursor.fetchone()[0])
+            finally:
+                cursor.close()
+        return self._has_fts
+
+    def update_index(self, obj):
+        if not self.has_fts:
+            return
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                'INSERT OR REPLACE INTO %s (rowid, text) VALUES (%%s, %%s)' % self.fts_table,
+                [obj.pk, obj.text],
+            )
+        finally:
+            cursor.close()
+
+    def delete_index(self, pks):
+        if not self.has_fts or not pks:
+            return
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                'DELETE FROM %s WHERE rowid IN (%s)' % (self.fts_table, ', '.join(['%s'] * len(pks))),
+                pks,
+            )
+        finally:
+            cursor.close()
+
+    def filter_term(self, queryset, term):
+        words = WORDS.findall(term.lower())
+        if not words or not self.has_fts:
+            return super(SQLiteSearchBackend, self).filter_term(queryset, term)
+
+        return queryset.extra(
+            where=['%s.%s IN (SELECT rowid FROM %s WHERE %s MATCH %%s)' % (
+                self.connection.ops.quote_name(SearchIndex._meta.db_table),
+                self.connection.ops.quote_name(SearchIndex._meta.pk.column),
+                self.fts_table,
+                self.fts_table,
+            )],
+            params=[' AND '.join('"%s"*' % word for word in words)],
+        )
+
+
+_backends = {}
+
+
+def get_backend():
+    """
+    returns the search backend from the ``BMF_SEARCH_BACKEND`` setting. If the
+    setting is ``None``, the backend is selected by the database vendor. If it is
+    ``False`` no index is used.
+    """
+    path = settings.SEARCH_BACKEND
+    if path is False:
+        return None
+
+    connection = connections[router.db_for_write(SearchIndex)]
+    if path is None:
+        path = BACKENDS.get(connection.vendor, 'djangobmf.core.search.SearchBackend')
+
+    key = (path, connection.alias)
+    if key not in _backends:
+        _backends[key] = import_string(path)(connection)
+    return _backends[key]
+
+
+def search_queryset(queryset, query_string):
+    """
+    filters the queryset with the search fields of its model
+    """
+    terms = normalize_query(query_string)
+    search_fields = getattr(getattr(queryset.model, '_bmfmeta', None), 'search_fields', [])
+
+    if not terms or not search_fields:
+        return queryset
+
+    backend = get_backend()
+    if backend is not None:
+        return backend.filter(queryset, terms)
+
+    for term in terms:
+        lookups = [construct_search(str(f)) for f in search_fields]
+        queries = [Q(**{lookup: term}) for lookup in lookups]
+        queryset = queryset.filter(reduce(operator.or_, queries))
+    return queryset
+
+
+def autocomplete(queryset, query_string, limit):
+    """
+    returns a list of ``(pk, label)`` of the best ``limit`` matches in queryset
+    """
+    terms = normalize_query(query_string)
+    search_fields = getattr(getattr(queryset.model, '_bmfmeta', None), 'search_fields', [])
+    backend = get_backend()
+
+    if not terms or not search_fields or backend is None:
+        return [(obj.pk, get_label(obj)) for obj in search_queryset(queryset, query_string)[:limit]]
+
+    return [(pk, label) for rank, pk, label in backend.rank(queryset, terms, limit)]
@@ -13,7 +13,6 @@ from djangobmf.models.activity import ACTION_CREATED
 from djangobmf.models.activity import ACTION_WORKFLOW
 # from djangobmf.models.activity import ACTION_FILE
 from djangobmf.signals import activity_comment
-from djangobmf.templatetags.djangobmf_markup import markdown_filter
 
 from rest_framework.serializers import ValidationError
 from rest_framework.serializers import ModelSerializer
@@ -66,7 +65,7 @@ class ActivitySerializer(ModelSerializer):
 
     def get_formatted(self, obj):
         if obj.action in [ACTION_COMMENT]:
-            return markdown_filter(obj.text)
+            return obj.get_html()
         return None
 
     def get_json(self, obj):
@@ -3,7 +3,10 @@
 
 from __future__ import unicode_literals
 
+from djangobmf.conf import settings
+from djangobmf.core.preview import can_preview
 from djangobmf.models import Document
+from djangobmf.models import DocumentUpload
 
 from rest_framework.serializers import ModelSerializer
 from rest_framework.serializers import SerializerMethodField
@@ -12,6 +15,7 @@ from rest_framework.reverse import reverse
 
 class DocumentSerializer(ModelSerializer):
     download = SerializerMethodField()
+    preview = SerializerMethodField()
 
     def __init__(self, *args, **kwargs):
         self.request = kwargs['context']['request']
@@ -35,10 +39,35 @@ class DocumentSerializer(ModelSerializer):
             kwargs={'pk': obj.pk},
         )
 
+    def get_preview(self, obj):
+        """
+        resolve the urls of the preview images, if the file has previews
+        """
+        if not can_preview(obj):
+            return None
+        return dict(
+            (size, reverse(
+                'djangobmf:api-document-preview',
+                request=self.request,
+                kwargs={'pk': obj.pk, 'size': size},
+            ))
+            for size in settings.DOCUMENT_PREVIEW_SIZES
+        )
+
     class Meta:
         model = Document
         fields = [
             'pk', 'name', 'mimetype', 'description', 'file',
             'size', 'sha1', 'is_static', 'modified',
-            'created', 'download',
+            'created', 'download', 'preview',
+        ]
+
+
+class DocumentUploadSerializer(ModelSerializer):
+
+    class Meta:
+        model = DocumentUpload
+        fields = [
+            'token', 'name', 'description', 'size', 'offset',
         ]
+        read_only_fields = ['token', 'offset']
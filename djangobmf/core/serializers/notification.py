@@ -3,11 +3,26 @@
 
 from __future__ import unicode_literals
 
+from django.contrib.contenttypes.models import ContentType
+
 from djangobmf.models import Notification
+from djangobmf.models.activity import ACTION_COMMENT
+from djangobmf.models.activity import ACTION_CREATED
+from djangobmf.models.activity import ACTION_FILE
+from djangobmf.models.activity import ACTION_UPDATED
+from djangobmf.models.activity import ACTION_WORKFLOW
 
 from rest_framework.serializers import ModelSerializer
 from rest_framework.serializers import SerializerMethodField
-from rest_framework.reverse import reverse
+
+
+ACTION_NAMES = {
+    ACTION_COMMENT: 'comment',
+    ACTION_CREATED: 'created',
+    ACTION_FILE: 'file',
+    ACTION_UPDATED: 'updated',
+    ACTION_WORKFLOW: 'workflow',
+}
 
 
 class NotificationViewSerializer(ModelSerializer):
@@ -57,20 +72,24 @@ class NotificationViewSerializer(ModelSerializer):
 
         return data
 
+    def get_model(self, obj):
+        # the content types are cached
+        return ContentType.objects.get_for_id(obj.watch_ct_id).model_class()
+
     def get_has_new_entry(self, obj):
         return not bool(obj.watch_id)
 
     def get_has_comments(self, obj):
-        return obj.watch_ct.model_class()._bmfmeta.has_comments
+        return self.get_model(obj)._bmfmeta.has_comments
 
     def get_has_files(self, obj):
-        return obj.watch_ct.model_class()._bmfmeta.has_files
+        return self.get_model(obj)._bmfmeta.has_files
 
     def get_has_detectchanges(self, obj):
-        return obj.watch_ct.model_class()._bmfmeta.has_detectchanges
+        return self.get_model(obj)._bmfmeta.has_detectchanges
 
     def get_has_workflow(self, obj):
-        return obj.watch_ct.model_class()._bmfmeta.has_workflow
+        return self.get_model(obj)._bmfmeta.has_workflow
 
     def get_enabled(self, obj):
         return self.get_has_workflow(obj) or self.get_has_detectchanges(obj) or \
@@ -89,12 +108,14 @@ class NotificationViewSerializer(ModelSerializer):
 class NotificationListSerializer(NotificationViewSerializer):
     api = SerializerMethodField()
     name = SerializerMethodField()
+    last_action = SerializerMethodField()
 
     class Meta:
         model = Notification
         fields = [
             'name',
             'modified',
+            'last_action',
             'watch_id',
             'unread',
             'api',
@@ -112,11 +133,14 @@ class NotificationListSerializer(NotificationViewSerializer):
         ]
 
     def get_name(self, obj):
-        return '%s' % obj.watch_object
+        if obj.title is None:
+            return '%s' % obj.watch_object
+        return obj.title
 
     def get_api(self, obj):
-        return reverse('djangobmf:api-notification', kwargs={
-            'app': obj.watch_object._meta.app_label,
-            'model': obj.watch_object._meta.model_name,
-            'pk': obj.watch_id,
-        })
+        if obj.url is None:
+            obj.update_watch_data()
+        return obj.url
+
+    def get_last_action(self, obj):
+        return ACTION_NAMES.get(obj.last_action)
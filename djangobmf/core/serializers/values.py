@@ -0,0 +1,213 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.exceptions import FieldDoesNotExist
+
+from djangobmf import fields as bmffields
+from djangobmf.conf import settings
+from djangobmf.serializers import CountryField
+from djangobmf.serializers import MoneyField
+from djangobmf.serializers import WorkflowField
+
+from rest_framework import fields as drffields
+from rest_framework.relations import ManyRelatedField
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.relations import RelatedField
+from rest_framework.serializers import BaseSerializer
+
+from collections import OrderedDict
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# serializer fields which return the database value unchanged
+IDENTITY_FIELDS = (
+    drffields.BooleanField,
+    drffields.CharField,
+    drffields.ChoiceField,
+    drffields.IntegerField,
+    drffields.NullBooleanField,
+    drffields.ReadOnlyField,
+    PrimaryKeyRelatedField,
+)
+
+
+class ValuesSerializer(object):
+    """
+    Read-only serializer which fetches rows with ``values_list`` and maps
+    them to the output of a ``ModuleSerializer`` through precomputed
+    per-column converters. Model instances and serializer fields are
+    never instantiated per row.
+
+    Use ``ValuesSerializer.compile`` to get an instance. It returns ``None``,
+    if the serializer contains a field which can not be resolved to a
+    database column (i.e. ``SerializerMethodField``); those serializers need
+    to use the normal (slow) serialization.
+    """
+
+    # compiled serializers, keyed by the serializer class
+    _cache = {}
+
+    def __init__(self, model, columns, converters):
+        self.model = model
+        self.columns = columns
+        self.converters = converters
+
+    @classmethod
+    def compile(cls, serializer):
+        """
+        returns a compiled ``ValuesSerializer`` for a serializer instance
+        or ``None``, if the serializer can not be compiled
+        """
+        key = serializer.__class__
+        if key not in cls._cache:
+            try:
+                cls._cache[key] = cls.build(serializer)
+            except NotImplementedError as e:
+                logger.debug('Can not compile %s: %s', key.__name__, e)
+                cls._cache[key] = None
+        return cls._cache[key]
+
+    @classmethod
+    def build(cls, serializer):
+        model = serializer.Meta.model
+        columns = []
+        converters = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, drffields.SerializerMethodField) or field.source == '*':
+                raise NotImplementedError('%s is not bound to a model field' % name)
+
+            if isinstance(field, (BaseSerializer, ManyRelatedField, RelatedField)) \
+                    and not isinstance(field, PrimaryKeyRelatedField):
+                raise NotImplementedError('%s needs a model instance' % name)
+
+            model_field, lookup = cls.resolve(model, field.source_attrs)
+
+            index = len(columns)
+            columns.append(lookup)
+
+            if isinstance(field, MoneyField) and isinstance(model_field, bmffields.MoneyField):
+                prefix = lookup[:-len(model_field.name)]
+                columns.append(prefix + model_field.get_currency_field_name())
+                if getattr(model_field, 'has_precision', False):
+                    columns.append(prefix + model_field.get_precision_field_name())
+                    converter = cls.money_converter(index, index + 1, index + 2)
+                else:
+                    converter = cls.money_converter(index, index + 1)
+
+            elif isinstance(field, WorkflowField):
+                converter = cls.workflow_converter(index, model_field.workflow._default_state_key)
+
+            elif isinstance(field, CountryField):
+                converter = cls.country_converter(index)
+
+            elif isinstance(field, IDENTITY_FIELDS):
+                converter = cls.identity_converter(index)
+
+            else:
+                converter = cls.field_converter(index, field.to_representation)
+
+            converters.append((name, converter))
+
+        return cls(model, columns, converters)
+
+    @staticmethod
+    def resolve(model, attrs):
+        """
+        resolves the source attributes of a serializer field to the model field
+        and to the lookup used in ``values_list``.
+        Only forward relations are followed.
+        """
+        if attrs == ['pk']:
+            return model._meta.pk, 'pk'
+
+        opts = model._meta
+        field = None
+        for attr in attrs:
+            if field is not None:
+                if not (field.many_to_one or field.one_to_one) or not field.concrete:
+                    raise NotImplementedError('%s is not a forward relation' % field.name)
+                opts = field.related_model._meta
+            try:
+                field = opts.get_field(attr)
+            except FieldDoesNotExist:
+                raise NotImplementedError('%s is not a field' % attr)
+
+            if not field.concrete or field.many_to_many:
+                raise NotImplementedError('%s is not a concrete field' % attr)
+
+        return field, '__'.join(attrs)
+
+    # converters -------------------------------------------------------------
+
+    @staticmethod
+    def identity_converter(index):
+        def convert(row):
+            return row[index]
+        return convert
+
+    @staticmethod
+    def field_converter(index, to_representation):
+        def convert(row):
+            value = row[index]
+            if value is None:
+                return None
+            return to_representation(value)
+        return convert
+
+    @staticmethod
+    def workflow_converter(index, default):
+        def convert(row):
+            value = row[index]
+            if value is None:
+                return default
+            return value
+        return convert
+
+    @staticmethod
+    def country_converter(index):
+        def convert(row):
+            value = row[index]
+            if value is None:
+                return None
+            return value.alpha3
+        return convert
+
+    @staticmethod
+    def money_converter(index, currency_index, precision_index=None):
+        from djangobmf.sites import site
+
+        def convert(row):
+            value = row[index]
+            if value is None:
+                return None
+            currency = site.currencies['%s' % (row[currency_index] or settings.DEFAULT_CURRENCY)]
+            if precision_index is None:
+                return currency(value).value
+            return currency(value, precision=row[precision_index] or 0).value
+        return convert
+
+    # serialization ----------------------------------------------------------
+
+    def get_queryset(self, queryset):
+        """
+        returns the ``values_list`` queryset for the given queryset
+        """
+        return queryset.values_list(*self.columns)
+
+    def to_representation(self, rows):
+        """
+        converts the rows fetched via ``get_queryset`` to a list of dictionaries
+        """
+        converters = self.converters
+        return [
+            OrderedDict([(name, convert(row)) for name, convert in converters])
+            for row in rows
+        ]
@@ -0,0 +1,283 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.signals import request_finished
+from django.db import connections
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from djangobmf.conf import settings
+
+from functools import update_wrapper
+from multiprocessing.pool import ThreadPool
+
+import threading
+import logging
+logger = logging.getLogger(__name__)
+
+
+# all registered tasks by their name
+registry = {}
+
+
+# set in the processes of ``manage.py bmf_worker``
+_worker = False
+
+
+def set_worker():
+    """
+    marks this process as a worker of the task queue
+    """
+    global _worker
+    _worker = True
+
+
+def is_worker():
+    """
+    returns True, if this process executes the tasks of a queue (``manage.py
+    bmf_worker`` or celery) and not the requests of a web server
+    """
+    if _worker:
+        return True
+    if not settings.USE_CELERY:
+        return False
+    from celery import current_task
+    return bool(current_task) and not current_task.request.is_eager
+
+
+# functions, which wait for the commit of the current transaction (Django 1.8)
+_pending = threading.local()
+
+
+def get_pending():
+    if not hasattr(_pending, 'functions'):
+        _pending.functions = []
+    return _pending.functions
+
+
+def on_commit(func, using=None):
+    """
+    calls ``func`` after the current transaction is committed (or immediately,
+    if no transaction is active). Django 1.8 has no commit hooks, there the
+    function waits until the request is finished (see ``run_pending``) and is
+    dropped, if its atomic block is rolled back (see ``atomic_exit``)
+    """
+    if hasattr(transaction, 'on_commit'):
+        transaction.on_commit(func, using=using)
+        return
+
+    connection = transaction.get_connection(using)
+    if connection.in_atomic_block:
+        # the savepoints of the open atomic blocks, the function is
+        # dropped, when one of them is rolled back
+        get_pending().append((connection.alias, list(connection.savepoint_ids), func))
+    else:
+        run_pending()
+        func()
+
+
+def run_pending(**kwargs):
+    """
+    calls the functions, which were deferred by ``on_commit`` on Django 1.8,
+    if no transaction is active anymore
+    """
+    if any(connection.in_atomic_block for connection in connections.all()):
+        return
+    functions = get_pending()
+    while functions:
+        functions.pop(0)[2]()
+
+
+def discard_pending(using=None, sid=None):
+    """
+    drops the deferred functions of a rolled back transaction of the database
+    ``using`` (or of all databases), or only of its savepoint ``sid``
+    """
+    get_pending()[:] = [
+        (alias, sids, func) for alias, sids, func in get_pending()
+        if (using is not None and alias != using) or (sid is not None and sid not in sids)
+    ]
+
+
+def atomic_exit(self, exc_type, exc_value, traceback):
+    """
+    wraps ``Atomic.__exit__`` on Django 1.8 and drops the deferred functions
+    of a rolled back atomic block. A block without a savepoint is rolled back
+    by its outer block
+    """
+    connection = transaction.get_connection(self.using)
+    outermost = not connection.savepoint_ids
+    sid = None if outermost else connection.savepoint_ids[-1]
+    rollback = exc_type is not None or connection.needs_rollback or connection.closed_in_transaction
+    try:
+        return _atomic_exit(self, exc_type, exc_value, traceback)
+    except Exception:
+        rollback = True
+        raise
+    finally:
+        if rollback and (outermost or sid is not None):
+            discard_pending(connection.alias, sid)
+
+
+if not hasattr(transaction, 'on_commit'):  # pragma: no cover
+    _atomic_exit = transaction.Atomic.__exit__
+    transaction.Atomic.__exit__ = atomic_exit
+    request_finished.connect(run_pending, dispatch_uid='djangobmf.tasks.run_pending')
+
+
+class Task(object):
+    """
+    A function which is executed by the task backend. Calling the task
+    dispatches it to the backend, ``run`` executes it in this process.
+
+    ``key`` is formatted with the arguments of a call (i.e. ``'balance:account:{0}'``),
+    the database backend stores only one pending job per key. ``retries`` is
+    the number of retries of a failed job of the database backend.
+    """
+
+    def __init__(self, func, name=None, key=None, retries=3):
+        self.func = func
+        self.name = name or '%s.%s' % (func.__module__, func.__name__)
+        self.key = key
+        self.retries = retries
+        self._celery = None
+        update_wrapper(self, func)
+
+        # celery workers find the task by its name
+        if settings.USE_CELERY:
+            self.get_celery_task()
+
+    def __repr__(self):
+        return '<Task: %s>' % self.name
+
+    def __call__(self, *args, **kwargs):
+        return get_backend().dispatch(self, args, kwargs)
+
+    def run(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def get_key(self, args, kwargs):
+        if self.key is None:
+            return None
+        return self.key.format(*args, **kwargs)
+
+    def get_celery_task(self):
+        if self._celery is None:
+            from celery import shared_task
+            self._celery = shared_task(self.func, name=self.name)
+        return self._celery
+
+
+def task(func=None, name=None, key=None, retries=3):
+    """
+    Decorator which registers a function as a task
+    """
+    def register(func):
+        obj = Task(func, name=name, key=key, retries=retries)
+        registry[obj.name] = obj
+        return obj
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def get_task(name):
+    if name not in registry:
+        # importing the function registers the task
+        import_string(name)
+    return registry[name]
+
+
+class SyncBackend(object):
+    """
+    Executes the tasks immediately in the current transaction
+    """
+    is_async = False
+
+    def dispatch(self, task, args, kwargs):
+        return task.run(*args, **kwargs)
+
+
+class CeleryBackend(object):
+    """
+    Sends the tasks to celery, after the current transaction is committed
+    """
+    is_async = True
+
+    def dispatch(self, task, args, kwargs):
+        celery_task = task.get_celery_task()
+        on_commit(lambda: celery_task.apply_async(args, kwargs))
+
+
+class ThreadBackend(object):
+    """
+    Executes the tasks in a pool of ``BMF_TASK_THREADS`` threads of the web
+    process, after the current transaction is committed. Tasks, which are
+    not finished, are lost when the process exits.
+    """
+    is_async = True
+
+    def __init__(self):
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def get_pool(self):
+        with self.lock:
+            if self.pool is None:
+                self.pool = ThreadPool(settings.TASK_THREADS)
+        return self.pool
+
+    def execute(self, task, args, kwargs):
+        try:
+            task.run(*args, **kwargs)
+        except Exception:
+            logger.exception('Task %s failed', task.name)
+        finally:
+            # every thread has its own database connections
+            connections.close_all()
+
+    def dispatch(self, task, args, kwargs):
+        on_commit(lambda: self.get_pool().apply_async(self.execute, (task, args, kwargs)))
+
+
+class DatabaseBackend(object):
+    """
+    Stores the tasks as jobs in the database (in the current transaction),
+    which are executed by ``manage.py bmf_worker``
+    """
+    is_async = True
+
+    def dispatch(self, task, args, kwargs):
+        from djangobmf.core.jobs import enqueue
+        enqueue(task, args, kwargs)
+
+
+_backends = {}
+
+
+def get_backend():
+    """
+    returns the task backend from the ``BMF_TASK_BACKEND`` setting. If the
+    setting is ``None``, celery is used with ``BMF_USE_CELERY``, otherwise
+    the tasks are executed immediately
+    """
+    path = settings.TASK_BACKEND
+    if path is None:
+        if settings.USE_CELERY:
+            path = 'djangobmf.core.tasks.CeleryBackend'
+        else:
+            path = 'djangobmf.core.tasks.SyncBackend'
+
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
+
+
+def is_async():
+    """
+    returns True, if the tasks are not executed during the request
+    """
+    return get_backend().is_async
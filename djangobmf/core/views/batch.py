@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.exceptions import PermissionDenied
+from django.core.urlresolvers import Resolver404
+from django.core.urlresolvers import resolve
+from django.http import Http404
+from django.http import QueryDict
+from django.utils import six
+from django.utils.six.moves.urllib.parse import urlsplit
+from django.utils.translation import ugettext_lazy as _
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from djangobmf.conf import settings
+from djangobmf.core.employee import Employee
+
+from collections import OrderedDict
+
+import copy
+import logging
+logger = logging.getLogger(__name__)
+
+
+class View(APIView):
+    """
+    Executes a list of GET requests to the bmf's API within the current
+    request and returns the combined results.
+
+    The request body contains a list of urls (or objects with an ``url``
+    attribute). The user is authenticated once and shared with every
+    sub-request, as well as the session and the employee object.
+    """
+    permission_classes = [IsAuthenticated]
+
+    # the maximal number of requests executed in one batch
+    max_requests = 20
+
+    def get_view_name(self):
+        return 'Batch'
+
+    def get_urls(self, data):
+        if isinstance(data, dict):
+            data = data.get('requests', None)
+
+        if not isinstance(data, list):
+            raise ValidationError(_('You need to provide a list of requests'))
+
+        if len(data) > self.max_requests:
+            raise ValidationError(_('You can not send more than %s requests') % self.max_requests)
+
+        urls = []
+        for item in data:
+            if isinstance(item, dict):
+                if item.get('method', 'GET').upper() != 'GET':
+                    raise ValidationError(_('Only GET requests are supported'))
+                item = item.get('url', None)
+            if not isinstance(item, six.string_types):
+                raise ValidationError(_('Invalid request'))
+            urls.append(item)
+        return urls
+
+    def get_subrequest(self, request, url):
+        """
+        returns a copy of the current django request, which is
+        changed to a GET request on url
+        """
+        parts = urlsplit(url)
+
+        subrequest = copy.copy(request._request)
+        subrequest.method = 'GET'
+        subrequest.path = parts.path
+        subrequest.path_info = parts.path
+        subrequest.GET = QueryDict(parts.query)
+        subrequest.POST = QueryDict()
+        subrequest.META = subrequest.META.copy()
+        subrequest.META.update({
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': parts.path,
+            'QUERY_STRING': parts.query,
+        })
+
+        # skip the authentication in the sub-requests
+        subrequest.user = request.user
+        subrequest._force_auth_user = request.user
+        subrequest._force_auth_token = request.auth
+        return subrequest
+
+    def call(self, request, url):
+        try:
+            match = resolve(urlsplit(url).path)
+        except Resolver404:
+            return 404, None
+
+        # only allow calls to the bmf, and no recursion
+        if settings.APP_LABEL not in match.namespaces or match.url_name == 'api-batch':
+            return 400, None
+
+        try:
+            response = match.func(self.get_subrequest(request, url), *match.args, **match.kwargs)
+        except Http404:
+            return 404, None
+        except PermissionDenied:
+            return 403, None
+
+        return response.status_code, getattr(response, 'data', None)
+
+    def post(self, request, *args, **kwargs):
+        # the employee is loaded once for all requests
+        Employee(request.user)
+
+        data = []
+        for url in self.get_urls(request.data):
+            status, content = self.call(request, url)
+            logger.debug('Batch request %s returned %s', url, status)
+            data.append(OrderedDict([
+                ('url', url),
+                ('status', status),
+                ('data', content),
+            ]))
+
+        return Response(data)
@@ -0,0 +1,53 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from djangobmf.core.changes import Cursor
+from djangobmf.core.changes import get_changes
+from djangobmf.core.views.mixins import BaseMixin
+from djangobmf.permissions import ModuleViewPermission
+
+
+class View(BaseMixin, GenericAPIView):
+    """
+    Returns the ids of the objects of a module, which were created, updated
+    or deleted after the ``cursor`` parameter, in order. The response contains
+    the cursor of the next request and ``more``, if more changes are available.
+    Without a cursor the feed starts with the first object. Changes of the last
+    ``BMF_CHANGES_WINDOW`` seconds can be returned again. Deleted objects of
+    modules, which are filtered per user, are only returned with a cursor.
+    """
+    permission_classes = [ModuleViewPermission]
+
+    # number of changes returned by default and at most
+    default_limit = 1000
+    max_limit = 10000
+
+    def get_queryset(self):
+        return self.get_bmfqueryset()
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'A number is required'})
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request, *args, **kwargs):
+        try:
+            cursor = Cursor.parse(request.GET.get('cursor', None))
+        except ValueError:
+            raise ValidationError({'cursor': 'Invalid cursor'})
+
+        changes, cursor, more = get_changes(self.get_queryset(), cursor, self.get_limit())
+
+        return Response({
+            'cursor': str(cursor),
+            'more': more,
+            'changes': [{'action': action, 'id': pk} for action, pk in changes],
+        })
@@ -6,19 +6,97 @@ from __future__ import unicode_literals
 from django.http import Http404
 from django.http import HttpResponse
 from django.http import FileResponse
+from django.http import HttpResponseNotModified
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.utils.http import parse_etags
+from django.utils.http import parse_http_date_safe
+from django.utils.http import quote_etag
 
-# from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
 from djangobmf.core.filters.document import DocumentFilter
+from djangobmf.core.preview import can_preview
+from djangobmf.core.preview import get_preview
+from djangobmf.core.tasks import is_async
 from djangobmf.core.permissions.document import DocumentPermission
+from djangobmf.core.permissions.document import DocumentUploadPermission
 from djangobmf.core.pagination import DocumentPagination
 from djangobmf.core.serializers.document import DocumentSerializer
+from djangobmf.core.serializers.document import DocumentUploadSerializer
 from djangobmf.core.views.mixins import BaseMixin
 from djangobmf.models import Document
+from djangobmf.models import DocumentUpload
 from djangobmf.conf import settings
+from djangobmf.storage import TemporaryHashedFile
+from djangobmf.storage import default_storage
+from djangobmf.tasks import generate_previews
 
+import calendar
+import errno
+import hashlib
 import os
+import re
+import threading
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# maximal number of running upload hashes in the process
+UPLOAD_HASHES_SIZE = 1000
+
+# running sha1 of the chunked uploads by their token: (offset, hash)
+_upload_hashes = {}
+_upload_lock = threading.Lock()
+
+
+def iter_range(fileobj, start, length, chunk_size=65536):
+    """
+    yields ``length`` bytes of the file, beginning at ``start``
+    """
+    try:
+        fileobj.seek(start)
+        while length > 0:
+            data = fileobj.read(min(chunk_size, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        fileobj.close()
+
+
+def get_upload_hash(upload, path):
+    """
+    returns the sha1 of the first ``offset`` bytes of an upload. The hash is
+    kept in memory between the chunks. If another process received the last
+    chunk, the received bytes are read again
+    """
+    with _upload_lock:
+        entry = _upload_hashes.get(upload.token)
+    if entry is not None and entry[0] == upload.offset:
+        return entry[1].copy()
+
+    sha1 = hashlib.sha1()
+    if upload.offset:
+        for data in iter_range(open(path, 'rb'), 0, upload.offset):
+            sha1.update(data)
+    return sha1
+
+
+def set_upload_hash(token, offset, sha1):
+    with _upload_lock:
+        if len(_upload_hashes) >= UPLOAD_HASHES_SIZE:
+            _upload_hashes.clear()
+        _upload_hashes[token] = (offset, sha1)
+
+
+def remove_upload_hash(token):
+    with _upload_lock:
+        _upload_hashes.pop(token, None)
 
 
 class View(BaseMixin, ModelViewSet):
@@ -30,9 +108,22 @@ class View(BaseMixin, ModelViewSet):
     pagination_class = DocumentPagination
     filter_backends = [DocumentFilter]
 
+    upload_actions = ['upload_create', 'upload_status', 'upload_chunk', 'upload_finish', 'upload_abort']
+
+    # seconds a browser may cache previews without revalidation
+    preview_max_age = 86400
+
+    # maximal size of one chunk of an upload
+    upload_chunk_size = 8 * 1024 * 1024
+
     def get_view_name(self):
         return 'Documents'
 
+    def get_permissions(self):
+        if self.action in self.upload_actions:
+            return [DocumentUploadPermission()]
+        return super(View, self).get_permissions()
+
     def get_queryset(self):
         return Document.objects.all()
 
@@ -93,6 +184,77 @@ class View(BaseMixin, ModelViewSet):
 
         serializer.save()
 
+    def get_etag(self, obj):
+        """
+        the sha1 of the file is used as a strong etag
+        """
+        if obj.sha1:
+            return quote_etag(obj.sha1)
+        return None
+
+    def get_last_modified(self, obj):
+        if obj.modified:
+            return calendar.timegm(obj.modified.utctimetuple())
+        return None
+
+    def is_not_modified(self, request, etag, last_modified):
+        """
+        checks the If-None-Match and If-Modified-Since headers
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', None)
+        if if_none_match:
+            if not etag:
+                return False
+            etags = [e.strip('"') for e in parse_etags(if_none_match)]
+            return '*' in etags or etag.strip('"') in etags
+
+        if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE', None)
+        if if_modified_since and last_modified:
+            if_modified_since = parse_http_date_safe(if_modified_since)
+            return if_modified_since is not None and last_modified <= if_modified_since
+
+        return False
+
+    def get_range(self, request, size, etag, last_modified):
+        """
+        returns the requested byte range as a tuple (start, end), None if the
+        whole file should be send or False if the range is not satisfiable.
+        Only single ranges are supported.
+        """
+        header = request.META.get('HTTP_RANGE', None)
+        if not header:
+            return None
+
+        # If-Range: send the whole file, if it has changed
+        if_range = request.META.get('HTTP_IF_RANGE', None)
+        if if_range:
+            if if_range.startswith('"') or if_range.startswith('W/'):
+                if not etag or if_range != etag:
+                    return None
+            elif parse_http_date_safe(if_range) != last_modified:
+                return None
+
+        match = RANGE_RE.match(header.strip())
+        if not match:
+            return None
+
+        start, end = match.groups()
+        if not start and not end:
+            return None
+
+        if not start:
+            # suffix range
+            length = int(end)
+            if length == 0:
+                return False
+            return max(size - length, 0), size - 1
+
+        start = int(start)
+        end = int(end) if end else size - 1
+        if start >= size or end < start:
+            return False
+        return start, min(end, size - 1)
+
     def download(self, request, pk):
         """
         download the document (filestream-response)
@@ -113,25 +275,232 @@ class View(BaseMixin, ModelViewSet):
         if not request.method == "GET":
             return HttpResponse()
 
-        # Nginx (TODO: untested)
-        if sendtype == "xaccel" and not settings.DEBUG:
+        etag = self.get_etag(obj)
+        last_modified = self.get_last_modified(obj)
+
+        if self.is_not_modified(request, etag, last_modified):
+            response = HttpResponseNotModified()
+
+        # Nginx (serves ranges and conditional requests itself)
+        elif sendtype == "xaccel" and not settings.DEBUG:
             response = HttpResponse()
-            response['Content-Type'] = 'application/force-download'
-            response['Content-Disposition'] = 'inline; filename=%s' % filename
+            response['Content-Type'] = obj.mimetype or 'application/octet-stream'
             response['X-Accel-Redirect'] = fileuri
-            return response
 
-        # Lighthttpd or Apache with mod_xsendfile (TODO: untested)
-        if sendtype == "xsendfile" and not settings.DEBUG:
+        # Lighthttpd or Apache with mod_xsendfile
+        elif sendtype == "xsendfile" and not settings.DEBUG:
             response = HttpResponse()
-            response['Content-Type'] = 'application/force-download'
-            response['Content-Disposition'] = 'inline; filename=%s' % filename
+            response['Content-Type'] = obj.mimetype or 'application/octet-stream'
             response['X-Sendfile'] = filepath
-            return response
 
         # Serve file with django
-        response = FileResponse(obj.file)
-        response['Content-Type'] = obj.mimetype
-        response['Content-Disposition'] = 'inline; filename=%s' % filename
-        response['Content-Length'] = obj.file.size
+        else:
+            size = os.path.getsize(filepath)
+            byterange = self.get_range(request, size, etag, last_modified)
+
+            if byterange is False:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = 'bytes */%s' % size
+                return response
+
+            if byterange:
+                start, end = byterange
+                response = StreamingHttpResponse(
+                    iter_range(open(filepath, 'rb'), start, end - start + 1),
+                    status=206,
+                )
+                response['Content-Range'] = 'bytes %s-%s/%s' % (start, end, size)
+                response['Content-Length'] = end - start + 1
+            else:
+                response = FileResponse(open(filepath, 'rb'))
+                response['Content-Length'] = size
+
+            response['Content-Type'] = obj.mimetype or 'application/octet-stream'
+            response['Accept-Ranges'] = 'bytes'
+
+        if response.status_code != 304:
+            response['Content-Disposition'] = 'inline; filename=%s' % filename
+        if etag:
+            response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def preview(self, request, pk, size):
+        """
+        serves a preview image of the document. Missing previews are
+        created by a task (the response is ``202 Accepted`` with an asynchronous
+        task backend)
+        """
+        obj = self.get_object()
+
+        if size not in settings.DOCUMENT_PREVIEW_SIZES or not can_preview(obj):
+            raise Http404
+        size = settings.DOCUMENT_PREVIEW_SIZES[size]
+
+        etag = quote_etag('%s-%s' % (obj.sha1, size))
+
+        if self.is_not_modified(request, etag, None):
+            response = HttpResponseNotModified()
+        else:
+            name = get_preview(obj, size)
+            if not name:
+                generate_previews(obj.pk)
+                if is_async():
+                    response = HttpResponse(status=status.HTTP_202_ACCEPTED)
+                    response['Retry-After'] = 5
+                    return response
+                name = get_preview(obj, size)
+                if not name:
+                    raise Http404
+
+            response = FileResponse(default_storage.open(name, 'rb'))
+            response['Content-Type'] = 'image/jpeg'
+            response['Content-Length'] = default_storage.size(name)
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=self.preview_max_age)
         return response
+
+    # Chunked uploads =========================================================
+
+    def get_upload(self, token):
+        try:
+            return DocumentUpload.objects.get(token=token, user=self.request.user)
+        except DocumentUpload.DoesNotExist:
+            raise Http404
+
+    def get_upload_response(self, upload, code=status.HTTP_200_OK):
+        return Response(DocumentUploadSerializer(upload).data, status=code)
+
+    def upload_create(self, request, **kwargs):
+        """
+        starts a new upload. the file is attached to the related object
+        (if given in the url) when the upload is finished
+        """
+        serializer = DocumentUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        if self.get_related_object():
+            upload = serializer.save(
+                user=request.user,
+                content_type=self.get_bmfcontenttype(),
+                content_id=self.related_object.pk,
+            )
+        else:
+            upload = serializer.save(user=request.user)
+
+        return self.get_upload_response(upload, status.HTTP_201_CREATED)
+
+    def upload_status(self, request, token):
+        """
+        returns the number of bytes received (``offset``)
+        """
+        return self.get_upload_response(self.get_upload(token))
+
+    def upload_chunk(self, request, token):
+        """
+        appends the request body to the upload. The chunk has to start at
+        the ``offset`` of the upload, given as query parameter. Chunks which
+        were already received are ignored, so a chunk can be resend safely.
+        """
+        upload = self.get_upload(token)
+
+        try:
+            offset = int(request.GET.get('offset', upload.offset))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return Response({'detail': 'Invalid offset'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if length > self.upload_chunk_size:
+            return Response(status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        if offset != upload.offset:
+            if 0 <= offset and offset + length <= upload.offset:
+                return self.get_upload_response(upload)
+            return self.get_upload_response(upload, status.HTTP_409_CONFLICT)
+
+        if upload.size is not None and offset + length > upload.size:
+            return Response({'detail': 'The chunk exceeds the size of the upload'}, status=status.HTTP_400_BAD_REQUEST)
+
+        path = default_storage.path(upload.temp_name)
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        sha1 = get_upload_hash(upload, path)
+
+        received = 0
+        with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+            f.seek(offset)
+            while received < length:
+                data = request._request.read(min(65536, length - received))
+                if not data:
+                    break
+                f.write(data)
+                sha1.update(data)
+                received += len(data)
+            f.truncate()
+
+        if received != length:
+            return Response({'detail': 'Incomplete chunk'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # only one request can move the offset
+        if not DocumentUpload.objects.filter(pk=upload.pk, offset=offset).update(
+            offset=offset + received,
+            sha1=sha1.hexdigest(),
+        ):
+            return self.get_upload_response(self.get_upload(token), status.HTTP_409_CONFLICT)
+        set_upload_hash(token, offset + received, sha1)
+
+        return self.get_upload_response(self.get_upload(token))
+
+    def upload_finish(self, request, token):
+        """
+        creates the document from the uploaded chunks. The chunks are hashed
+        when they are received, the file is moved to the document storage
+        """
+        upload = self.get_upload(token)
+
+        if upload.size is not None and upload.offset != upload.size:
+            return Response({'detail': 'The upload is incomplete'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if upload.content_type_id:
+            self.model = upload.content_type.model_class()
+            self.related_object = self.get_bmfobject(upload.content_id)
+            self.check_permissions(request)
+        else:
+            self.related_object = None
+
+        path = default_storage.path(upload.temp_name)
+        if not os.path.exists(path):
+            return Response({'detail': 'The upload is empty'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # the temporary file is moved to the storage with the hash of its chunks
+        sha1 = upload.sha1 or get_upload_hash(upload, path).hexdigest()
+        content = TemporaryHashedFile(path, sha1, upload.offset, name=upload.name)
+        try:
+            serializer = self.get_serializer(data={
+                'name': upload.name,
+                'description': upload.description,
+                'file': content,
+            })
+            serializer.is_valid(raise_exception=True)
+            self.perform_create(serializer)
+        finally:
+            content.close()
+
+        default_storage.delete(upload.temp_name)
+        remove_upload_hash(token)
+        upload.delete()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def upload_abort(self, request, token):
+        upload = self.get_upload(token)
+        default_storage.delete(upload.temp_name)
+        remove_upload_hash(token)
+        upload.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,59 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.http import StreamingHttpResponse
+
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import GenericAPIView
+
+from djangobmf.core.export import get_rows
+from djangobmf.core.export import stream_csv
+from djangobmf.core.export import stream_ndjson
+from djangobmf.core.views.mixins import BaseMixin
+from djangobmf.filters import RangeFilterBackend
+from djangobmf.filters import SearchFilterBackend
+from djangobmf.filters import ViewFilterBackend
+from djangobmf.permissions import ModuleViewPermission
+
+
+class View(BaseMixin, GenericAPIView):
+    """
+    Streams all objects of a module as CSV or NDJSON. The module's
+    ``filter_queryset`` and the view and range filters are applied
+    like in the list API.
+    """
+    permission_classes = [ModuleViewPermission]
+    filter_backends = (ViewFilterBackend, RangeFilterBackend, SearchFilterBackend)
+
+    # number of rows fetched from the database with one query
+    chunk_size = 2000
+
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson; charset=utf-8',
+    }
+
+    def get_queryset(self):
+        return self.get_bmfqueryset()
+
+    def get_serializer_class(self):
+        return self.get_bmfmodel()._bmfmeta.serializer_class
+
+    def get(self, request, *args, **kwargs):
+        filetype = self.kwargs.get('filetype', None)
+        if filetype not in self.content_types:
+            raise NotFound()
+
+        rows = get_rows(self.get_serializer(), self.filter_queryset(self.get_queryset()), self.chunk_size)
+
+        response = StreamingHttpResponse(
+            stream_csv(rows) if filetype == 'csv' else stream_ndjson(rows),
+            content_type=self.content_types[filetype],
+        )
+        response['Content-Disposition'] = 'attachment; filename=%s.%s' % (
+            self.get_bmfmodel()._meta.model_name,
+            filetype,
+        )
+        return response
@@ -4,12 +4,45 @@
 from __future__ import unicode_literals
 
 from django.apps import apps
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.urlresolvers import reverse
+from django.http import FileResponse
+from django.http import Http404
+from django.http import HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.utils.http import parse_etags
+from django.utils.http import quote_etag
 from djangobmf.conf import settings
 
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
 
+from djangobmf.core.filter_queryset import FilterQueryset
 from djangobmf.core.permissions import DetailPermission
+from djangobmf.core.report import PYPDF2
+from djangobmf.core.report import get_batch
+from djangobmf.core.report import get_report
+from djangobmf.core.report import start_batch
+from djangobmf.core.report import write_batch
+from djangobmf.core.tasks import is_async
 from djangobmf.core.views.mixins import BaseMixin
+from djangobmf.filters import RangeFilterBackend
+from djangobmf.filters import SearchFilterBackend
+from djangobmf.filters import ViewFilterBackend
+from djangobmf.permissions import ModuleUpdatePermission
+from djangobmf.permissions import ModuleViewPermission
+from djangobmf.storage import default_storage
+from djangobmf.tasks.report import create_report_snapshot
+
+from calendar import timegm
+
+import os
+import tempfile
 
 
 class View(BaseMixin, GenericAPIView):
@@ -24,4 +57,183 @@ class View(BaseMixin, GenericAPIView):
         obj = self.get_bmfobject(self.kwargs.get('pk', None))
         module = self.get_bmfmodule()
         report, renderer = module.get_object_report(self.kwargs.get('slug', None))
-        return report(request, object=obj, renderer=renderer)
+        return report(request, object=obj, renderer=renderer, slug=self.kwargs.get('slug', None))
+
+
+class BatchView(BaseMixin, GenericAPIView):
+    """
+    Renders the report of many objects to one PDF file or a ZIP archive. The
+    objects are selected by ``pk`` parameters or by the filters of the list API.
+    With an asynchronous task backend the file is rendered by a task and the
+    response (202) points to its download (``BatchDownloadView``), otherwise
+    the file is rendered and returned by the request.
+    """
+    permission_classes = [ModuleViewPermission]
+    filter_backends = (ViewFilterBackend, RangeFilterBackend, SearchFilterBackend)
+
+    # maximal number of reports rendered with one request
+    max_objects = 1000
+
+    def get_queryset(self):
+        return self.get_bmfqueryset()
+
+    def get_pks(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        pks = [pk for pk in self.request.GET.getlist('pk') if pk.isdigit()]
+        if pks:
+            queryset = queryset.filter(pk__in=pks)
+        return list(queryset.order_by('pk').values_list('pk', flat=True)[:self.max_objects + 1])
+
+    def post(self, request, *args, **kwargs):
+        filetype = self.kwargs.get('filetype', None)
+        slug = self.kwargs.get('slug', None)
+        model = self.get_bmfmodel()
+
+        if filetype not in BatchDownloadView.content_types:
+            raise NotFound()
+
+        if filetype == 'pdf' and not PYPDF2:
+            return Response(
+                {'detail': 'Merging PDF files requires PyPDF2'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            get_report(model, slug)
+        except (ObjectDoesNotExist, Http404):
+            raise NotFound()
+
+        pks = self.get_pks()
+        if not pks:
+            raise NotFound()
+        if len(pks) > self.max_objects:
+            return Response(
+                {'detail': 'Only %s reports can be rendered at once' % self.max_objects},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not is_async():
+            return self.render_batch(model, slug, pks, filetype)
+
+        token = start_batch(model, slug, pks, filetype, request.user)
+        url = reverse('djangobmf:api-report-batch-download', kwargs={'token': token, 'filetype': filetype})
+
+        response = Response({'token': token, 'url': url}, status=status.HTTP_202_ACCEPTED)
+        response['Location'] = url
+        return response
+
+    def render_batch(self, model, slug, pks, filetype):
+        output = tempfile.TemporaryFile()
+        try:
+            write_batch(model, slug, pks, filetype, output)
+        except Exception:
+            output.close()
+            raise
+
+        response = FileResponse(output, content_type=BatchDownloadView.content_types[filetype])
+        response['Content-Length'] = os.fstat(output.fileno()).st_size
+        response['Content-Disposition'] = 'attachment; filename=%s.%s' % (slug, filetype)
+        return response
+
+
+class BatchDownloadView(BaseMixin, GenericAPIView):
+    """
+    Serves a rendered batch of reports to the user, who requested it.
+    Returns 202, while the batch is rendered.
+    """
+    permission_classes = []
+
+    content_types = {
+        'pdf': 'application/pdf',
+        'zip': 'application/zip',
+    }
+
+    def get(self, request, *args, **kwargs):
+        filetype = self.kwargs.get('filetype', None)
+        state, name = get_batch(request.user, self.kwargs.get('token', None), filetype)
+
+        if state is None:
+            raise NotFound()
+
+        if state == 'pending':
+            return Response({'state': state}, status=status.HTTP_202_ACCEPTED)
+
+        if state == 'failed':
+            return Response({'state': state}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        response = FileResponse(default_storage.open(name, 'rb'), content_type=self.content_types[filetype])
+        response['Content-Length'] = default_storage.size(name)
+        response['Content-Disposition'] = 'attachment; filename=%s' % name.rsplit('/', 1)[-1]
+        return response
+
+
+class SnapshotView(BaseMixin, GenericAPIView):
+    """
+    Serves the latest snapshot of a report (or its dataset) without rendering
+    it. A POST requests a new snapshot (with the change permission), which is
+    created by a task (with an asynchronous task backend) or by the next run of
+    ``bmf_report_snapshots``.
+    """
+    permission_classes = [ModuleViewPermission]
+
+    def get_report(self):
+        model = self.get_bmfmodel()
+
+        # snapshots are created without a user, so they are only
+        # available, if the objects of the model are visible to all users
+        if type(model._bmfmeta.filter_queryset) is not FilterQueryset and not self.request.user.is_superuser:
+            raise PermissionDenied()
+
+        try:
+            report, cls = self.get_bmfmodule().get_snapshot_report(self.kwargs.get('slug', None))
+        except (ObjectDoesNotExist, Http404):
+            raise NotFound()
+        return report
+
+    def get(self, request, *args, **kwargs):
+        report = self.get_report()
+
+        try:
+            snapshot = report.snapshots.latest()
+        except ObjectDoesNotExist:
+            raise NotFound()
+
+        if self.kwargs.get('dataset', False):
+            name = snapshot.dataset
+            content_type = 'application/x-ndjson'
+        else:
+            name = snapshot.name
+            content_type = snapshot.mimetype
+
+        etag = quote_etag('%s-%s' % (snapshot.pk, name.rsplit('.', 1)[-1]))
+
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', None)
+        if if_none_match and etag.strip('"') in [e.strip('"') for e in parse_etags(if_none_match)]:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(default_storage.open(name, 'rb'), content_type=content_type)
+            response['Content-Length'] = default_storage.size(name)
+            response['Content-Disposition'] = 'inline; filename=%s-%s.%s' % (
+                report.slug,
+                timezone.localtime(snapshot.created).strftime('%Y%m%d-%H%M'),
+                name.rsplit('.', 1)[-1],
+            )
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(timegm(snapshot.created.utctimetuple()))
+        patch_cache_control(response, private=True, max_age=0)
+        return response
+
+    def post(self, request, *args, **kwargs):
+        # rendering a new snapshot requires the change permission
+        if not ModuleUpdatePermission().has_permission(request, self):
+            self.permission_denied(request)
+
+        report = self.get_report()
+
+        if is_async():
+            create_report_snapshot(report.pk)
+        else:
+            report.__class__.objects.filter(pk=report.pk).update(next_snapshot=timezone.now())
+
+        return Response(status=status.HTTP_202_ACCEPTED)
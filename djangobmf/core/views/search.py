@@ -0,0 +1,114 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.utils.encoding import force_text
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from djangobmf.conf import settings
+from djangobmf.core.search import get_backend
+from djangobmf.core.search import get_label
+from djangobmf.core.search import get_search_text
+from djangobmf.core.search import normalize_query
+from djangobmf.core.search import rank_text
+from djangobmf.core.search import search_queryset
+
+from collections import OrderedDict
+
+
+class View(APIView):
+    """
+    Searches all registered modules with the search index and returns
+    the best matches of every module. Only modules the user is allowed
+    to view are searched, and every module's ``filter_queryset`` is
+    applied to the matches.
+    """
+    permission_classes = [IsAuthenticated]
+
+    # number of objects returned per module
+    limit = 5
+    max_limit = 20
+
+    def get_view_name(self):
+        return 'Search'
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', self.limit))
+        except ValueError:
+            return self.limit
+        return max(1, min(limit, self.max_limit))
+
+    def get_models(self):
+        """
+        returns all searchable models the user has access to
+        """
+        config = apps.get_app_config(settings.APP_LABEL)
+        models = []
+        for model in config._modules:
+            if not model._bmfmeta.search_fields or model._bmfmeta.only_related:
+                continue
+            perm = '%s.view_%s' % (model._meta.app_label, model._meta.model_name)
+            if not self.request.user.has_perm(perm):
+                continue
+            models.append(model)
+        return models
+
+    def get_queryset(self, model):
+        return model._bmfmeta.filter_queryset(model.objects.all(), self.request.user)
+
+    def search_index(self, backend, model, terms, limit):
+        """
+        ranks the matches from the index in the database. The module's
+        queryset is applied as a subquery, so no objects are loaded
+        """
+        return backend.rank(self.get_queryset(model), terms, limit)
+
+    def search_lookups(self, model, terms, limit):
+        objects = search_queryset(self.get_queryset(model), ' '.join('"%s"' % term for term in terms))
+        return [(rank_text(get_search_text(obj), terms), obj.pk, get_label(obj)) for obj in objects[:limit]]
+
+    def get(self, request, *args, **kwargs):
+        terms = normalize_query(request.GET.get('q', ''))
+        if not terms:
+            return Response({'query': '', 'results': []})
+
+        backend = get_backend()
+        limit = self.get_limit()
+
+        results = []
+        for model in self.get_models():
+            if backend is None:
+                items = self.search_lookups(model, terms, limit)
+            else:
+                items = self.search_index(backend, model, terms, limit)
+
+            if not items:
+                continue
+
+            results.append(OrderedDict([
+                ('app', model._meta.app_label),
+                ('model', model._meta.model_name),
+                ('name', force_text(model._meta.verbose_name_plural)),
+                ('rank', max(item[0] for item in items)),
+                ('items', [
+                    OrderedDict([
+                        ('pk', pk),
+                        ('name', label),
+                        ('rank', rank),
+                    ])
+                    for rank, pk, label in items
+                ]),
+            ]))
+
+        results.sort(key=lambda i: -i['rank'])
+
+        return Response({
+            'query': ' '.join(terms),
+            'results': results,
+        })
@@ -11,6 +11,8 @@ from django.utils.encoding import force_str
 
 from djangobmf.conf import settings
 
+from rest_framework.exceptions import AuthenticationFailed
+
 from functools import wraps
 
 
@@ -21,6 +23,16 @@ def login_required(view_func=None, redirect_field_name=REDIRECT_FIELD_NAME):
     """
     @wraps(view_func, assigned=available_attrs(view_func))
     def wrapped_view(request, *args, **kwargs):
+        if not request.user.is_authenticated():
+            # api clients send a json web token instead of a session cookie
+            from djangobmf.authentication import JWTAuthentication
+            try:
+                auth = JWTAuthentication().authenticate(request)
+            except AuthenticationFailed:
+                auth = None
+            if auth:
+                request.user = auth[0]
+
         if request.user.is_authenticated():
             return view_func(request, *args, **kwargs)
         return redirect_to_login(
@@ -32,12 +44,19 @@ def login_required(view_func=None, redirect_field_name=REDIRECT_FIELD_NAME):
 
 def optional_celery(func):
     """
+    Deprecated: use ``djangobmf.core.tasks.task``, which dispatches the task
+    after the current transaction is committed
     """
+    celery_task = []
+
     @wraps(func, assigned=available_attrs(func))
     def wrapped_task(*args, **kwargs):
         if settings.USE_CELERY:
-            from celery import shared_task
-            return shared_task(func).apply_async(args, kwargs)
+            # the celery task is created once
+            if not celery_task:
+                from celery import shared_task
+                celery_task.append(shared_task(func))
+            return celery_task[0].apply_async(args, kwargs)
         else:
             return func(*args, **kwargs)
     return wrapped_task
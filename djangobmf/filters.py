@@ -8,6 +8,7 @@ from django.utils.timezone import get_current_timezone
 
 from rest_framework.filters import BaseFilterBackend
 
+from djangobmf.core.search import search_queryset
 from djangobmf.sites import site
 
 import datetime
@@ -70,3 +71,18 @@ class RangeFilterBackend(BaseFilterBackend):
             return queryset
 
         return queryset.filter(**{'%s__gte' % fieldname: i, '%s__lt' % fieldname: f})
+
+
+class SearchFilterBackend(BaseFilterBackend):
+    """
+    filter the queryset with the search fields of the model
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.GET.get('search', None)
+
+        # variable not set
+        if not query:
+            return queryset
+
+        return search_queryset(queryset, query)
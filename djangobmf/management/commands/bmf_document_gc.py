@@ -0,0 +1,46 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from djangobmf.core.preview import remove_stale_previews
+from djangobmf.core.report import remove_stale_artifacts
+from djangobmf.models import DocumentUpload
+from djangobmf.storage import default_storage
+
+import datetime
+
+
+class Command(BaseCommand):
+    help = "Removes stale uploads, previews, reports and unreferenced blobs from the document storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--upload-age', type=int, default=48,
+            help='Remove unfinished uploads, which were not modified for this number of hours',
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        uploads = DocumentUpload.objects.filter(
+            modified__lt=now() - datetime.timedelta(hours=options['upload_age']),
+        )
+        for upload in uploads:
+            default_storage.delete(upload.temp_name)
+            upload.delete()
+            count += 1
+        self.stdout.write('%s stale uploads removed' % count)
+
+        count = remove_stale_previews()
+        self.stdout.write('%s stale previews removed' % count)
+
+        count = remove_stale_artifacts()
+        self.stdout.write('%s stored reports of deleted objects removed' % count)
+
+        # content addressed storage
+        if hasattr(default_storage, 'gc'):
+            count = default_storage.gc()
+            self.stdout.write('%s blobs removed' % count)
@@ -0,0 +1,30 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from djangobmf.tasks.document import DocumentScanner
+
+
+class Command(BaseCommand):
+    help = "Verifies the files of all documents and updates their sha1, size and existence"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Number of threads reading files')
+        parser.add_argument('--batch-size', type=int, default=200, help='Number of documents per update')
+        parser.add_argument('--start', type=int, default=None, help='Start after this primary key')
+        parser.add_argument('--resume', action='store_true', default=False, help='Resume an interrupted scan')
+
+    def progress(self, scanned, total, changed):
+        self.stdout.write('%s/%s documents scanned, %s changed' % (scanned, total, changed))
+
+    def handle(self, *args, **options):
+        scanner = DocumentScanner(
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            callback=self.progress if options['verbosity'] > 1 else None,
+        )
+        scanned, changed = scanner.scan(start=options['start'], resume=options['resume'])
+        self.stdout.write('%s documents scanned, %s changed' % (scanned, changed))
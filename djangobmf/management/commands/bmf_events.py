@@ -0,0 +1,39 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from djangobmf.core.outbox import drain
+from djangobmf.core.outbox import get_model
+from djangobmf.core.outbox import replay
+
+from datetime import timedelta
+
+
+class Command(BaseCommand):
+    help = "Processes the pending activity events, replays processed events or removes old ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of events per transaction')
+        parser.add_argument('--replay', type=int, default=None, help='Replay the events from this primary key')
+        parser.add_argument('--purge', type=int, default=None, help='Remove events processed before n days')
+
+    def handle(self, *args, **options):
+        if options['replay'] is not None:
+            count = replay(options['replay'], options['batch_size'])
+            self.stdout.write('%s events replayed' % count)
+
+        elif options['purge'] is not None:
+            queryset = get_model().objects.filter(
+                processed__lt=timezone.now() - timedelta(days=options['purge']),
+            )
+            count = queryset.count()
+            queryset.delete()
+            self.stdout.write('%s events removed' % count)
+
+        else:
+            count = drain(options['batch_size'])
+            self.stdout.write('%s events processed' % count)
@@ -0,0 +1,19 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from djangobmf.core.digest import send_digests
+
+
+class Command(BaseCommand):
+    help = "Sends every user an email with the notifications, which changed since the last digest"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of users per batch')
+
+    def handle(self, *args, **options):
+        count = send_digests(options['batch_size'])
+        self.stdout.write('%s digests sent' % count)
@@ -0,0 +1,18 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from djangobmf.core.report import create_due_snapshots
+from djangobmf.tasks.report import create_report_snapshot
+
+
+class Command(BaseCommand):
+    help = "Creates the snapshots of all reports, which are due (should be called every minute)"
+
+    def handle(self, *args, **options):
+        count = create_due_snapshots(create_report_snapshot)
+        if options['verbosity'] > 1 or count:
+            self.stdout.write('%s snapshots created' % count)
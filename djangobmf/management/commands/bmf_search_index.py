@@ -0,0 +1,40 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from djangobmf.core.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the search index of all models with search_fields"
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help='Only rebuild these models (app_label.ModelName)')
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if backend is None:
+            raise CommandError('The search index is disabled (BMF_SEARCH_BACKEND = False)')
+
+        if options['models']:
+            try:
+                models = [apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+        else:
+            models = apps.get_models()
+
+        for model in models:
+            if not getattr(getattr(model, '_bmfmeta', None), 'search_fields', None):
+                continue
+            count = backend.rebuild(model)
+            self.stdout.write('%s.%s: %s objects indexed' % (
+                model._meta.app_label,
+                model._meta.object_name,
+                count,
+            ))
@@ -0,0 +1,58 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from djangobmf.conf import settings
+from djangobmf.core.jobs import Worker
+from djangobmf.core.tasks import set_worker
+
+from multiprocessing import Process
+
+import signal
+
+
+def run_worker(threads, timeout, poll, burst):
+    set_worker()
+    worker = Worker(threads=threads, timeout=timeout, poll=poll)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    return worker.run(burst=burst)
+
+
+class Command(BaseCommand):
+    help = "Executes the jobs of the database task backend (BMF_TASK_BACKEND)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes')
+        parser.add_argument('--threads', type=int, default=settings.TASK_THREADS, help='Threads per process')
+        parser.add_argument('--timeout', type=int, default=None, help='Seconds until a claimed job is retried')
+        parser.add_argument('--poll', type=float, default=1.0, help='Seconds between polls of an empty queue')
+        parser.add_argument('--burst', action='store_true', default=False, help='Exit when the queue is empty')
+
+    def handle(self, *args, **options):
+        arguments = (options['threads'], options['timeout'], options['poll'], options['burst'])
+
+        if options['processes'] <= 1:
+            count = run_worker(*arguments)
+            if options['verbosity'] > 1:
+                self.stdout.write('%s jobs executed' % count)
+            return
+
+        # the processes need to open their own database connections
+        connections.close_all()
+
+        processes = [Process(target=run_worker, args=arguments) for i in range(options['processes'])]
+        for process in processes:
+            process.start()
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+                process.join()
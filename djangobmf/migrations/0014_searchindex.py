@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import DatabaseError
+from django.db import migrations, models
+from django.db import transaction
+
+
+def create_fulltext_index(apps, schema_editor):
+    connection = schema_editor.connection
+    table = apps.get_model('djangobmf', 'SearchIndex')._meta.db_table
+
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX %s ON %s USING gin (to_tsvector('simple', text))" % (
+                schema_editor.quote_name('%s_tsv' % table),
+                schema_editor.quote_name(table),
+            )
+        )
+        cursor = connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone()[0]:
+            schema_editor.execute(
+                "CREATE INDEX %s ON %s USING gin (text gin_trgm_ops)" % (
+                    schema_editor.quote_name('%s_trgm' % table),
+                    schema_editor.quote_name(table),
+                )
+            )
+        cursor.close()
+
+    if connection.vendor == 'sqlite':
+        # sqlite needs to be compiled with FTS5
+        try:
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute('CREATE VIRTUAL TABLE %s USING fts5(text)' % (
+                    schema_editor.quote_name('%s_fts' % table),
+                ))
+        except DatabaseError:
+            pass
+
+
+def drop_fulltext_index(apps, schema_editor):
+    connection = schema_editor.connection
+    table = apps.get_model('djangobmf', 'SearchIndex')._meta.db_table
+
+    if connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS %s' % schema_editor.quote_name('%s_fts' % table))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('djangobmf', '0013_update_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndex',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField(editable=False)),
+                ('text', models.TextField(blank=True, editable=False)),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('contenttype', models.ForeignKey(to='contenttypes.ContentType', related_name='+', editable=False)),
+            ],
+            options={
+                'abstract': False,
+                'default_permissions': (),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchindex',
+            unique_together=set([('contenttype', 'object_id')]),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
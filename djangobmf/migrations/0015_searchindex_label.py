@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf', '0014_searchindex'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchindex',
+            name='label',
+            field=models.CharField(max_length=255, blank=True, default='', editable=False),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.conf import settings
+import django.db.models.deletion
+import djangobmf.models.upload
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('djangobmf', '0015_searchindex_label'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentUpload',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(default=djangobmf.models.upload.generate_token, editable=False, max_length=32, unique=True)),
+                ('name', models.CharField(max_length=120, verbose_name='Name')),
+                ('description', models.TextField(null=True, verbose_name='Description', blank=True)),
+                ('size', models.PositiveIntegerField(null=True, blank=True)),
+                ('offset', models.PositiveIntegerField(default=0, editable=False)),
+                ('content_id', models.PositiveIntegerField(null=True, blank=True, editable=False)),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='Modified')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('content_type', models.ForeignKey(related_name='+', blank=True, editable=False, to='contenttypes.ContentType', null=True, on_delete=django.db.models.deletion.CASCADE)),
+                ('user', models.ForeignKey(related_name='+', blank=True, editable=False, to=settings.AUTH_USER_MODEL, null=True, on_delete=django.db.models.deletion.CASCADE)),
+            ],
+            options={
+                'abstract': False,
+                'default_permissions': (),
+            },
+        ),
+    ]
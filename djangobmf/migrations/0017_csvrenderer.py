@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf', '0016_documentupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CSVRenderer',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20, verbose_name='Name')),
+                ('delimiter', models.CharField(default=',', max_length=1, verbose_name='Delimiter')),
+                ('header', models.BooleanField(default=True, verbose_name='Header')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='Modified')),
+            ],
+            options={
+                'verbose_name': 'CSV Renderer',
+                'verbose_name_plural': 'CSV Renderer',
+                'get_latest_by': 'modified',
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf', '0017_csvrenderer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='schedule',
+            field=models.CharField(help_text='Creates snapshots of the report (cron format: minute hour day month weekday)', max_length=100, null=True, verbose_name='Schedule', blank=True),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='next_snapshot',
+            field=models.DateTimeField(verbose_name='Next snapshot', null=True, editable=False, blank=True),
+        ),
+        migrations.CreateModel(
+            name='ReportSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, editable=False)),
+                ('dataset', models.CharField(max_length=255, editable=False)),
+                ('mimetype', models.CharField(max_length=120, editable=False)),
+                ('size', models.PositiveIntegerField(default=0, editable=False)),
+                ('rows', models.PositiveIntegerField(default=0, editable=False)),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created', editable=False, db_index=True)),
+                ('report', models.ForeignKey(related_name='snapshots', to='djangobmf.Report', on_delete=django.db.models.deletion.CASCADE)),
+            ],
+            options={
+                'verbose_name': 'Report snapshot',
+                'verbose_name_plural': 'Report snapshots',
+                'get_latest_by': 'created',
+                'default_permissions': (),
+                'abstract': False,
+            },
+        ),
+    ]
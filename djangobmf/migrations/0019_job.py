@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf', '0018_reportsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=255, verbose_name='Task', editable=False)),
+                ('arguments', models.TextField(verbose_name='Arguments', editable=False)),
+                ('key', models.CharField(null=True, editable=False, max_length=255, blank=True, unique=True, verbose_name='Key')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts', editable=False)),
+                ('max_attempts', models.PositiveSmallIntegerField(default=1, verbose_name='Max. attempts', editable=False)),
+                ('available', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Available', editable=False, db_index=True)),
+                ('failed', models.BooleanField(default=False, verbose_name='Failed', editable=False)),
+                ('error', models.TextField(null=True, verbose_name='Error', editable=False, blank=True)),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+            ],
+            options={
+                'ordering': ('available', 'pk'),
+                'default_permissions': (),
+                'verbose_name': 'Job',
+                'verbose_name_plural': 'Jobs',
+                'abstract': False,
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='job',
+            index_together=set([('failed', 'available')]),
+        ),
+    ]
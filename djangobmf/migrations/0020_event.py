@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.conf import settings
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('djangobmf', '0019_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.PositiveSmallIntegerField(verbose_name='Action', editable=False, choices=[(1, 'Comment'), (2, 'Created'), (3, 'Updated'), (4, 'Workflow'), (5, 'File')])),
+                ('text', models.TextField(null=True, verbose_name='Text', editable=False, blank=True)),
+                ('parent_id', models.PositiveIntegerField(editable=False)),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created', editable=False)),
+                ('processed', models.DateTimeField(null=True, verbose_name='Processed', editable=False, blank=True, db_index=True)),
+                ('parent_ct', models.ForeignKey(related_name='+', editable=False, to='contenttypes.ContentType', on_delete=django.db.models.deletion.CASCADE)),
+                ('user', models.ForeignKey(related_name='+', blank=True, editable=False, to=settings.AUTH_USER_MODEL, null=True, on_delete=django.db.models.deletion.SET_NULL)),
+            ],
+            options={
+                'ordering': ('pk',),
+                'default_permissions': (),
+                'verbose_name': 'Event',
+                'verbose_name_plural': 'Events',
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('djangobmf', '0020_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField(editable=False)),
+                ('deleted', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Deleted', editable=False)),
+                ('object_ct', models.ForeignKey(related_name='+', editable=False, to='contenttypes.ContentType', on_delete=django.db.models.deletion.CASCADE)),
+            ],
+            options={
+                'verbose_name': 'Tombstone',
+                'verbose_name_plural': 'Tombstones',
+                'default_permissions': (),
+                'abstract': False,
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='tombstone',
+            index_together=set([('object_ct', 'deleted')]),
+        ),
+    ]
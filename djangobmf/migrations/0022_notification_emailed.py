@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf', '0021_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='emailed',
+            field=models.DateTimeField(null=True, verbose_name='Emailed', editable=False),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+from djangobmf.utils.markup import markdown_hash
+from djangobmf.utils.markup import render_markdown
+
+
+def render_comments(apps, schema_editor):
+    Activity = apps.get_model('djangobmf', 'Activity')
+    queryset = Activity.objects.using(schema_editor.connection.alias).filter(action=1)
+    for pk, text in queryset.values_list('pk', 'text').iterator():
+        queryset.filter(pk=pk).update(html=render_markdown(text), html_hash=markdown_hash(text))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf', '0022_notification_emailed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='html',
+            field=models.TextField(null=True, verbose_name='HTML', editable=False),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='html_hash',
+            field=models.CharField(max_length=40, null=True, verbose_name='HTML hash', editable=False),
+        ),
+        migrations.RunPython(render_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('djangobmf', '0023_activity_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='title',
+            field=models.CharField(max_length=255, null=True, verbose_name='Title', editable=False),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='url',
+            field=models.CharField(max_length=255, null=True, verbose_name='URL', editable=False),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='last_action',
+            field=models.PositiveSmallIntegerField(null=True, verbose_name='Last action', editable=False, choices=[(1, 'Comment'), (2, 'Created'), (3, 'Updated'), (4, 'Workflow'), (5, 'File')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='notification',
+            index_together=set([('user', 'watch_ct', 'modified')]),
+        ),
+    ]
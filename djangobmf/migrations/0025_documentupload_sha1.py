@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf', '0024_notification_inbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentupload',
+            name='sha1',
+            field=models.CharField(max_length=40, null=True, editable=False),
+        ),
+    ]
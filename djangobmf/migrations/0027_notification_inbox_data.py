@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.apps import apps as global_apps
+from django.core.urlresolvers import NoReverseMatch
+from django.core.urlresolvers import reverse
+from django.db import migrations
+
+
+def get_url(ct, pk):
+    try:
+        return reverse('djangobmf:api-notification', kwargs={'app': ct.app_label, 'model': ct.model, 'pk': pk})
+    except NoReverseMatch:
+        # the url is set when the notification is saved
+        return None
+
+
+def update_notifications(apps, schema_editor):
+    Notification = apps.get_model('djangobmf', 'Notification')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    alias = schema_editor.connection.alias
+
+    queryset = Notification.objects.using(alias).filter(title__isnull=True)
+    for ct in ContentType.objects.using(alias).filter(pk__in=queryset.values('watch_ct')):
+        # the title is the string representation of the watched object
+        try:
+            model = global_apps.get_model(ct.app_label, ct.model)
+        except LookupError:
+            model = None
+
+        notifications = list(queryset.filter(watch_ct=ct).values_list('pk', 'watch_id'))
+        for i in range(0, len(notifications), 500):
+            chunk = notifications[i:i + 500]
+            objects = {}
+            if model is not None:
+                objects = model._default_manager.using(alias).in_bulk(set(pk for _, pk in chunk))
+            for pk, watch_id in chunk:
+                obj = objects.get(watch_id)
+                Notification.objects.using(alias).filter(pk=pk).update(
+                    title=('%s' % obj)[:255] if obj is not None else None,
+                    url=get_url(ct, watch_id),
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('djangobmf', '0026_tombstone_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(update_notifications, migrations.RunPython.noop),
+    ]
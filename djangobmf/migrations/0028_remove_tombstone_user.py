@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangobmf', '0027_notification_inbox_data'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='tombstone',
+            name='user',
+        ),
+    ]
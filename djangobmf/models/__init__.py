@@ -3,16 +3,19 @@
 
 from __future__ import unicode_literals
 
-from django.contrib.contenttypes.models import ContentType
+from django.apps import apps
 from django.db.models import signals
 from django.dispatch import receiver
 
 from djangobmf.conf import settings
+from djangobmf.core.outbox import record_event
+from djangobmf.core.tasks import is_async
 from djangobmf.signals import activity_create
 from djangobmf.signals import activity_update
 from djangobmf.signals import activity_addfile
 from djangobmf.signals import activity_workflow
 from djangobmf.tasks import djangobmf_user_watch
+from djangobmf.tasks import prerender_reports
 from djangobmf.utils.serializers import DjangoBMFEncoder
 
 import json
@@ -29,10 +32,17 @@ from .activity import ACTION_FILE
 from .activity import Activity as AbstractActivity
 from .configuration import Configuration as AbstractConfiguration
 from .document import Document as AbstractDocument
+from .event import Event as AbstractEvent
+from .job import Job as AbstractJob
 from .notification import Notification as AbstractNotification
 from .numberrange import NumberRange as AbstractNumberRange
+from .renderer import CSVRenderer as AbstractCSVRenderer
 from .renderer import PDFRenderer as AbstractPDFRenderer
 from .report import Report as AbstractReport
+from .report import ReportSnapshot as AbstractReportSnapshot
+from .searchindex import SearchIndex as AbstractSearchIndex
+from .tombstone import Tombstone as AbstractTombstone
+from .upload import DocumentUpload as AbstractDocumentUpload
 
 
 __all__ = (
@@ -45,11 +55,18 @@ __all__ = (
     'ACTION_FILE',
     'Activity',
     'Document',
+    'DocumentUpload',
+    'Event',
+    'Job',
     'Configuration',
+    'CSVRenderer',
     'Notification',
     'NumberCycle',
     'Renderer',
     'Report',
+    'ReportSnapshot',
+    'SearchIndex',
+    'Tombstone',
 )
 
 
@@ -77,6 +94,24 @@ class Document(AbstractDocument):
         app_label = settings.APP_LABEL
 
 
+class DocumentUpload(AbstractDocumentUpload):
+    class Meta(AbstractDocumentUpload.Meta):
+        abstract = False
+        app_label = settings.APP_LABEL
+
+
+class Event(AbstractEvent):
+    class Meta(AbstractEvent.Meta):
+        abstract = False
+        app_label = settings.APP_LABEL
+
+
+class Job(AbstractJob):
+    class Meta(AbstractJob.Meta):
+        abstract = False
+        app_label = settings.APP_LABEL
+
+
 class Notification(AbstractNotification):
     class Meta(AbstractNotification.Meta):
         abstract = False
@@ -89,6 +124,12 @@ class NumberRange(AbstractNumberRange):
         app_label = settings.APP_LABEL
 
 
+class CSVRenderer(AbstractCSVRenderer):
+    class Meta(AbstractCSVRenderer.Meta):
+        abstract = False
+        app_label = settings.APP_LABEL
+
+
 class PDFRenderer(AbstractPDFRenderer):
     class Meta(AbstractPDFRenderer.Meta):
         abstract = False
@@ -101,16 +142,28 @@ class Report(AbstractReport):
         app_label = settings.APP_LABEL
 
 
+class ReportSnapshot(AbstractReportSnapshot):
+    class Meta(AbstractReportSnapshot.Meta):
+        abstract = False
+        app_label = settings.APP_LABEL
+
+
+class SearchIndex(AbstractSearchIndex):
+    class Meta(AbstractSearchIndex.Meta):
+        abstract = False
+        app_label = settings.APP_LABEL
+
+
+class Tombstone(AbstractTombstone):
+    class Meta(AbstractTombstone.Meta):
+        abstract = False
+        app_label = settings.APP_LABEL
+
+
 @receiver(activity_create)
 def object_created(sender, instance, **kwargs):
     if instance._bmfmeta.has_logging:
-        history = Activity(
-            user=instance.created_by,
-            parent_ct=ContentType.objects.get_for_model(sender),
-            parent_id=instance.pk,
-            action=ACTION_CREATED,
-        )
-        history.save()
+        record_event(sender, instance, ACTION_CREATED, user=instance.created_by)
 
 
 @receiver(activity_update)
@@ -126,49 +179,53 @@ def object_changed(sender, instance, **kwargs):
                 pass
 
         if len(changes) > 0:
-            history = Activity(
+            record_event(
+                sender, instance, ACTION_UPDATED,
                 user=instance.modified_by,
-                parent_ct=ContentType.objects.get_for_model(sender),
-                parent_id=instance.pk,
-                action=ACTION_UPDATED,
                 text=json.dumps(changes, cls=DjangoBMFEncoder),
             )
-            history.save()
 
 
 @receiver(activity_workflow)
 def new_state(sender, instance, **kwargs):
     if instance._bmfmeta.has_logging:
-        history = Activity(
+        record_event(
+            sender, instance, ACTION_WORKFLOW,
             user=instance.modified_by,
-            parent_ct=ContentType.objects.get_for_model(sender),
-            parent_id=instance.pk,
-            action=ACTION_WORKFLOW,
             text=json.dumps({
                 'old': instance._bmfmeta.workflow.initial,
                 'new': instance._bmfmeta.workflow.key,
             }, cls=DjangoBMFEncoder),
         )
-        history.save()
+
+
+@receiver(activity_workflow)
+def prerender_state_reports(sender, instance, final, **kwargs):
+    # without a task queue, the report is rendered on its first request
+    if not is_async():
+        return
+
+    config = apps.get_app_config(settings.APP_LABEL)
+    if config.has_module(sender) and config.get_module(sender).has_prerender_reports(final):
+        prerender_reports(sender._meta.app_label, sender._meta.model_name, instance.pk, final)
 
 
 @receiver(activity_addfile)
 def new_file(sender, instance, file, **kwargs):
     if instance._bmfmeta.has_logging:
-        history = Activity(
+        record_event(
+            sender, instance, ACTION_FILE,
             user=instance.modified_by,
-            parent_ct=ContentType.objects.get_for_model(sender),
-            parent_id=instance.pk,
-            action=ACTION_FILE,
             text=json.dumps({
                 'pk': file.pk,
                 'size': file.size,
                 'name': '%s' % file,
             }, cls=DjangoBMFEncoder),
         )
-        history.save()
 
 
-def activity_post_save(sender, instance, *args, **kwargs):
-    djangobmf_user_watch(instance.pk)
+def activity_post_save(sender, instance, created=False, raw=False, *args, **kwargs):
+    # the users are notified of the other actions while processing their events
+    if created and not raw and instance.action == ACTION_COMMENT:
+        djangobmf_user_watch(instance.pk)
 signals.post_save.connect(activity_post_save, sender=Activity)
@@ -10,6 +10,9 @@ from django.db import models
 # from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
+from djangobmf.utils.markup import markdown_hash
+from djangobmf.utils.markup import render_markdown
+
 # from djangobmf.conf import settings as bmfsettings
 
 # import json
@@ -70,6 +73,9 @@ class Activity(models.Model):
     )
     parent_object = GenericForeignKey('parent_ct', 'parent_id')
 
+    html = models.TextField(_("HTML"), editable=False, null=True)
+    html_hash = models.CharField(_("HTML hash"), max_length=40, editable=False, null=True)
+
     modified = models.DateTimeField(_("Modified"), auto_now=True, editable=False,)
 
     objects = ActivityManager()
@@ -80,3 +86,26 @@ class Activity(models.Model):
         verbose_name_plural = _('Activity')
         get_latest_by = "modified"
         abstract = True
+
+    def render(self):
+        """
+        renders the markdown of a comment, if the text changed
+        """
+        if self.action != ACTION_COMMENT:
+            return
+        text_hash = markdown_hash(self.text)
+        if self.html is None or self.html_hash != text_hash:
+            self.html = render_markdown(self.text)
+            self.html_hash = text_hash
+
+    def get_html(self):
+        """
+        returns the html of a comment
+        """
+        if self.html is None or self.html_hash != markdown_hash(self.text):
+            return render_markdown(self.text)
+        return self.html
+
+    def save(self, *args, **kwargs):
+        self.render()
+        super(Activity, self).save(*args, **kwargs)
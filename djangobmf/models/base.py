@@ -26,6 +26,16 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def get_title_values(instance):
+    """
+    returns the loaded field values of an instance, which can change its title
+    """
+    return tuple(
+        instance.__dict__.get(field.attname) for field in instance._meta.concrete_fields
+        if field.name not in ['created', 'modified', 'created_by', 'modified_by']
+    )
+
+
 def add_signals(cls):
     # TODO add model from app config
     from djangobmf.models import Activity
@@ -33,6 +43,12 @@ def add_signals(cls):
     # TODO add model from app config
     from djangobmf.models import Notification
 
+    # TODO add model from app config
+    from djangobmf.models import Event
+
+    # TODO add model from app config
+    from djangobmf.models import Tombstone
+
     # cleanup history and follows
     def post_delete(sender, instance, *args, **kwargs):
         Activity.objects.filter(
@@ -43,6 +59,55 @@ def add_signals(cls):
             watch_ct=ContentType.objects.get_for_model(sender),
             watch_id=instance.pk,
         ).delete()
+        Event.objects.filter(
+            parent_ct=ContentType.objects.get_for_model(sender),
+            parent_id=instance.pk,
+            processed__isnull=True,
+        ).delete()
+
+        # the object is reported as deleted by the change feed
+        Tombstone.objects.create(
+            object_ct=ContentType.objects.get_for_model(sender),
+            object_id=instance.pk,
+        )
+    signals.post_delete.connect(post_delete, sender=cls, weak=False)
+
+    # the notifications show the current title of the object, which is
+    # only updated if the fields of the object were changed
+    def post_init(sender, instance, *args, **kwargs):
+        if instance.pk:
+            instance._bmftitle_values = get_title_values(instance)
+    signals.post_init.connect(post_init, sender=cls, weak=False)
+
+    def post_save(sender, instance, created, raw=False, *args, **kwargs):
+        values = get_title_values(instance)
+        changed = getattr(instance, '_bmftitle_values', None) != values
+        instance._bmftitle_values = values
+        if created or raw or not changed:
+            return
+
+        title = ('%s' % instance)[:255]
+        Notification.objects.filter(
+            watch_ct=ContentType.objects.get_for_model(sender),
+            watch_id=instance.pk,
+        ).exclude(title=title).update(title=title)
+    signals.post_save.connect(post_save, sender=cls, weak=False)
+
+
+def add_search_signals(cls):
+    from djangobmf.core.search import get_backend
+
+    # maintain the search index
+    def post_save(sender, instance, *args, **kwargs):
+        backend = get_backend()
+        if backend is not None:
+            backend.update(instance)
+    signals.post_save.connect(post_save, sender=cls, weak=False)
+
+    def post_delete(sender, instance, *args, **kwargs):
+        backend = get_backend()
+        if backend is not None:
+            backend.delete(sender, instance.pk)
     signals.post_delete.connect(post_delete, sender=cls, weak=False)
 
 
@@ -78,6 +143,7 @@ class BMFOptions(object):
 
         self.clean = False
         self.observed_fields = []
+        self.report_related = []
         self.search_fields = []
 
         # add an workflow object to the class
@@ -172,6 +238,7 @@ class BMFOptions(object):
                 'has_logging',
                 'has_comments',
                 'has_files',
+                'report_related',
                 'search_fields',
                 'clean',
                 'can_clone',
@@ -275,6 +342,7 @@ class BMFModelBase(ModelBase):
                 editable=False,
                 null=True,
                 blank=False,
+                db_index=True,
             )
             field.contribute_to_class(cls, 'modified')
 
@@ -380,6 +448,10 @@ class BMFModelBase(ModelBase):
         # add history signals for this model
         add_signals(cls)
 
+        # add search index signals for this model
+        if cls._bmfmeta.search_fields:
+            add_search_signals(cls)
+
         if cls._bmfmeta.has_workflow:
 
             def post_init_workflow(sender, instance, *args, **kwargs):
@@ -11,10 +11,15 @@ from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
 from djangobmf.conf import settings as bmfsettings
+from djangobmf.core.tasks import is_async
+from djangobmf.storage import HashedFile
 from djangobmf.storage import default_storage
+from djangobmf.tasks import generate_previews
 from djangobmf.tasks import generate_sha1
 from djangobmf.utils.generate_filename import generate_filename
 
+import mimetypes
+
 
 @python_2_unicode_compatible
 class Document(models.Model):
@@ -85,8 +90,32 @@ class Document(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
+
+        new_file = self.file and not self.file._committed
+        if new_file:
+            # the file is hashed, while it is written to the storage
+            content = self.file.file
+            if not isinstance(content, HashedFile):
+                content = HashedFile(content)
+            self.file.save(self.file.name, content, save=False)
+
+            if content.hashed_size or not content.size:
+                self.sha1 = content.sha1
+                self.size = content.hashed_size
+                self.mimetype, self.encoding = mimetypes.guess_type(self.file.name)
+                self.file_exists = True
+            else:
+                # the storage did not read the content chunk by chunk
+                self.sha1 = None
+
         super(Document, self).save(*args, **kwargs)
-        generate_sha1(self.pk)
+
+        if not self.sha1:
+            generate_sha1(self.pk)
+
+        # without a task queue, previews are created on their first request
+        elif new_file and is_async():
+            generate_previews(self.pk)
 
     def clean(self):
 
@@ -0,0 +1,45 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
+from django.utils.translation import ugettext_lazy as _
+
+from .activity import ACTION_TYPES
+
+
+@python_2_unicode_compatible
+class Event(models.Model):
+    """
+    Outbox of the activity signals. Events are written in the transaction
+    of the changed object and processed in order by the drainer, which
+    creates the activities and notifications and calls the consumers
+    """
+    user = models.ForeignKey(
+        getattr(settings, 'AUTH_USER_MODEL', 'auth.User'),
+        blank=True, null=True, editable=False,
+        related_name="+", on_delete=models.SET_NULL,
+    )
+    action = models.PositiveSmallIntegerField(_("Action"), editable=False, choices=ACTION_TYPES)
+    text = models.TextField(_("Text"), blank=True, null=True, editable=False)
+    parent_id = models.PositiveIntegerField(editable=False)
+    parent_ct = models.ForeignKey(
+        ContentType, related_name="+", editable=False, on_delete=models.CASCADE,
+    )
+    created = models.DateTimeField(_("Created"), default=timezone.now, editable=False)
+    processed = models.DateTimeField(_("Processed"), null=True, blank=True, editable=False, db_index=True)
+
+    class Meta:
+        verbose_name = _('Event')
+        verbose_name_plural = _('Events')
+        ordering = ('pk',)
+        default_permissions = ()
+        abstract = True
+
+    def __str__(self):
+        return '%s (%s)' % (self.get_action_display(), self.pk)
@@ -0,0 +1,38 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.db import models
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
+from django.utils.translation import ugettext_lazy as _
+
+
+@python_2_unicode_compatible
+class Job(models.Model):
+    """
+    A task in the database queue. Pending jobs with the same ``key`` are
+    coalesced. A claimed job is hidden from other workers until it is
+    ``available`` again (the visibility timeout), finished jobs are deleted
+    """
+    task = models.CharField(_('Task'), max_length=255, editable=False)
+    arguments = models.TextField(_('Arguments'), editable=False)
+    key = models.CharField(_('Key'), max_length=255, null=True, blank=True, unique=True, editable=False)
+    attempts = models.PositiveSmallIntegerField(_('Attempts'), default=0, editable=False)
+    max_attempts = models.PositiveSmallIntegerField(_('Max. attempts'), default=1, editable=False)
+    available = models.DateTimeField(_('Available'), default=timezone.now, db_index=True, editable=False)
+    failed = models.BooleanField(_('Failed'), default=False, editable=False)
+    error = models.TextField(_('Error'), null=True, blank=True, editable=False)
+    created = models.DateTimeField(_('Created'), auto_now_add=True, editable=False)
+
+    class Meta:
+        verbose_name = _('Job')
+        verbose_name_plural = _('Jobs')
+        ordering = ('available', 'pk')
+        index_together = [['failed', 'available']]
+        default_permissions = ()
+        abstract = True
+
+    def __str__(self):
+        return '%s (%s)' % (self.task, self.pk)
@@ -6,12 +6,15 @@ from __future__ import unicode_literals
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
+from django.core.urlresolvers import reverse
 from django.db import models
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.timezone import now
 
 from django.utils.translation import ugettext_lazy as _
 
+from .activity import ACTION_TYPES
+
 
 @python_2_unicode_compatible
 class Notification(models.Model):
@@ -37,10 +40,17 @@ class Notification(models.Model):
     detectchanges = models.BooleanField(_("Object changed"), default=False, db_index=True)
     workflow = models.BooleanField(_("Workflowstate changed"), default=False, db_index=True)
 
+    # denormalized data of the watched object for the inbox
+    title = models.CharField(_("Title"), max_length=255, editable=False, null=True)
+    url = models.CharField(_("URL"), max_length=255, editable=False, null=True)
+    last_action = models.PositiveSmallIntegerField(_("Last action"), editable=False, null=True, choices=ACTION_TYPES)
+
     modified = models.DateTimeField(_("Modified"), editable=False, null=True, default=now)
+    emailed = models.DateTimeField(_("Emailed"), editable=False, null=True)
 
     class Meta:
         unique_together = (('user', 'watch_ct', 'watch_id'),)
+        index_together = (('user', 'watch_ct', 'modified'), ('watch_ct', 'watch_id'))
         ordering = ('-modified',)
         verbose_name = _('Watched activity')
         verbose_name_plural = _('Watched activities')
@@ -48,6 +58,25 @@ class Notification(models.Model):
         default_permissions = ()
         abstract = True
 
+    def save(self, *args, **kwargs):
+        if self.watch_id and self.watch_ct_id:
+            self.update_watch_data()
+        super(Notification, self).save(*args, **kwargs)
+
+    def update_watch_data(self):
+        """
+        sets the title and api url of the watched object, if they are missing
+        """
+        if self.url is None:
+            ct = ContentType.objects.get_for_id(self.watch_ct_id)
+            self.url = reverse('djangobmf:api-notification', kwargs={
+                'app': ct.app_label,
+                'model': ct.model,
+                'pk': self.watch_id,
+            })
+        if self.title is None and self.watch_object is not None:
+            self.title = ('%s' % self.watch_object)[:255]
+
     def is_active(self):
         return self.comments or self.files or self.detectchanges or self.workflow
 
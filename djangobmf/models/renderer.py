@@ -3,11 +3,13 @@
 
 from __future__ import unicode_literals
 
+from django.core.cache import caches
 from django.db import models
 from django.template.loader import select_template
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
+from djangobmf.conf import settings
 from djangobmf.fields import FileField
 
 import codecs
@@ -21,6 +23,9 @@ except ImportError:
     XHTML2PDF = False
 
 
+OPTIONS_CACHE_KEY = 'bmfrenderer.options.%s'
+
+
 class BaseRenderer(models.Model):
     """
     """
@@ -41,6 +46,13 @@ class BaseRenderer(models.Model):
             return [context['template_name']]
         return []
 
+    def get_version(self):
+        """
+        returns a version string, which changes with the output of the
+        renderer, or ``None`` if rendered reports should not be stored
+        """
+        return None
+
     def get_template(self, context=None):
         return select_template(self.get_template_names(context=context) + ['djangobmf/report_missing.html'])
 
@@ -127,7 +139,71 @@ class PDFRenderer(BaseRenderer):
             return '%s (%s)' % (self.name, '-'.join(data))
         return '%s' % self.name
 
+    def get_options_version(self):
+        """
+        returns the version of the compiled options, which changes with the
+        renderer and the content of its backgrounds
+        """
+        from djangobmf.models import Document
+
+        sha1 = dict(Document.objects.filter(
+            pk__in=[pk for pk in (self.letter_background_id, self.page_background_id) if pk],
+        ).values_list('pk', 'sha1'))
+
+        return (
+            self.modified.isoformat() if self.modified else None,
+            sha1.get(self.letter_background_id),
+            sha1.get(self.page_background_id),
+        )
+
+    def get_version(self):
+        if not self.pk:
+            return None
+        return '%s.%s.%s.%s' % ((self.pk,) + self.get_options_version())
+
     def get_options(self):
+        """
+        returns the compiled options. They are cached per renderer in the
+        bmf default cache connection, so the backgrounds are read and encoded
+        once and not with every report
+        """
+        if not self.pk:
+            return self.compile_options()
+
+        version = self.get_options_version()
+        if getattr(self, '_options', None) and self._options[0] == version:
+            return dict(self._options[1])
+
+        cache = caches[settings.CACHE_DEFAULT_CONNECTION]
+        key = OPTIONS_CACHE_KEY % self.pk
+        cached = cache.get(key)
+
+        if cached is None or cached[0] != version:
+            cached = (version, self.compile_options())
+            cache.set(key, cached)
+
+        self._options = cached
+        return dict(cached[1])
+
+    def remove_cached_options(self):
+        """
+        removes the compiled options from the cache
+        """
+        self._options = None
+        caches[settings.CACHE_DEFAULT_CONNECTION].delete(OPTIONS_CACHE_KEY % self.pk)
+
+    def save(self, *args, **kwargs):
+        super(PDFRenderer, self).save(*args, **kwargs)
+        self.remove_cached_options()
+
+    def delete(self, *args, **kwargs):
+        self.remove_cached_options()
+        super(PDFRenderer, self).delete(*args, **kwargs)
+
+    def compile_options(self):
+        """
+        builds the options and encodes the backgrounds
+        """
         options = {
             'size': self.size,
             'form': self.form,
@@ -171,17 +247,23 @@ class PDFRenderer(BaseRenderer):
 
         if self.letter and self.letter_background and self.letter_background.file_exists:
             self.letter_background.file.open()
-            options['letter_background'] = codecs.encode(
-                self.letter_background.file.read(),
-                'base64'
-            ).decode().replace('\n', '')
+            try:
+                options['letter_background'] = codecs.encode(
+                    self.letter_background.file.read(),
+                    'base64'
+                ).decode().replace('\n', '')
+            finally:
+                self.letter_background.file.close()
 
         if self.page_background and self.page_background.file_exists:
             self.page_background.file.open()
-            options['page_background'] = codecs.encode(
-                self.page_background.file.read(),
-                'base64'
-            ).decode().replace('\n', '')
+            try:
+                options['page_background'] = codecs.encode(
+                    self.page_background.file.read(),
+                    'base64'
+                ).decode().replace('\n', '')
+            finally:
+                self.page_background.file.close()
 
         return options
 
@@ -199,8 +281,51 @@ class PDFRenderer(BaseRenderer):
             return 'html', 'text/html', html, False
 
 
+@python_2_unicode_compatible
 class CSVRenderer(BaseRenderer):
+    """
+    renders the objects of a queryset (or the object of a report) as csv.
+    The columns are the fields of the module's serializer and the rows are
+    streamed, loading ``chunk_size`` objects with one query
+    """
+    name = models.CharField(
+        verbose_name=_("Name"), max_length=20, blank=False, null=False,
+    )
+    delimiter = models.CharField(
+        verbose_name=_("Delimiter"), max_length=1, blank=False, null=False, default=",",
+    )
+    header = models.BooleanField(
+        verbose_name=_("Header"), default=True,
+    )
+
+    modified = models.DateTimeField(_("Modified"), auto_now=True, editable=False,)
+
+    # number of objects loaded with one query
+    chunk_size = 2000
+
     class Meta:
         verbose_name = _('CSV Renderer')
         verbose_name_plural = _('CSV Renderer')
+        get_latest_by = "modified"
         abstract = True
+
+    def __str__(self):
+        return '%s' % self.name
+
+    def get_queryset(self, context):
+        if context.get('queryset', None) is not None:
+            return context['queryset']
+        obj = context['object']
+        return obj.__class__._default_manager.filter(pk=obj.pk)
+
+    def get_serializer(self, queryset, context):
+        serializer_class = context.get('serializer_class', None) or queryset.model._bmfmeta.serializer_class
+        return serializer_class(context={'request': context.get('request', None)})
+
+    def render(self, **context):
+        from djangobmf.core.export import get_rows
+        from djangobmf.core.export import stream_csv
+
+        queryset = self.get_queryset(context)
+        rows = get_rows(self.get_serializer(queryset, context), queryset, self.chunk_size)
+        return 'csv', 'text/csv; charset=utf-8', stream_csv(rows, self.delimiter, self.header), True
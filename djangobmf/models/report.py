@@ -3,16 +3,35 @@
 
 from __future__ import unicode_literals
 
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
+
+from djangobmf.conf import settings
+from djangobmf.storage import default_storage
+from djangobmf.utils.cron import CronSchedule
 # from django.http import HttpResponse
 
 # from djangobmf.core.report import Report as BaseReport
 # from djangobmf.models.renderer import Renderer
 
 
+def make_aware(value, tz):
+    """
+    makes a local time aware. Times, which are skipped or repeated by a
+    DST transition, are resolved to the later time instead of raising an
+    error
+    """
+    if hasattr(tz, 'localize'):
+        # pytz moves skipped times forward with normalize
+        return tz.normalize(tz.localize(value, is_dst=False))
+    return timezone.make_aware(value, tz)
+
+
 class Report(models.Model):
     """
     Model to store informations to generate a report
@@ -38,6 +57,12 @@ class Report(models.Model):
 
     enabled = models.BooleanField(default=False)
 
+    schedule = models.CharField(
+        _('Schedule'), max_length=100, null=True, blank=True,
+        help_text=_('Creates snapshots of the report (cron format: minute hour day month weekday)'),
+    )
+    next_snapshot = models.DateTimeField(_("Next snapshot"), null=True, blank=True, editable=False)
+
     modified = models.DateTimeField(_("Modified"), auto_now=True, null=True, editable=False)
     created = models.DateTimeField(_("Created"), auto_now_add=True, null=True, editable=False)
 
@@ -50,3 +75,62 @@ class Report(models.Model):
 
     def __str__(self):
         return '%s' % self.slug
+
+    def clean(self):
+        if self.schedule:
+            try:
+                CronSchedule(self.schedule)
+            except ValueError as e:
+                raise ValidationError({'schedule': str(e)})
+
+    def save(self, *args, **kwargs):
+        self.next_snapshot = self.get_next_snapshot()
+        super(Report, self).save(*args, **kwargs)
+
+    def get_next_snapshot(self, after=None):
+        """
+        returns the time of the next scheduled snapshot after ``after``
+        (default: now) or ``None``
+        """
+        if not self.schedule:
+            return None
+
+        after = after or timezone.now()
+        if timezone.is_aware(after):
+            tz = timezone.get_current_timezone()
+            local = timezone.localtime(after, tz).replace(tzinfo=None)
+            return make_aware(CronSchedule(self.schedule).next(local), tz)
+        return CronSchedule(self.schedule).next(after)
+
+
+@python_2_unicode_compatible
+class ReportSnapshot(models.Model):
+    """
+    A stored rendering of a report and its dataset (the serialized objects
+    as ndjson), created on the report's schedule
+    """
+    report = models.ForeignKey(
+        '.'.join([settings.APP_LABEL, 'Report']),
+        related_name="snapshots", on_delete=models.CASCADE,
+    )
+    name = models.CharField(max_length=255, editable=False)
+    dataset = models.CharField(max_length=255, editable=False)
+    mimetype = models.CharField(max_length=120, editable=False)
+    size = models.PositiveIntegerField(default=0, editable=False)
+    rows = models.PositiveIntegerField(default=0, editable=False)
+    created = models.DateTimeField(_("Created"), default=timezone.now, editable=False, db_index=True)
+
+    class Meta:
+        verbose_name = _('Report snapshot')
+        verbose_name_plural = _('Report snapshots')
+        get_latest_by = "created"
+        default_permissions = ()
+        abstract = True
+
+    def __str__(self):
+        return '%s (%s)' % (self.report, self.created)
+
+    def delete(self, *args, **kwargs):
+        default_storage.delete(self.name)
+        default_storage.delete(self.dataset)
+        super(ReportSnapshot, self).delete(*args, **kwargs)
@@ -0,0 +1,37 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils.encoding import python_2_unicode_compatible
+# from django.utils.translation import ugettext_lazy as _
+
+
+@python_2_unicode_compatible
+class SearchIndex(models.Model):
+    """
+    holds the normalized text of an objects ``search_fields``. The table
+    is maintained by the search backend (see ``djangobmf.core.search``)
+    """
+    contenttype = models.ForeignKey(
+        ContentType,
+        related_name="+",
+        null=False,
+        blank=False,
+        editable=False,
+        on_delete=models.CASCADE,
+    )
+    object_id = models.PositiveIntegerField(null=False, blank=False, editable=False)
+    text = models.TextField(null=False, blank=True, editable=False)
+    label = models.CharField(max_length=255, null=False, blank=True, editable=False)
+    modified = models.DateTimeField(auto_now=True, editable=False)
+
+    class Meta:
+        abstract = True
+        default_permissions = ()
+        unique_together = (('contenttype', 'object_id')),
+
+    def __str__(self):
+        return 'SearchIndex %s:%s' % (self.contenttype_id, self.object_id)
@@ -0,0 +1,32 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
+from django.utils.translation import ugettext_lazy as _
+
+
+@python_2_unicode_compatible
+class Tombstone(models.Model):
+    """
+    Marks a deleted object for the change feed of its module
+    """
+    object_ct = models.ForeignKey(
+        ContentType, related_name="+", editable=False, on_delete=models.CASCADE,
+    )
+    object_id = models.PositiveIntegerField(editable=False)
+    deleted = models.DateTimeField(_("Deleted"), default=timezone.now, editable=False)
+
+    class Meta:
+        verbose_name = _('Tombstone')
+        verbose_name_plural = _('Tombstones')
+        index_together = [['object_ct', 'deleted']]
+        default_permissions = ()
+        abstract = True
+
+    def __str__(self):
+        return '%s.%s' % (self.object_ct_id, self.object_id)
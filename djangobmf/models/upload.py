@@ -0,0 +1,64 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils.encoding import python_2_unicode_compatible
+from django.utils.translation import ugettext_lazy as _
+
+import os
+import uuid
+
+
+def generate_token():
+    return uuid.uuid4().hex
+
+
+@python_2_unicode_compatible
+class DocumentUpload(models.Model):
+    """
+    A resumable upload of a document. The chunks are appended to a
+    temporary file in the document storage, until the upload is finished
+    """
+    token = models.CharField(max_length=32, unique=True, editable=False, default=generate_token)
+    user = models.ForeignKey(
+        getattr(settings, 'AUTH_USER_MODEL', 'auth.User'),
+        null=True, blank=True, editable=False,
+        related_name="+", on_delete=models.CASCADE,
+    )
+    name = models.CharField(_('Name'), max_length=120)
+    description = models.TextField(_('Description'), blank=True, null=True)
+    size = models.PositiveIntegerField(null=True, blank=True)
+    offset = models.PositiveIntegerField(default=0, editable=False)
+    # sha1 of the first ``offset`` bytes
+    sha1 = models.CharField(max_length=40, null=True, editable=False)
+
+    content_type = models.ForeignKey(
+        ContentType,
+        related_name="+",
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.CASCADE,
+    )
+    content_id = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
+    modified = models.DateTimeField(_("Modified"), auto_now=True, editable=False)
+    created = models.DateTimeField(_("Created"), auto_now_add=True, editable=False)
+
+    class Meta:
+        default_permissions = ()
+        abstract = True
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def temp_name(self):
+        """
+        name of the temporary file in the document storage
+        """
+        return os.path.join('.uploads', self.token)
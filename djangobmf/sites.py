@@ -28,6 +28,7 @@ __all__ = [
     'Category',
     'Dashboard',
     'Module',
+    'CSVReport',
     'PDFReport',
     'ViewMixin',
 ]
@@ -40,6 +41,10 @@ class PDFReport(ReportBaseView):
     renderer_class = apps.get_model(settings.APP_LABEL, "PDFRenderer")
 
 
+class CSVReport(ReportBaseView):
+    renderer_class = apps.get_model(settings.APP_LABEL, "CSVRenderer")
+
+
 # shortcut to the site instance to provide a simple
 # syntax to add the framework to external modules
 # please note, that this is only available, when the
@@ -3,12 +3,23 @@
 
 from __future__ import unicode_literals
 
+from django.core.files.base import File
 from django.core.files.storage import FileSystemStorage
+from django.core.files.move import file_move_safe
 from django.utils.functional import LazyObject
 from django.utils.module_loading import import_string
 
 from djangobmf.conf import settings
 
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import logging
+logger = logging.getLogger(__name__)
+
 
 class Storage(FileSystemStorage):
     def __init__(self):
@@ -31,6 +42,211 @@ class Storage(FileSystemStorage):
         return super(Storage, self).get_available_name(name)
 
 
+class HashedFile(File):
+    """
+    Wraps a file and calculates the sha1 and the size of its content,
+    while the storage reads the chunks to write them
+    """
+
+    def __init__(self, file, name=None):
+        if name is None:
+            name = getattr(file, 'name', None)
+        super(HashedFile, self).__init__(file, name)
+        self.hash = hashlib.sha1()
+        self.hashed_size = 0
+
+    def chunks(self, chunk_size=None):
+        self.hash = hashlib.sha1()
+        self.hashed_size = 0
+        for chunk in super(HashedFile, self).chunks(chunk_size):
+            self.hash.update(chunk)
+            self.hashed_size += len(chunk)
+            yield chunk
+
+    @property
+    def sha1(self):
+        return self.hash.hexdigest()
+
+
+class TemporaryHashedFile(HashedFile):
+    """
+    A temporary file in the filesystem with a known sha1 and size (i.e. of
+    a chunked upload). The storage moves the file instead of copying it.
+    """
+
+    def __init__(self, path, sha1, size, name=None):
+        super(TemporaryHashedFile, self).__init__(open(path, 'rb'), name)
+        self.path = path
+        self.hashed_size = size
+        self._sha1 = sha1
+
+    def temporary_file_path(self):
+        return self.path
+
+    def chunks(self, chunk_size=None):
+        # the content is hashed again, if a storage reads it
+        self._sha1 = None
+        return super(TemporaryHashedFile, self).chunks(chunk_size)
+
+    @property
+    def sha1(self):
+        return self._sha1 or self.hash.hexdigest()
+
+
+class ContentAddressedStorage(Storage):
+    """
+    Stores the content of every file only once in a blob directory,
+    named by its sha1. The files are hard links to these blobs, so
+    identical documents share their disk space and the link count of
+    a blob is the number of files referencing it. Blobs which are not
+    referenced anymore are removed by ``gc``.
+
+    If the filesystem does not support hard links, the blob is copied.
+    """
+    blob_prefix = '.blobs'
+
+    def get_blob_path(self, sha1):
+        return self.path(os.path.join(self.blob_prefix, sha1[:2], sha1[2:]))
+
+    def get_temp_dir(self):
+        return self.path(os.path.join(self.blob_prefix, 'tmp'))
+
+    def makedirs(self, directory):
+        try:
+            if self.directory_permissions_mode is not None:
+                old_umask = os.umask(0)
+                try:
+                    os.makedirs(directory, self.directory_permissions_mode)
+                finally:
+                    os.umask(old_umask)
+            else:
+                os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    def touch_blob(self, blob):
+        """
+        updates the modification time of an existing blob, so it is not
+        removed by ``gc`` before it is linked. returns ``False``, if the
+        blob does not exist
+        """
+        try:
+            os.utime(blob, None)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return False
+        return True
+
+    def save_blob(self, content):
+        """
+        writes the content to a temporary file and moves it to the blob
+        directory, if the blob does not exist. A ``TemporaryHashedFile`` is
+        moved directly. returns the blob's path
+        """
+        if isinstance(content, TemporaryHashedFile):
+            blob = self.get_blob_path(content.sha1)
+            if not self.touch_blob(blob):
+                self.makedirs(os.path.dirname(blob))
+                file_move_safe(content.temporary_file_path(), blob, allow_overwrite=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(blob, self.file_permissions_mode)
+            return blob
+
+        if not isinstance(content, HashedFile):
+            content = HashedFile(content)
+
+        self.makedirs(self.get_temp_dir())
+        fd, tmp = tempfile.mkstemp(dir=self.get_temp_dir())
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks():
+                    f.write(chunk)
+
+            blob = self.get_blob_path(content.sha1)
+            if self.touch_blob(blob):
+                os.remove(tmp)
+            else:
+                self.makedirs(os.path.dirname(blob))
+                file_move_safe(tmp, blob, allow_overwrite=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(blob, self.file_permissions_mode)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return blob
+
+    def _save(self, name, content):
+        blob = self.save_blob(content)
+        retried = False
+
+        while True:
+            full_path = self.path(name)
+            self.makedirs(os.path.dirname(full_path))
+            try:
+                os.link(blob, full_path)
+            except AttributeError:
+                # os.link is not available on this platform
+                shutil.copyfile(blob, full_path)
+            except OSError as e:
+                if e.errno == errno.EEXIST:
+                    name = self.get_available_name(name)
+                    continue
+                if e.errno == errno.ENOENT and not retried and not os.path.exists(blob):
+                    # the blob was removed by gc, before it was linked
+                    blob = self.save_blob(content)
+                    retried = True
+                    continue
+                if e.errno not in (errno.EPERM, errno.EXDEV, errno.EMLINK, errno.ENOTSUP):
+                    raise
+                logger.warning('Could not link %s, the file is copied', full_path)
+                shutil.copyfile(blob, full_path)
+            break
+
+        return name.replace('\\', '/')
+
+    def references(self, sha1):
+        """
+        returns the number of files, which use the blob with the sha1
+        """
+        try:
+            return os.stat(self.get_blob_path(sha1)).st_nlink - 1
+        except OSError:
+            return 0
+
+    def gc(self, max_age=86400, grace=3600):
+        """
+        removes all blobs, which are not referenced by a file, and
+        temporary files older than ``max_age`` seconds. Blobs written or
+        reused in the last ``grace`` seconds are kept, because they can
+        be linked by a running save. Returns the number of removed blobs
+        """
+        count = 0
+        root = self.path(self.blob_prefix)
+        if not os.path.isdir(root):
+            return count
+
+        for directory in os.listdir(root):
+            path = os.path.join(root, directory)
+
+            if path == self.get_temp_dir():
+                for filename in os.listdir(path):
+                    filepath = os.path.join(path, filename)
+                    if os.stat(filepath).st_mtime < time.time() - max_age:
+                        os.remove(filepath)
+                continue
+
+            for filename in os.listdir(path):
+                filepath = os.path.join(path, filename)
+                stat = os.stat(filepath)
+                if stat.st_nlink == 1 and stat.st_mtime < time.time() - grace:
+                    os.remove(filepath)
+                    count += 1
+        return count
+
+
 class DefaultStorage(LazyObject):
     def _setup(self):
         self._wrapped = import_string(settings.DOCUMENT_STORAGE)()
@@ -3,11 +3,25 @@
 
 from __future__ import unicode_literals
 
+from djangobmf.tasks.document import generate_previews
 from djangobmf.tasks.document import generate_sha1
+from djangobmf.tasks.document import scan_documents
+from djangobmf.tasks.event import drain_events
 from djangobmf.tasks.notification import djangobmf_user_watch
+from djangobmf.tasks.notification import send_notification_digests
+from djangobmf.tasks.report import create_report_snapshot
+from djangobmf.tasks.report import prerender_reports
+from djangobmf.tasks.report import render_report_batch
 
 
 __all__ = [
+    'create_report_snapshot',
     'djangobmf_user_watch',
+    'drain_events',
+    'generate_previews',
     'generate_sha1',
+    'prerender_reports',
+    'render_report_batch',
+    'scan_documents',
+    'send_notification_digests',
 ]
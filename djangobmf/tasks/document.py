@@ -3,58 +3,183 @@
 
 from __future__ import unicode_literals
 
-from django.utils import six
+from django.core.cache import caches
+from django.db.models import Case
+from django.db.models import F
+from django.db.models import Value
+from django.db.models import When
 
-from djangobmf.decorators import optional_celery
+from djangobmf.conf import settings
+from djangobmf.core.tasks import task
+
+from multiprocessing.pool import ThreadPool
 
 import hashlib
 import mimetypes
+import logging
+logger = logging.getLogger(__name__)
+
+
+SCAN_CACHE_KEY = 'bmfdocumentscan.last'
 
+FILE_INFO_FIELDS = ('sha1', 'file_exists', 'mimetype', 'encoding', 'size')
 
-if six.PY2:
-    class FileNotFoundError(OSError):
-        pass
 
+def get_file_info(obj, buffer_size=4 * 1024 * 1024):
+    """
+    reads the file of a document and returns the values of the
+    fields ``FILE_INFO_FIELDS`` as a dictionary
+    """
+    hash = hashlib.sha1()
+    size = 0
+
+    try:
+        f = obj.file.storage.open(obj.file.name, 'rb')
+    except (IOError, OSError):
+        return {
+            'sha1': None,
+            'file_exists': False,
+            'mimetype': None,
+            'encoding': None,
+            'size': None,
+        }
 
-@optional_celery
+    try:
+        while True:
+            data = f.read(buffer_size)
+            if not data:
+                break
+            hash.update(data)
+            size += len(data)
+    finally:
+        f.close()
+
+    mimetype, encoding = mimetypes.guess_type(obj.file.name)
+
+    return {
+        'sha1': hash.hexdigest(),
+        'file_exists': True,
+        'mimetype': mimetype,
+        'encoding': encoding,
+        'size': size,
+    }
+
+
+@task(key='document:sha1:{0}')
 def generate_sha1(pk):
     from djangobmf.models import Document
 
     obj = Document.objects.get(pk=pk)
+    info = get_file_info(obj)
 
-    hash = hashlib.sha1()
+    if any(getattr(obj, key) != value for key, value in info.items()):
+        Document.objects.filter(pk=pk).update(**info)
+
+
+@task(key='document:previews:{0}')
+def generate_previews(pk):
+    from djangobmf.core.preview import render_previews
+    from djangobmf.models import Document
 
     try:
-        obj.file.open('rb')
-
-        exists = True
-        size = obj.file.size
-        mimetype, encoding = mimetypes.guess_type(obj.file.name)
-
-        if obj.file.multiple_chunks():
-            for chunk in obj.file.chunks():
-                hash.update(chunk)
-        else:
-            hash.update(obj.file.read())
-
-        obj.file.close()
-
-        sha1 = hash.hexdigest()
-
-    except FileNotFoundError:
-        exists = False
-        size = None
-        mimetype = None
-        encoding = None
-        sha1 = None
-
-    if sha1 != obj.sha1 or exists != obj.file_exists or mimetype != obj.mimetype \
-            or encoding != obj.encoding or size != obj.size:
-
-        Document.objects.filter(pk=pk).update(
-            sha1=sha1,
-            file_exists=exists,
-            mimetype=mimetype,
-            encoding=encoding,
-            size=size,
-        )
+        obj = Document.objects.get(pk=pk)
+    except Document.DoesNotExist:
+        return
+    render_previews(obj)
+
+
+class DocumentScanner(object):
+    """
+    Verifies the files of all documents. The files are read by a pool of
+    threads (hashlib releases the GIL), and the changed values are written
+    back with one update per batch. The last scanned primary key is stored
+    in the cache, so an interrupted scan can be resumed.
+    """
+
+    def __init__(self, workers=4, batch_size=200, buffer_size=4 * 1024 * 1024, callback=None):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.callback = callback
+        self.cache = caches[settings.CACHE_DEFAULT_CONNECTION]
+
+    def get_queryset(self):
+        from djangobmf.models import Document
+        return Document.objects.order_by('pk').only('pk', 'file', *FILE_INFO_FIELDS)
+
+    def check(self, obj):
+        return get_file_info(obj, self.buffer_size)
+
+    def update(self, rows):
+        """
+        updates the changed rows ``(pk, info)`` with one query
+        """
+        if not rows:
+            return
+
+        model = self.get_queryset().model
+        values = {}
+        for field in FILE_INFO_FIELDS:
+            values[field] = Case(
+                *[When(pk=pk, then=Value(info[field])) for pk, info in rows],
+                default=F(field),
+                output_field=model._meta.get_field(field)
+            )
+        model.objects.filter(pk__in=[pk for pk, info in rows]).update(**values)
+
+    def scan(self, start=None, resume=False):
+        """
+        scans all documents with a primary key greater than start (or the
+        last scanned key, if resume is set). returns the number of scanned
+        and changed documents
+        """
+        if resume:
+            start = self.cache.get(SCAN_CACHE_KEY, start)
+
+        queryset = self.get_queryset()
+        if start:
+            queryset = queryset.filter(pk__gt=start)
+
+        total = queryset.count()
+        scanned = 0
+        changed = 0
+        last = start
+
+        pool = ThreadPool(self.workers)
+        try:
+            while True:
+                if last:
+                    batch = list(queryset.filter(pk__gt=last)[:self.batch_size])
+                else:
+                    batch = list(queryset[:self.batch_size])
+
+                if not batch:
+                    break
+
+                rows = []
+                for obj, info in zip(batch, pool.map(self.check, batch)):
+                    if any(getattr(obj, key) != value for key, value in info.items()):
+                        rows.append((obj.pk, info))
+                self.update(rows)
+
+                last = batch[-1].pk
+                self.cache.set(SCAN_CACHE_KEY, last, None)
+
+                scanned += len(batch)
+                changed += len(rows)
+                logger.debug('Scanned %s of %s documents (%s changed)', scanned, total, changed)
+                if self.callback:
+                    self.callback(scanned, total, changed)
+        finally:
+            pool.close()
+            pool.join()
+
+        # the scan is complete
+        self.cache.delete(SCAN_CACHE_KEY)
+        return scanned, changed
+
+
+@task(key='document:scan')
+def scan_documents(resume=True, workers=4):
+    scanned, changed = DocumentScanner(workers=workers).scan(resume=resume)
+    logger.info('Scanned %s documents, %s changed', scanned, changed)
@@ -0,0 +1,17 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from djangobmf.core.tasks import task
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@task(key='events:drain')
+def drain_events():
+    from djangobmf.core.outbox import drain
+
+    count = drain()
+    logger.debug('Processed %s events', count)
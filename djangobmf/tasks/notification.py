@@ -6,13 +6,13 @@ from __future__ import unicode_literals
 from django.utils.timezone import now
 
 from djangobmf.core.employee import Employee
-from djangobmf.decorators import optional_celery
+from djangobmf.core.tasks import task
 
 import logging
 logger = logging.getLogger(__name__)
 
 
-@optional_celery
+@task
 def djangobmf_user_watch(pk):
     from djangobmf.models import Activity
     from djangobmf.models import Notification
@@ -45,6 +45,7 @@ def djangobmf_user_watch(pk):
                 notification.new_entry = False
                 notification.watch_id = object.parent_id
                 notification.last_seen_object = object.pk
+                notification.last_action = object.action
                 notification.triggered = True
                 notification.save()
 
@@ -78,6 +79,8 @@ def djangobmf_user_watch(pk):
                     notification.triggered = True
                     notification.unread = True
                 notification.modified = now()
+                notification.last_action = object.action
+                notification.save()
                 logger.debug("Updated Notification for user %s (%s) and object %s (%s)" % (
                     notification.user,
                     notification.user.pk,
@@ -94,3 +97,11 @@ def djangobmf_user_watch(pk):
                     object.parent_ct,
                     object.parent_id,
                 ))
+
+
+@task(key='notification:digest')
+def send_notification_digests():
+    from djangobmf.core.digest import send_digests
+
+    count = send_digests()
+    logger.debug('Sent %s notification digests', count)
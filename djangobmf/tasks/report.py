@@ -0,0 +1,54 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+
+from djangobmf.conf import settings
+from djangobmf.core.tasks import task
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@task(key='report:prerender:{0}.{1}:{2}:{3}')
+def prerender_reports(app_label, model_name, pk, state):
+    model = apps.get_model(app_label, model_name)
+    module = apps.get_app_config(settings.APP_LABEL).get_module(model)
+
+    try:
+        obj = model._default_manager.get(pk=pk)
+    except model.DoesNotExist:
+        return
+
+    count = module.prerender_object_reports(obj, state)
+    logger.debug('Rendered %s reports of %s (pk: %s)', count, model_name, pk)
+
+
+@task(key='report:snapshot:{0}')
+def create_report_snapshot(pk):
+    from djangobmf.core.report import create_snapshot
+
+    Report = apps.get_model(settings.APP_LABEL, 'Report')
+    try:
+        report = Report.objects.get(pk=pk)
+    except Report.DoesNotExist:
+        return
+
+    snapshot = create_snapshot(report)
+    logger.debug('Created snapshot %s of report %s', snapshot.pk, pk)
+
+
+@task(retries=0)
+def render_report_batch(app_label, model_name, slug, pks, filetype, name):
+    from djangobmf.core.report import create_batch
+    from djangobmf.core.report import purge_batches
+
+    model = apps.get_model(app_label, model_name)
+    try:
+        create_batch(model, slug, pks, filetype, name)
+    except Exception:
+        # the batch is marked as failed
+        logger.exception('Can not render the batch %s', name)
+    purge_batches()
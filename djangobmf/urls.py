@@ -18,10 +18,17 @@ from django.views.decorators.http import last_modified
 
 from djangobmf import get_version
 from djangobmf.core.views.activity import View as APIActivityListView
+from djangobmf.core.views.batch import View as APIBatchView
+from djangobmf.core.views.changes import View as APIChangesView
 from djangobmf.core.views.detail import View as APIDetailView
 from djangobmf.core.views.document import View as APIDocumentsView
+from djangobmf.core.views.export import View as APIExportView
 from djangobmf.core.views.related import View as APIRelatedView
+from djangobmf.core.views.report import BatchDownloadView as APIReportBatchDownloadView
+from djangobmf.core.views.report import BatchView as APIReportBatchView
+from djangobmf.core.views.report import SnapshotView as APIReportSnapshotView
 from djangobmf.core.views.report import View as APIReportView
+from djangobmf.core.views.search import View as APISearchView
 from djangobmf.sites import site
 from djangobmf.views import Index
 from djangobmf.views.jwt import JSONWebTokenAPIView
@@ -124,6 +131,20 @@ urlpatterns = patterns(
         ),
         name="api-jwt",
     ),
+    url(
+        r'^api/batch/$',
+        never_cache(
+            APIBatchView.as_view()
+        ),
+        name="api-batch",
+    ),
+    url(
+        r'^api/search/$',
+        never_cache(
+            APISearchView.as_view()
+        ),
+        name="api-search",
+    ),
     url(
         r'^api/data/(?P<app>[\w-]+)/(?P<model>[\w-]+)/$',
         never_cache(
@@ -146,12 +167,51 @@ urlpatterns = patterns(
         name="api-related",
     ),
     url(
-        r'^api/report/(?P<app>[\w]+)/(?P<model>[\w]+)/(?P<slug>[\w_]+)/(?P<pk>[0-9]+)/$',
+        r'^api/export/(?P<app>[\w]+)/(?P<model>[\w]+)/(?P<filetype>csv|ndjson)/$',
+        never_cache(
+            APIExportView.as_view()
+        ),
+        name="api-export",
+    ),
+    url(
+        r'^api/changes/(?P<app>[\w]+)/(?P<model>[\w]+)/$',
         never_cache(
-            APIReportView.as_view()
+            APIChangesView.as_view()
         ),
+        name="api-changes",
+    ),
+    url(
+        r'^api/report/(?P<app>[\w]+)/(?P<model>[\w]+)/(?P<slug>[\w_]+)/(?P<pk>[0-9]+)/$',
+        # the report sets its own cache headers
+        APIReportView.as_view(),
         name="api-report",
     ),
+    url(
+        r'^api/report/(?P<app>[\w]+)/(?P<model>[\w]+)/(?P<slug>[\w_]+)/batch/(?P<filetype>pdf|zip)/$',
+        never_cache(
+            APIReportBatchView.as_view()
+        ),
+        name="api-report-batch",
+    ),
+    url(
+        r'^api/report/batch/(?P<token>[0-9a-f]{32})\.(?P<filetype>pdf|zip)$',
+        never_cache(
+            APIReportBatchDownloadView.as_view()
+        ),
+        name="api-report-batch-download",
+    ),
+    url(
+        r'^api/report/(?P<app>[\w]+)/(?P<model>[\w]+)/(?P<slug>[\w_]+)/snapshot/$',
+        # the snapshot sets its own cache headers
+        APIReportSnapshotView.as_view(),
+        name="api-report-snapshot",
+    ),
+    url(
+        r'^api/report/(?P<app>[\w]+)/(?P<model>[\w]+)/(?P<slug>[\w_]+)/snapshot/dataset/$',
+        APIReportSnapshotView.as_view(),
+        name="api-report-snapshot-dataset",
+        kwargs={'dataset': True},
+    ),
     url(
         r'^api/activity/(?P<app>[\w]+)/(?P<model>[\w]+)/(?P<pk>[0-9]+)/$',
         never_cache(
@@ -220,6 +280,26 @@ urlpatterns = patterns(
         }),
         name="api-documents",
     ),
+    url(
+        r'^api/documents/upload/$',
+        APIDocumentsView.as_view({'post': 'upload_create'}),
+        name="api-document-upload",
+    ),
+    url(
+        r'^api/documents/upload/(?P<app>[\w]+)/(?P<model>[\w]+)/(?P<pk>[0-9]+)/$',
+        APIDocumentsView.as_view({'post': 'upload_create'}),
+        name="api-document-upload",
+    ),
+    url(
+        r'^api/documents/upload/(?P<token>[0-9a-f]{32})/$',
+        APIDocumentsView.as_view({
+            'get': 'upload_status',
+            'put': 'upload_chunk',
+            'post': 'upload_finish',
+            'delete': 'upload_abort',
+        }),
+        name="api-document-upload",
+    ),
     url(
         r'^api/documents/(?P<pk>[0-9]+)/download/$',
         APIDocumentsView.as_view({
@@ -227,6 +307,13 @@ urlpatterns = patterns(
         }),
         name="api-document-download",
     ),
+    url(
+        r'^api/documents/(?P<pk>[0-9]+)/preview/(?P<size>[\w]+)/$',
+        APIDocumentsView.as_view({
+            'get': 'preview',
+        }),
+        name="api-document-preview",
+    ),
 
     # --- Configuration
     url(
@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+import datetime
+
+
+class CronSchedule(object):
+    """
+    Parses a cron expression with the five fields minute, hour, day of month,
+    month and day of week (0 or 7 is sunday). Every field can be a ``*``, a
+    number, a range (``1-5``), a step (``*/15``, ``8-18/2``) or a comma
+    separated list of these.
+    """
+
+    ranges = (
+        (0, 59),  # minute
+        (0, 23),  # hour
+        (1, 31),  # day of month
+        (1, 12),  # month
+        (0, 7),  # day of week
+    )
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError('A cron expression needs five fields: %s' % expression)
+
+        values = [self.parse(field, *limits) for field, limits in zip(fields, self.ranges)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = values
+
+        # sunday is 0 and 7
+        if 7 in self.weekdays:
+            self.weekdays.add(0)
+
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def parse(self, field, minimum, maximum):
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step = part.split('/', 1)
+                step = int(step)
+                if step < 1:
+                    raise ValueError('Invalid step: %s' % field)
+
+            if part == '*':
+                start, end = minimum, maximum
+            elif '-' in part:
+                start, end = [int(i) for i in part.split('-', 1)]
+            else:
+                start = end = int(part)
+
+            if start < minimum or end > maximum or start > end:
+                raise ValueError('Invalid value: %s' % field)
+
+            values.update(range(start, end + 1, step))
+        return values
+
+    def match_day(self, date):
+        weekday = date.isoweekday() % 7
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return weekday in self.weekdays
+        if self.any_weekday:
+            return date.day in self.days
+        # cron matches either field, if both are restricted
+        return date.day in self.days or weekday in self.weekdays
+
+    def next(self, after):
+        """
+        returns the first (naive) datetime after ``after``, which matches
+        """
+        dt = after.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        limit = dt + datetime.timedelta(days=366 * 5)
+
+        while dt < limit:
+            if dt.month not in self.months:
+                if dt.month == 12:
+                    dt = dt.replace(year=dt.year + 1, month=1, day=1, hour=0, minute=0)
+                else:
+                    dt = dt.replace(month=dt.month + 1, day=1, hour=0, minute=0)
+                continue
+
+            if not self.match_day(dt):
+                dt = dt.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+                continue
+
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + datetime.timedelta(hours=1)
+                continue
+
+            if dt.minute not in self.minutes:
+                dt += datetime.timedelta(minutes=1)
+                continue
+
+            return dt
+
+        raise ValueError('The cron expression never matches')
@@ -18,6 +18,10 @@ def payload_handler(user):
         'exp': datetime.utcnow() + timedelta(seconds=settings.AUTH_EXPIRATION_DELTA),
     }
 
+    if settings.AUTH_STATELESS:
+        from djangobmf.core.identity import get_claims
+        payload.update(get_claims(user))
+
     if settings.AUTH_AUDIENCE is not None:
         payload['aud'] = settings.AUTH_AUDIENCE
 
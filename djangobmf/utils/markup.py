@@ -0,0 +1,62 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from djangobmf.utils.markdown.urlize import UrlizeExtension
+from djangobmf.utils.markdown.checklist import ChecklistExtension
+from djangobmf.utils.markdown.strikethrough import StrikeThroughExtension
+
+import hashlib
+import threading
+
+import markdown
+
+
+# markdown instances are not thread safe, every thread compiles its own
+_local = threading.local()
+
+
+def get_markdown():
+    """
+    returns the markdown instance with the bmf extensions of this thread
+    """
+    md = getattr(_local, 'markdown', None)
+    if md is None:
+        md = markdown.Markdown(
+            extensions=[
+                UrlizeExtension(),
+                StrikeThroughExtension(),
+                ChecklistExtension(),
+                'smart_strong',
+                'sane_lists',
+                'smarty',
+                'fenced_code',
+            ],
+            output_format="html5",
+            save_mode='escape',
+            smart_emphasis=True,
+            lazy_ol=True,
+        )
+        _local.markdown = md
+    return md
+
+
+def render_markdown(text):
+    """
+    returns the html of a markdown text
+    """
+    if not text:
+        return ''
+    md = get_markdown()
+    try:
+        return md.convert(text)
+    finally:
+        md.reset()
+
+
+def markdown_hash(text):
+    """
+    returns the hash of a markdown text, which identifies its rendered html
+    """
+    return hashlib.sha1((text or '').encode('utf-8')).hexdigest()
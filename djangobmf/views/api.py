@@ -19,11 +19,13 @@ from djangobmf.conf import settings as bmfsettings
 from djangobmf.models import Notification
 from djangobmf.filters import ViewFilterBackend
 from djangobmf.filters import RangeFilterBackend
+from djangobmf.filters import SearchFilterBackend
 from djangobmf.permissions import ModuleViewPermission
 from djangobmf.permissions import NotificationPermission
 from djangobmf.pagination import ModulePagination
 from djangobmf.core.serializers.notification import NotificationViewSerializer
 from djangobmf.core.serializers.notification import NotificationListSerializer
+from djangobmf.core.serializers.values import ValuesSerializer
 # from djangobmf.core.pagination import NotificationPagination
 from djangobmf.views.mixins import BaseMixin
 
@@ -56,6 +58,32 @@ class ModelMixin(object):
         return self.get_bmfmodel()._bmfmeta.serializer_class
 
 
+class ValuesListModelMixin(ListModelMixin):
+    """
+    List a queryset via ``values_list``, if the serializer can be compiled
+    to a ``ValuesSerializer``. Falls back to the serializer otherwise.
+    """
+    use_values_serializer = True
+
+    def get_values_serializer(self):
+        if not self.use_values_serializer:
+            return None
+        return ValuesSerializer.compile(self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        if serializer is None:
+            return super(ValuesListModelMixin, self).list(request, *args, **kwargs)
+
+        queryset = serializer.get_queryset(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+
+        return Response(serializer.to_representation(queryset))
+
+
 class APIIndex(APIView):
     """
     All registered modules and views which are viewable by the current user
@@ -233,20 +261,20 @@ class APIViewDetail(BaseMixin, APIView):
         return Response(context)
 
 
-class ViewSet(ModelMixin, BaseMixin, ListModelMixin, RetrieveModelMixin, GenericViewSet):
+class ViewSet(ModelMixin, BaseMixin, ValuesListModelMixin, RetrieveModelMixin, GenericViewSet):
     permission_classes = [
         ModuleViewPermission,
     ]
-    filter_backends = (ViewFilterBackend, RangeFilterBackend)
+    filter_backends = (ViewFilterBackend, RangeFilterBackend, SearchFilterBackend)
     pagination_class = ModulePagination
     paginate_by = 100
 
 
-class APIModuleListView(ModelMixin, BaseMixin, ListModelMixin, CreateModelMixin, GenericAPIView):
+class APIModuleListView(ModelMixin, BaseMixin, ValuesListModelMixin, CreateModelMixin, GenericAPIView):
     permission_classes = [
         ModuleViewPermission,
     ]
-    filter_backends = (ViewFilterBackend, RangeFilterBackend)
+    filter_backends = (ViewFilterBackend, RangeFilterBackend, SearchFilterBackend)
     pagination_class = ModulePagination
     paginate_by = 100
 
@@ -315,7 +343,8 @@ class NotificationListAPI(NotificationMixin, ListModelMixin, GenericAPIView):
 
     def get_queryset(self):
         queryset = super(NotificationListAPI, self).get_queryset()
-        return queryset.prefetch_related('watch_object').exclude(watch_id__isnull=True)
+        # the title and url are stored on the notification
+        return queryset.exclude(watch_id__isnull=True)
 
     def get(self, request, *args, **kwargs):
             return self.list(request, *args, **kwargs)
@@ -21,6 +21,8 @@ from djangobmf import get_version
 from djangobmf.authentication import JWTAuthentication
 from djangobmf.conf import settings as bmfsettings
 from djangobmf.core.employee import Employee
+from djangobmf.core.search import construct_search
+from djangobmf.core.search import normalize_query
 from djangobmf.decorators import login_required
 from djangobmf.permissions import AjaxPermission
 from djangobmf.utils.serializers import DjangoBMFEncoder
@@ -161,7 +163,9 @@ class BaseMixin(object):
         # setattr(self.request, 'djangobmf_site', self.request.djangobmf_appconfig.site)
 
         # add the authenticated user and employee to the request (as a lazy queryset)
-        self.request.user.djangobmf = Employee(self.request.user)
+        # the employee is reused, if it was already loaded (i.e. by a batch request)
+        if not isinstance(getattr(self.request.user, 'djangobmf', None), Employee):
+            Employee(self.request.user)
 
         # TODO ... call check_object_permission instead when objects have a model
         try:
@@ -358,8 +362,9 @@ class ModuleBaseMixin(object):
                 }
             )
 
-        # load employee and team data into user
-        self.request.user.djangobmf = Employee(self.request.user)
+        # load employee and team data into user (if it was not loaded yet)
+        if not isinstance(getattr(self.request.user, 'djangobmf', None), Employee):
+            Employee(self.request.user)
 
         return self.module.permissions().filter_queryset(qs, self.request.user)
 
@@ -445,9 +450,7 @@ class ModuleSearchMixin(object):
     Adds the methods ``normalize_query`` and ``construct_search``
     """
 
-    def normalize_query(
-            self, query_string, findterms=re.compile(r'"([^"]+)"|(\S+)').findall,
-            normspace=re.compile(r'\s{2,}').sub):
+    def normalize_query(self, query_string):
         '''
         Splits the query string in invidual keywords, getting rid of unecessary spaces
         and grouping quoted words together.
@@ -457,18 +460,11 @@ class ModuleSearchMixin(object):
         ['some', 'random', 'words', 'with quotes', 'and', 'spaces']
 
         '''
-        return [normspace(' ', (t[0] or t[1]).strip()) for t in findterms(query_string)]
+        return normalize_query(query_string)
 
     # Apply keyword searches.
     def construct_search(self, field_name):
-        if field_name.startswith('^'):
-            return "%s__istartswith" % field_name[1:]
-        elif field_name.startswith('='):
-            return "%s__iexact" % field_name[1:]
-        elif field_name.startswith('@'):
-            return "%s__search" % field_name[1:]
-        else:
-            return "%s__icontains" % field_name
+        return construct_search(field_name)
 
 
 class ModuleFormMixin(object):
@@ -14,7 +14,6 @@ from django.core.exceptions import ImproperlyConfigured
 # from django.core.paginator import Paginator
 from django.core.urlresolvers import reverse as django_reverse
 from django.db import router
-from django.db.models import Q
 from django.forms.fields import CharField
 from django.forms.fields import FloatField
 from django.forms.fields import DecimalField
@@ -46,6 +45,7 @@ from .mixins import ModuleAjaxMixin
 from .mixins import ModuleFormMixin
 from .mixins import ReadOnlyMixin
 
+from djangobmf.core.search import autocomplete
 from djangobmf.permissions import AjaxPermission
 from djangobmf.permissions import ModuleClonePermission
 from djangobmf.permissions import ModuleCreatePermission
@@ -60,11 +60,9 @@ from djangobmf.signals import activity_update
 import copy
 # import datetime
 import logging
-import operator
 # import types
 # import warnings
 
-from functools import reduce
 # from django_filters.views import FilterView
 
 logger = logging.getLogger(__name__)
@@ -362,6 +360,9 @@ class ModuleFormAPI(ModuleFormMixin, ModuleAjaxMixin, ModuleSearchMixin, SingleO
     queryset = None
     form_view = None
 
+    # maximal number of objects returned by a search
+    autocomplete_limit = 20
+
     def get_object(self, queryset=None):
         """
         Returns the object the view is displaying.
@@ -475,14 +476,9 @@ class ModuleFormAPI(ModuleFormMixin, ModuleAjaxMixin, ModuleSearchMixin, SingleO
             if func:
                 qs = func(qs)
 
-            if self.request.POST['string']:
-                for bit in self.normalize_query(self.request.POST['string']):
-                    lookups = [self.construct_search(str(f)) for f in qs.model._bmfmeta.search_fields]
-                    queries = [Q(**{l: bit}) for l in lookups]
-                    qs = qs.filter(reduce(operator.or_, queries))
             data = []
-            for item in qs:
-                data.append({'pk': item.pk, 'value': str(item)})
+            for pk, label in autocomplete(qs, self.request.POST['string'], self.autocomplete_limit):
+                data.append({'pk': pk, 'value': label})
             return self.render_to_json_response(data)
 
         if "changed" in self.request.GET:
@@ -4,14 +4,28 @@
 from __future__ import unicode_literals
 
 # from django.contrib.contenttypes.models import ContentType
+from django.http import FileResponse
 from django.http import HttpResponse
+from django.http import HttpResponseNotModified
+from django.http import StreamingHttpResponse
+from django.utils import six
+from django.utils.cache import add_never_cache_headers
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.utils.http import quote_etag
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import DetailView
 
 # from djangobmf.models import Report
+from djangobmf.core.report import get_artifact
+from djangobmf.core.report import get_artifact_version
+from djangobmf.core.report import save_artifact
 from djangobmf.permissions import ModuleViewPermission
+from djangobmf.storage import default_storage
 from djangobmf.views.mixins import ModuleViewMixin
 
+import mimetypes
+
 # from .mixins import ModuleViewPermissionMixin
 # from .mixins import ModuleViewMixin
 
@@ -38,6 +52,10 @@ class ReportBaseView(ModuleViewMixin, DetailView):
     # define the view's verbose name
     verbose_name = _("Report")
 
+    # workflow states, which render and store the report of an object, when
+    # they are reached (requires an asynchronous task backend)
+    prerender_states = []
+
     # specify a form_class which can add additional informations to the report
     # TODO: currently not working
     form_class = None
@@ -80,26 +98,115 @@ class ReportBaseView(ModuleViewMixin, DetailView):
                 grain
             )
 
-    def get_report(self, **kwargs):
+    def get_report_queryset(self):
+        """
+        returns the queryset of a report, which is not connected to an object
+        """
+        model = self.get_bmfmodel()
+        queryset = model._default_manager.all()
+        if self.request is not None:
+            queryset = model._bmfmeta.filter_queryset(queryset, self.request.user)
+        return queryset
+
+    def get_report_version(self):
         """
-        generates a report and returns a HttpResponse instance.
+        returns the version of the report, if it is stored after rendering
+        """
+        if not self.has_object or not self.kwargs.get('object') or not self.kwargs.get('slug'):
+            return None
+        return get_artifact_version(self.kwargs['object'], self.kwargs['renderer'])
+
+    def render_report(self, **kwargs):
+        """
+        renders the report and stores it, if it has a version. Returns the
+        tuple ``(suffix, mime, data, send)`` of the renderer
         """
         if "template_name" not in kwargs:
             kwargs["template_name"] = self.report_template_name()
 
+        if self.has_object and "object" not in kwargs:
+            kwargs["object"] = self.kwargs.get('object')
+
+        if not self.has_object and "queryset" not in kwargs:
+            kwargs["queryset"] = self.get_report_queryset()
+
         suffix, mime, data, send = self.kwargs['renderer'].render(**kwargs)
 
+        version = self.get_report_version()
+        if version and send and isinstance(data, bytes):
+            save_artifact(self.kwargs['object'], self.kwargs['slug'], version, suffix, data)
+
+        return suffix, mime, data, send
+
+    @classmethod
+    def prerender(cls, obj, renderer, slug):
+        """
+        renders and stores the report of an object outside of a request
+        """
+        view = cls()
+        view.request = None
+        view.args = ()
+        view.kwargs = {'object': obj, 'renderer': renderer, 'slug': slug}
+        return view.render_report()
+
+    @classmethod
+    def render_snapshot(cls, renderer, slug):
+        """
+        renders a report, which is not connected to an object, outside of a
+        request. The queryset is not filtered by a user
+        """
+        view = cls()
+        view.request = None
+        view.args = ()
+        view.kwargs = {'renderer': renderer, 'slug': slug}
+        return view.get_report_queryset(), view.render_report()
+
+    def get_report(self, **kwargs):
+        """
+        generates a report and returns a HttpResponse instance. Stored reports
+        are served with an ETag and without rendering them again.
+        """
+        version = self.get_report_version()
+        etag = quote_etag(version) if version else None
+
+        if_none_match = self.request.META.get('HTTP_IF_NONE_MATCH', None)
+        if etag and if_none_match and version in [e.strip('"') for e in parse_etags(if_none_match)]:
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, max_age=0)
+            return response
+
+        name = get_artifact(self.kwargs['object'], self.kwargs['slug'], version) if version else None
+
+        if name:
+            suffix = name.rsplit('.', 1)[-1]
+            send = True
+            response = FileResponse(default_storage.open(name, 'rb'))
+            response['Content-Type'] = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            response['Content-Length'] = default_storage.size(name)
+        else:
+            suffix, mime, data, send = self.render_report(**kwargs)
+            if isinstance(data, (bytes, six.text_type)):
+                response = HttpResponse(data)
+                response['Content-Length'] = len(data)
+            else:
+                # the renderer streams its output
+                response = StreamingHttpResponse(data)
+            response['Content-Type'] = mime
+
         filename = '%s.%s' % (self.get_filename(), suffix)
         disposition = self.get_disposition()
 
-        response = HttpResponse(data)
-        response['Content-Type'] = mime
-        response['Content-Length'] = len(data)
-
         if send and disposition:
             response['Content-Disposition'] = '%s; filename=%s' % (
                 disposition,
                 filename,
             )
 
+        if etag and send:
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, max_age=0)
+        else:
+            add_never_cache_headers(response)
+
         return response
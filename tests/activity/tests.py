@@ -8,12 +8,44 @@ from django.core.urlresolvers import reverse
 from django.contrib.contenttypes.models import ContentType
 
 from djangobmf.models import Activity
+from djangobmf.models import Configuration
+from djangobmf.models import ACTION_COMMENT
+from djangobmf.models import ACTION_UPDATED
 from djangobmf.utils.testcases import BaseTestCase
+from djangobmf.utils.testcases import TestCase
 
 
 class CoreTests(BaseTestCase):
     pass
 
+
+class HTMLTests(TestCase):
+
+    def setUp(self):  # noqa
+        obj = Configuration.objects.create(app_label='test', field_name='activity', value='0')
+        self.ct = ContentType.objects.get_for_model(Configuration)
+        self.pk = obj.pk
+        super(HTMLTests, self).setUp()
+
+    def test_comment(self):
+        activity = Activity.objects.create(parent_ct=self.ct, parent_id=self.pk, action=ACTION_COMMENT, text="*Test*")
+        activity = Activity.objects.get(pk=activity.pk)
+        self.assertEqual(activity.html, '<p><em>Test</em></p>')
+        self.assertEqual(activity.get_html(), activity.html)
+
+        activity.text = "**Test**"
+        activity.save()
+        self.assertEqual(activity.html, '<p><strong>Test</strong></p>')
+
+        # a changed text is rendered on its next read
+        Activity.objects.filter(pk=activity.pk).update(text="Test")
+        activity = Activity.objects.get(pk=activity.pk)
+        self.assertEqual(activity.get_html(), '<p>Test</p>')
+
+    def test_other_actions(self):
+        activity = Activity.objects.create(parent_ct=self.ct, parent_id=self.pk, action=ACTION_UPDATED, text="[]")
+        self.assertEqual(activity.html, None)
+
 #   def test_history(self):
 #       """
 #       """
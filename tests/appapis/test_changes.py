@@ -0,0 +1,98 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+
+from djangobmf.core.changes import Cursor
+from djangobmf.core.changes import get_changes
+from djangobmf.models import Tombstone
+from djangobmf.utils.testcases import TestCase
+
+from .models import TestView
+
+from datetime import timedelta
+
+
+class ChangesTests(TestCase):
+
+    def setUp(self):  # noqa
+        super(ChangesTests, self).setUp()
+        past = timezone.now() - timedelta(hours=1)
+        self.objects = [TestView.objects.create(field=str(i)) for i in range(5)]
+        TestView.objects.update(created=past, modified=past)
+
+    def test_cursor(self):
+        cursor = Cursor(timezone.now(), 12, 3)
+        parsed = Cursor.parse(str(cursor))
+        self.assertEqual(parsed.modified, cursor.modified)
+        self.assertEqual((parsed.pk, parsed.tombstone), (12, 3))
+
+        self.assertEqual(Cursor.parse('').modified, None)
+        self.assertEqual(str(Cursor()), '0-0-0')
+        with self.assertRaises(ValueError):
+            Cursor.parse('invalid')
+
+    def test_changes(self):
+        # the initial feed is returned in pages
+        changes, cursor, more = get_changes(TestView.objects.all(), Cursor(), 3, delay=0)
+        self.assertTrue(more)
+        self.assertEqual(changes, [('created', obj.pk) for obj in self.objects[:3]])
+
+        changes, cursor, more = get_changes(TestView.objects.all(), Cursor.parse(str(cursor)), 3, delay=0)
+        self.assertFalse(more)
+        self.assertEqual(changes, [('created', obj.pk) for obj in self.objects[3:]])
+
+        changes, cursor, more = get_changes(TestView.objects.all(), cursor, 3, delay=0)
+        self.assertEqual(changes, [])
+
+        # the delta contains the updated, new and deleted objects in order
+        self.objects[1].field_b = 'b'
+        self.objects[1].save()
+        self.objects[2].delete()
+        new = TestView.objects.create(field='new')
+
+        changes, cursor, more = get_changes(TestView.objects.all(), cursor, 10, delay=0)
+        self.assertEqual(changes, [
+            ('updated', self.objects[1].pk),
+            ('deleted', self.objects[2].pk),
+            ('created', new.pk),
+        ])
+
+        # the feed is filtered by the queryset
+        changes, cursor, more = get_changes(TestView.objects.exclude(pk=new.pk), Cursor(), 10, delay=0)
+        self.assertNotIn(('created', new.pk), changes)
+
+    def test_late_commit(self):
+        changes, cursor, more = get_changes(TestView.objects.all(), Cursor(), 10, delay=0, window=60)
+        self.assertEqual(len(changes), 5)
+
+        # an object of a transaction, which was committed late
+        late = TestView.objects.create(field='new')
+        TestView.objects.filter(pk=late.pk).update(modified=timezone.now() - timedelta(seconds=30))
+
+        changes, cursor, more = get_changes(TestView.objects.all(), cursor, 10, delay=0, window=60)
+        self.assertEqual(changes, [('created', late.pk)])
+
+        changes, cursor, more = get_changes(TestView.objects.all(), cursor, 10, delay=0, window=0)
+        self.assertEqual(changes, [('created', late.pk)])
+        changes, cursor, more = get_changes(TestView.objects.all(), cursor, 10, delay=0, window=0)
+        self.assertEqual(changes, [])
+
+    def test_restricted_tombstones(self):
+        ct = ContentType.objects.get_for_model(TestView)
+        Tombstone.objects.create(object_ct=ct, object_id=100)
+
+        changes, cursor, more = get_changes(TestView.objects.none(), Cursor(), 10, delay=0, restricted=False)
+        self.assertEqual(changes, [('deleted', 100)])
+
+        # new clients do not get the ids of deleted objects of filtered models
+        changes, cursor, more = get_changes(TestView.objects.none(), Cursor(), 10, delay=0, restricted=True)
+        self.assertEqual(changes, [])
+
+        synced = Cursor(timezone.now() - timedelta(seconds=30))
+        Tombstone.objects.create(object_ct=ct, object_id=101)
+        changes, cursor, more = get_changes(TestView.objects.none(), synced, 10, delay=0, restricted=True)
+        self.assertEqual(changes, [('deleted', 100), ('deleted', 101)])
@@ -7,6 +7,7 @@ from __future__ import unicode_literals
 from django.contrib.contenttypes.models import ContentType
 from django.core.urlresolvers import reverse
 
+from djangobmf.core.serializers.notification import NotificationListSerializer
 from djangobmf.models import Activity
 from djangobmf.models import ACTION_UPDATED
 from djangobmf.models import Notification
@@ -53,6 +54,36 @@ class NotificationTests(ModuleMixin, TestCase):
 
         self.assertEqual(Notification.objects.filter(watch_ct=self.ct, watch_id=obj.pk).count(), 2, "Counting notification objects")
 
+    def test_inbox_data(self):
+        self.prepare_model_tests()
+        obj = TestView.objects.create(field="b")
+        activity_create.send(sender=obj.__class__, instance=obj)
+
+        notification = Notification.objects.get(user=self.user2, watch_ct=self.ct, watch_id=obj.pk)
+        self.assertEqual(notification.title, '%s' % obj)
+        self.assertEqual(notification.url, reverse('djangobmf:api-notification', kwargs={
+            'app': obj._meta.app_label,
+            'model': obj._meta.model_name,
+            'pk': obj.pk,
+        }))
+
+        # the list is serialized without queries
+        with self.assertNumQueries(0):
+            data = NotificationListSerializer(notification).data
+        self.assertEqual(data['name'], notification.title)
+        self.assertEqual(data['api'], notification.url)
+        self.assertEqual(data['last_action'], 'created')
+
+        # the title is updated with a changed object
+        Notification.objects.filter(watch_ct=self.ct, watch_id=obj.pk).update(title='old')
+        obj.save()
+        self.assertEqual(Notification.objects.filter(watch_ct=self.ct, watch_id=obj.pk, title='old').count(), 2)
+
+        obj = TestView.objects.get(pk=obj.pk)
+        obj.field = 'c'
+        obj.save()
+        self.assertEqual(Notification.objects.filter(watch_ct=self.ct, watch_id=obj.pk, title='%s' % obj).count(), 2)
+
     @expectedFailure
     def test_model_comment(self):
         self.prepare_model_tests()
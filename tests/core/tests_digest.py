@@ -0,0 +1,75 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.contrib.contenttypes.models import ContentType
+from django.core import mail
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from djangobmf.core.digest import send_digests
+from djangobmf.models import Configuration
+from djangobmf.models import Notification
+from djangobmf.utils.testcases import TestCase
+
+from datetime import timedelta
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class DigestTests(TestCase):
+
+    def setUp(self):  # noqa
+        self.user = self.create_user("digest")
+        self.other = self.create_user("other")
+        ct = ContentType.objects.get_for_model(Configuration)
+        self.notifications = []
+        for i in range(3):
+            obj = Configuration.objects.create(app_label='test', field_name='digest%s' % i, value='0')
+            self.notifications.append(Notification.objects.create(
+                user=self.user,
+                watch_ct=ct,
+                watch_id=obj.pk,
+                unread=i < 2,
+                modified=timezone.now() - timedelta(minutes=1),
+            ))
+        super(DigestTests, self).setUp()
+
+    def test_send_digests(self):
+        self.assertEqual(send_digests(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
+        self.assertIn('digest0', mail.outbox[0].body)
+        self.assertIn('digest1', mail.outbox[0].body)
+        self.assertNotIn('digest2', mail.outbox[0].body)
+        self.assertEqual(len(mail.outbox[0].alternatives), 1)
+
+        # notifications are only sent once
+        self.assertEqual(send_digests(), 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+        # until they change again
+        notification = self.notifications[1]
+        notification.modified = timezone.now()
+        notification.save()
+
+        self.assertEqual(send_digests(), 1)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertNotIn('digest0', mail.outbox[1].body)
+        self.assertIn('digest1', mail.outbox[1].body)
+
+    def test_batches(self):
+        notification = self.notifications[0]
+        notification.pk = None
+        notification.user = self.other
+        notification.save()
+
+        self.assertEqual(send_digests(batch_size=1), 2)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), [self.other.email, self.user.email])
+
+    def test_plain_text(self):
+        Notification.objects.filter(pk=self.notifications[0].pk).update(title='Müller & Co')
+
+        self.assertEqual(send_digests(), 1)
+        self.assertIn('Müller & Co', mail.outbox[0].body)
+        self.assertNotIn('&amp;', mail.outbox[0].body)
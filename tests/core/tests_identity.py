@@ -0,0 +1,73 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.test.utils import override_settings
+
+from djangobmf.authentication import JWTAuthentication
+from djangobmf.conf import settings
+from djangobmf.core import identity
+from djangobmf.utils.jwt import payload_handler
+from djangobmf.utils.testcases import TestCase
+
+from rest_framework.exceptions import AuthenticationFailed
+
+
+@override_settings(BMF_AUTH_STATELESS=True)
+class StatelessTokenTests(TestCase):
+
+    def setUp(self):  # noqa
+        self.user = self.create_user("stateless")
+        self.employee = apps.get_model(settings.CONTRIB_EMPLOYEE).objects.get(user=self.user)
+        self.auth = JWTAuthentication()
+        identity._users.clear()
+        super(StatelessTokenTests, self).setUp()
+
+    def test_claims(self):
+        payload = payload_handler(self.user)
+        self.assertEqual(payload['uid'], self.user.pk)
+        self.assertEqual(payload['employee'], self.employee.pk)
+        self.assertEqual(payload['teams'], [])
+        self.assertEqual(payload['ver'], identity.get_version(self.user.pk))
+
+    def test_authenticate(self):
+        payload = payload_handler(self.user)
+        user = self.auth.authenticate_credentials(payload)
+        self.assertEqual(user.pk, self.user.pk)
+
+        with self.assertNumQueries(0):
+            user = self.auth.authenticate_credentials(payload)
+            self.assertEqual(user.djangobmf.employee.pk, self.employee.pk)
+            self.assertEqual(list(user.djangobmf.team), [])
+            self.assertFalse(user.has_perm('djangobmf.change_configuration'))
+
+    def test_revoke(self):
+        payload = payload_handler(self.user)
+        self.auth.authenticate_credentials(payload)
+
+        # a login does not revoke the token
+        self.user.save(update_fields=['last_login'])
+        self.auth.authenticate_credentials(payload)
+
+        self.user.is_staff = True
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(payload)
+
+        # a new token is valid
+        self.auth.authenticate_credentials(payload_handler(self.user))
+
+    def test_evicted_version(self):
+        payload = payload_handler(self.user)
+        identity.get_cache().delete(identity.VERSION_CACHE_KEY % self.user.pk)
+
+        # the user is loaded from the database
+        user = self.auth.authenticate_credentials(payload)
+        self.assertEqual(user.pk, self.user.pk)
+
+        # a new version revokes the old token
+        identity.bump_version(self.user.pk)
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(payload)
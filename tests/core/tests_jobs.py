@@ -0,0 +1,84 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from djangobmf.core import jobs
+from djangobmf.core import tasks
+from djangobmf.models import Job
+
+from datetime import timedelta
+
+
+calls = []
+
+
+@tasks.task(name='tests.core.jobs.append', key='append:{0}', retries=1)
+def append(value):
+    if value is None:
+        raise ValueError('no value')
+    calls.append(value)
+
+
+class JobTests(TestCase):
+
+    def setUp(self):  # noqa
+        del calls[:]
+        super(JobTests, self).setUp()
+
+    @override_settings(BMF_TASK_BACKEND='djangobmf.core.tasks.DatabaseBackend')
+    def test_dispatch(self):
+        self.assertTrue(tasks.is_async())
+        append(1)
+        append(1)
+        append(2)
+
+        # the second call is coalesced
+        self.assertEqual(Job.objects.count(), 2)
+        self.assertEqual(calls, [])
+
+        self.assertEqual(jobs.Worker(threads=1).run(burst=True), 2)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(Job.objects.count(), 0)
+
+    def test_claim(self):
+        job = jobs.enqueue(append, (1,))
+        self.assertEqual(job.key, 'append:1')
+
+        claimed = jobs.claim(limit=10, timeout=60)
+        self.assertEqual([j.pk for j in claimed], [job.pk])
+        self.assertEqual(claimed[0].attempts, 1)
+        self.assertEqual(claimed[0].key, None)
+
+        # the claimed job is hidden from other workers
+        self.assertEqual(jobs.claim(limit=10), [])
+
+        # the task can be queued again while the job is running
+        self.assertIsNotNone(jobs.enqueue(append, (1,)))
+
+    def test_visibility_timeout(self):
+        job = jobs.enqueue(append, (1,))
+        jobs.claim(limit=1, timeout=60)
+        Job.objects.filter(pk=job.pk).update(available=timezone.now() - timedelta(seconds=1))
+
+        claimed = jobs.claim(limit=1)
+        self.assertEqual(claimed[0].pk, job.pk)
+        self.assertEqual(claimed[0].attempts, 2)
+
+    def test_retry(self):
+        job = jobs.enqueue(append, (None,))
+
+        self.assertFalse(jobs.execute(jobs.claim()[0]))
+        job = Job.objects.get(pk=job.pk)
+        self.assertFalse(job.failed)
+        self.assertGreater(job.available, timezone.now())
+        self.assertIn('no value', job.error)
+
+        Job.objects.filter(pk=job.pk).update(available=timezone.now())
+        self.assertFalse(jobs.execute(jobs.claim()[0]))
+        self.assertTrue(Job.objects.get(pk=job.pk).failed)
+        self.assertEqual(jobs.claim(), [])
@@ -0,0 +1,98 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.contrib.contenttypes.models import ContentType
+from django.test.utils import override_settings
+
+from djangobmf.core import outbox
+from djangobmf.models import ACTION_CREATED
+from djangobmf.models import ACTION_UPDATED
+from djangobmf.models import Activity
+from djangobmf.models import Configuration
+from djangobmf.models import Event
+from djangobmf.models import Job
+from djangobmf.models import Notification
+from djangobmf.tasks.notification import djangobmf_user_watch
+from djangobmf.utils.testcases import TestCase
+
+from datetime import timedelta
+
+
+class OutboxTests(TestCase):
+
+    def setUp(self):  # noqa
+        self.user = self.create_user("user", is_superuser=True)
+        self.obj = Configuration.objects.create(app_label='test', field_name='outbox', value='0')
+        self.ct = ContentType.objects.get_for_model(Configuration)
+        self.events = []
+        self.consumers = list(outbox.consumers)
+        super(OutboxTests, self).setUp()
+
+    def tearDown(self):  # noqa
+        outbox.consumers[:] = self.consumers
+        super(OutboxTests, self).tearDown()
+
+    @override_settings(BMF_TASK_BACKEND='djangobmf.core.tasks.DatabaseBackend')
+    def test_drain(self):
+        @outbox.consumer
+        def consume(event):
+            self.events.append(event.action)
+
+        @outbox.consumer
+        def broken(event):
+            raise ValueError('broken consumer')
+
+        outbox.record_event(Configuration, self.obj, ACTION_CREATED, user=self.user)
+        outbox.record_event(Configuration, self.obj, ACTION_UPDATED, user=self.user, text='[]')
+
+        # the activities are created by the drainer
+        self.assertEqual(Activity.objects.filter(parent_ct=self.ct, parent_id=self.obj.pk).count(), 0)
+
+        self.assertEqual(outbox.drain(batch_size=1), 2)
+        self.assertEqual(self.events, [ACTION_CREATED, ACTION_UPDATED])
+        self.assertEqual(Event.objects.filter(processed__isnull=True).count(), 0)
+
+        activities = Activity.objects.filter(parent_ct=self.ct, parent_id=self.obj.pk).order_by('pk')
+        self.assertEqual([a.action for a in activities], [ACTION_CREATED, ACTION_UPDATED])
+        self.assertEqual(activities[1].text, '[]')
+
+        self.assertEqual(outbox.drain(), 0)
+
+        # processed events can be replayed
+        del self.events[:]
+        self.assertEqual(outbox.replay(0), 2)
+        self.assertEqual(self.events, [ACTION_CREATED, ACTION_UPDATED])
+
+    @override_settings(BMF_TASK_BACKEND='djangobmf.core.tasks.DatabaseBackend')
+    def test_notify_once(self):
+        Notification.objects.create(user=self.user, watch_ct=self.ct, watch_id=None)
+        outbox.record_event(Configuration, self.obj, ACTION_CREATED, user=self.user)
+        outbox.drain()
+
+        # the users are notified by the drainer, and not again by a job of the activity
+        self.assertEqual(Notification.objects.filter(watch_ct=self.ct, watch_id=self.obj.pk).count(), 1)
+        self.assertFalse(Job.objects.filter(task=djangobmf_user_watch.name).exists())
+
+    def test_sync(self):
+        # without a task queue, the events are processed immediately
+        outbox.record_event(Configuration, self.obj, ACTION_CREATED, user=self.user)
+        self.assertEqual(Activity.objects.filter(parent_ct=self.ct, parent_id=self.obj.pk).count(), 1)
+
+    def test_sync_pending(self):
+        # the events of other requests are left to the drainer
+        event = Event.objects.create(parent_ct=self.ct, parent_id=self.obj.pk, action=ACTION_UPDATED, text='[]')
+        outbox.record_event(Configuration, self.obj, ACTION_CREATED, user=self.user)
+
+        self.assertEqual(Event.objects.filter(processed__isnull=True).get().pk, event.pk)
+        self.assertEqual(outbox.drain(), 1)
+
+    @override_settings(BMF_TASK_BACKEND='djangobmf.core.tasks.DatabaseBackend')
+    def test_activity_date(self):
+        event = outbox.record_event(Configuration, self.obj, ACTION_CREATED, user=self.user)
+        Event.objects.filter(pk=event.pk).update(created=event.created - timedelta(hours=1))
+        outbox.drain()
+
+        activity = Activity.objects.get(parent_ct=self.ct, parent_id=self.obj.pk)
+        self.assertEqual(activity.modified, event.created - timedelta(hours=1))
@@ -0,0 +1,126 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.urlresolvers import reverse
+from django.test import override_settings
+from django.utils.six import StringIO
+
+from djangobmf.conf import settings
+from djangobmf.core.search import autocomplete
+from djangobmf.core.search import get_search_text
+from djangobmf.core.search import search_queryset
+from djangobmf.models import SearchIndex
+from djangobmf.utils.testcases import TestCase
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):  # noqa
+        super(SearchIndexTests, self).setUp()
+        self.model = apps.get_model(settings.CONTRIB_TEAM)
+        self.ct = ContentType.objects.get_for_model(self.model)
+
+    def get_index(self, obj):
+        return SearchIndex.objects.get(contenttype=self.ct, object_id=obj.pk)
+
+    def test_index_is_maintained(self):
+        obj = self.model.objects.create(name='Research Department')
+        self.assertEqual(self.get_index(obj).text, 'research department')
+        self.assertEqual(self.get_index(obj).label, 'Research Department')
+
+        obj.name = 'Sales'
+        obj.save()
+        self.assertEqual(self.get_index(obj).text, 'sales')
+        self.assertEqual(get_search_text(obj), 'sales')
+
+        pk = obj.pk
+        obj.delete()
+        self.assertFalse(SearchIndex.objects.filter(contenttype=self.ct, object_id=pk).exists())
+
+    def test_search(self):
+        obj1 = self.model.objects.create(name='Research Department')
+        obj2 = self.model.objects.create(name='Research Lab')
+        obj3 = self.model.objects.create(name='Sales North')
+        qs = self.model.objects.all()
+
+        self.assertEqual(set(search_queryset(qs, 'research')), set([obj1, obj2]))
+        self.assertEqual(set(search_queryset(qs, 'res dep')), set([obj1]))
+        self.assertEqual(set(search_queryset(qs, '"research lab"')), set([obj2]))
+        self.assertEqual(set(search_queryset(qs, 'nor')), set([obj3]))
+        self.assertEqual(set(search_queryset(qs, 'marketing')), set())
+        self.assertEqual(set(search_queryset(qs, '')), set([obj1, obj2, obj3]))
+
+    @override_settings(BMF_SEARCH_BACKEND='djangobmf.core.search.SearchBackend')
+    def test_search_substring(self):
+        # the full-text backends only match word prefixes
+        obj = self.model.objects.create(name='Research Department')
+        self.model.objects.create(name='Sales')
+        self.assertEqual(list(search_queryset(self.model.objects.all(), 'partm')), [obj])
+
+    def test_related_index(self):
+        model = apps.get_model(settings.CONTRIB_EMPLOYEE)
+        ct = ContentType.objects.get_for_model(model)
+        user = self.create_user('search', is_superuser=False)
+        obj = model.objects.get(user=user)
+
+        user.username = 'renamed'
+        user.save()
+        self.assertIn('renamed', SearchIndex.objects.get(contenttype=ct, object_id=obj.pk).text)
+        self.assertEqual(list(search_queryset(model.objects.all(), 'renamed')), [obj])
+
+    @override_settings(BMF_SEARCH_BACKEND=False)
+    def test_search_without_index(self):
+        obj1 = self.model.objects.create(name='Research Department')
+        self.model.objects.create(name='Sales')
+        self.assertFalse(SearchIndex.objects.filter(contenttype=self.ct).exists())
+        self.assertEqual(list(search_queryset(self.model.objects.all(), 'research')), [obj1])
+
+    def test_autocomplete(self):
+        obj = self.model.objects.create(name='Research')
+        for i in range(5):
+            self.model.objects.create(name='Research %s' % i)
+        self.model.objects.create(name='Sales')
+        qs = self.model.objects.all()
+
+        self.assertEqual(autocomplete(qs, 'rese', 3)[0], (obj.pk, 'Research'))
+        self.assertEqual(len(autocomplete(qs, 'rese', 3)), 3)
+        self.assertEqual(len(autocomplete(qs, '', 3)), 3)
+        self.assertEqual(autocomplete(qs.exclude(pk=obj.pk), '"research"', 1)[0][1], 'Research 0')
+        self.assertEqual(autocomplete(qs, 'marketing', 3), [])
+
+    def test_autocomplete_ranks_all_matches(self):
+        for i in range(20):
+            self.model.objects.create(name='Xsale %s' % i)
+        obj = self.model.objects.create(name='Sales and Marketing Department')
+        qs = self.model.objects.all()
+
+        # the best match is longer than the other matches
+        self.assertEqual(autocomplete(qs, 'sale', 1), [(obj.pk, 'Sales and Marketing Department')])
+
+    def test_rebuild(self):
+        obj = self.model.objects.create(name='Research')
+        SearchIndex.objects.filter(contenttype=self.ct).delete()
+
+        out = StringIO()
+        call_command('bmf_search_index', settings.CONTRIB_TEAM, stdout=out)
+        self.assertIn('1 objects indexed', out.getvalue())
+        self.assertEqual(self.get_index(obj).text, 'research')
+
+    def test_list_api(self):
+        self.create_user("user", is_superuser=True)
+        self.client_login("user")
+        obj = self.model.objects.create(name='Research')
+        self.model.objects.create(name='Sales')
+
+        url = reverse('%s:api' % settings.APP_LABEL, kwargs={
+            'app': self.model._meta.app_label,
+            'model': self.model._meta.model_name,
+        })
+        r = self.client.get(url, {'search': 'rese'})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([i['pk'] for i in r.data['items']], [obj.pk])
@@ -0,0 +1,44 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+
+from rest_framework.renderers import JSONRenderer
+
+from djangobmf.conf import settings
+from djangobmf.core.serializers.values import ValuesSerializer
+from djangobmf.sites import config
+from djangobmf.utils.testcases import DemoDataMixin
+from djangobmf.utils.testcases import TestCase
+
+
+class ValuesSerializerTests(DemoDataMixin, TestCase):
+
+    def test_compiled_output(self):
+        renderer = JSONRenderer()
+
+        for model in config._modules:
+            serializer_class = model._bmfmeta.serializer_class
+            serializer = ValuesSerializer.compile(serializer_class())
+            if serializer is None:
+                continue
+
+            queryset = model.objects.order_by('pk')
+            self.assertEqual(
+                renderer.render(serializer.to_representation(serializer.get_queryset(queryset))),
+                renderer.render(serializer_class(queryset, many=True).data),
+                msg=model.__name__,
+            )
+
+    def test_method_fields_are_not_compiled(self):
+        model = apps.get_model(settings.CONTRIB_INVOICE)
+        serializer = model._bmfmeta.serializer_class()
+        self.assertIsNone(ValuesSerializer.compile(serializer))
+
+    def test_related_fields_are_compiled(self):
+        model = apps.get_model(settings.CONTRIB_PROJECT)
+        serializer = ValuesSerializer.compile(model._bmfmeta.serializer_class())
+        self.assertIsNotNone(serializer)
+        self.assertIn('customer__name', serializer.columns)
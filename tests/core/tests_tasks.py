@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.db import transaction
+from django.test import TestCase
+from django.test import TransactionTestCase
+from django.test.utils import override_settings
+
+from djangobmf.core import tasks
+from djangobmf.tasks import generate_sha1
+
+import threading
+
+
+class TaskTests(TestCase):
+
+    def test_registry(self):
+        self.assertIs(tasks.get_task('djangobmf.tasks.document.generate_sha1'), generate_sha1)
+        self.assertEqual(generate_sha1.__name__, 'generate_sha1')
+
+    def test_register(self):
+        @tasks.task(name='tests.core.add')
+        def add(a, b=1):
+            return a + b
+
+        self.assertIs(tasks.registry['tests.core.add'], add)
+        self.assertEqual(add.run(1, b=2), 3)
+
+    @override_settings(BMF_TASK_BACKEND=None, BMF_USE_CELERY=False)
+    def test_sync_backend(self):
+        @tasks.task(name='tests.core.add')
+        def add(a, b=1):
+            return a + b
+
+        self.assertFalse(tasks.is_async())
+        self.assertEqual(add(1, b=2), 3)
+
+    @override_settings(BMF_TASK_BACKEND='djangobmf.core.tasks.ThreadBackend')
+    def test_thread_backend(self):
+        calls = []
+
+        @tasks.task(name='tests.core.append')
+        def append(value):
+            calls.append(value)
+
+        self.assertTrue(tasks.is_async())
+        backend = tasks.get_backend()
+        self.assertIs(backend, tasks.get_backend())
+
+        backend.execute(append, (2,), {})
+        self.assertEqual(calls, [2])
+
+
+class TaskCommitTests(TransactionTestCase):
+
+    @override_settings(BMF_TASK_BACKEND='djangobmf.core.tasks.ThreadBackend')
+    def test_thread_dispatch(self):
+        calls = []
+        done = threading.Event()
+
+        @tasks.task(name='tests.core.append')
+        def append(value):
+            calls.append(value)
+            done.set()
+
+        with transaction.atomic():
+            append(1)
+            self.assertFalse(done.wait(0.1))
+
+        # django 1.8 runs the pending tasks when the request is finished
+        tasks.run_pending()
+        self.assertTrue(done.wait(5))
+        self.assertEqual(calls, [1])
+
+    def test_on_commit(self):
+        calls = []
+
+        with transaction.atomic():
+            tasks.on_commit(lambda: calls.append(1))
+            with transaction.atomic():
+                tasks.on_commit(lambda: calls.append(2))
+            self.assertEqual(calls, [])
+        tasks.run_pending()
+        self.assertEqual(calls, [1, 2])
+
+        tasks.on_commit(lambda: calls.append(3))
+        self.assertEqual(calls, [1, 2, 3])
+
+    def test_on_commit_rollback(self):
+        calls = []
+
+        try:
+            with transaction.atomic():
+                tasks.on_commit(lambda: calls.append(1))
+                raise ValueError()
+        except ValueError:
+            pass
+
+        with transaction.atomic():
+            tasks.on_commit(lambda: calls.append(2))
+            try:
+                with transaction.atomic():
+                    tasks.on_commit(lambda: calls.append(3))
+                    raise ValueError()
+            except ValueError:
+                pass
+
+        # only the function of the committed block is called
+        tasks.run_pending()
+        self.assertEqual(calls, [2])
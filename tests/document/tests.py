@@ -7,10 +7,22 @@ from __future__ import unicode_literals
 from django.test import LiveServerTestCase
 from django.core.urlresolvers import reverse
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
 
 # from djangobmf.models import Report
+from djangobmf.core.preview import check_call
 from djangobmf.models import Document
+from djangobmf.storage import ContentAddressedStorage
+from djangobmf.storage import TemporaryHashedFile
+from djangobmf.tasks.document import DocumentScanner
 from djangobmf.utils.testcases import BaseTestCase
+from djangobmf.utils.testcases import TestCase
+
+import hashlib
+import os
+import subprocess
+import sys
 
 
 class CoreTests(BaseTestCase):
@@ -55,3 +67,153 @@ class CoreTests(BaseTestCase):
 #       # cleanup
 #       for obj in query:
 #           obj.file.delete()
+
+
+class DocumentTests(TestCase):
+
+    def test_upload_is_hashed(self):
+        content = b'0123456789' * 10000
+        obj = Document(file=SimpleUploadedFile('test.txt', content))
+        obj.save()
+
+        obj = Document.objects.get(pk=obj.pk)
+        self.assertEqual(obj.sha1, hashlib.sha1(content).hexdigest())
+        self.assertEqual(obj.size, len(content))
+        self.assertEqual(obj.mimetype, 'text/plain')
+        self.assertTrue(obj.file_exists)
+
+        # changes to other fields keep the hash
+        obj.description = 'test'
+        obj.save()
+        self.assertEqual(Document.objects.get(pk=obj.pk).sha1, hashlib.sha1(content).hexdigest())
+
+        obj.file.delete(save=False)
+
+    def test_scanner(self):
+        content = b'0123456789' * 100
+        obj1 = Document(file=SimpleUploadedFile('test1.txt', content))
+        obj1.save()
+        obj2 = Document(file=SimpleUploadedFile('test2.txt', content))
+        obj2.save()
+        obj3 = Document(file=SimpleUploadedFile('test3.txt', content))
+        obj3.save()
+
+        Document.objects.filter(pk=obj1.pk).update(sha1='invalid', size=1)
+        obj2.file.storage.delete(obj2.file.name)
+
+        scanner = DocumentScanner(workers=2, batch_size=2)
+        self.assertEqual(scanner.scan(), (3, 2))
+
+        obj1 = Document.objects.get(pk=obj1.pk)
+        self.assertEqual(obj1.sha1, hashlib.sha1(content).hexdigest())
+        self.assertEqual(obj1.size, len(content))
+        self.assertTrue(obj1.file_exists)
+
+        obj2 = Document.objects.get(pk=obj2.pk)
+        self.assertFalse(obj2.file_exists)
+        self.assertEqual(obj2.sha1, None)
+
+        # a second scan changes nothing, a resumed scan starts after obj2
+        self.assertEqual(scanner.scan(), (3, 0))
+        scanner.cache.set('bmfdocumentscan.last', obj2.pk, None)
+        self.assertEqual(scanner.scan(resume=True), (1, 0))
+
+        obj1.file.delete(save=False)
+        obj3.file.delete(save=False)
+
+
+class RemovedBlobStorage(ContentAddressedStorage):
+    """
+    removes the first blob after writing it, like a concurrent gc
+    """
+    removed = False
+
+    def save_blob(self, content):
+        blob = super(RemovedBlobStorage, self).save_blob(content)
+        if not self.removed:
+            os.remove(blob)
+            self.removed = True
+        return blob
+
+
+class ContentAddressedStorageTests(TestCase):
+
+    def test_deduplication(self):
+        storage = ContentAddressedStorage()
+        content = b'0123456789' * 100
+        sha1 = hashlib.sha1(content).hexdigest()
+
+        name1 = storage.save('test/file.txt', ContentFile(content))
+        name2 = storage.save('test/file.txt', ContentFile(content))
+        self.assertNotEqual(name1, name2)
+        self.assertEqual(storage.references(sha1), 2)
+        self.assertEqual(os.stat(storage.path(name1)).st_ino, os.stat(storage.path(name2)).st_ino)
+
+        with storage.open(name2) as f:
+            self.assertEqual(f.read(), content)
+
+        storage.delete(name1)
+        self.assertEqual(storage.gc(grace=0), 0)
+        self.assertEqual(storage.references(sha1), 1)
+
+        storage.delete(name2)
+        self.assertEqual(storage.gc(grace=0), 1)
+        self.assertFalse(os.path.exists(storage.get_blob_path(sha1)))
+
+    def test_move_temporary_file(self):
+        storage = ContentAddressedStorage()
+        content = b'0123456789' * 100
+        sha1 = hashlib.sha1(content).hexdigest()
+
+        path = storage.path('test/upload')
+        storage.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(content)
+
+        temp = TemporaryHashedFile(path, sha1, len(content))
+        name = storage.save('test/file.txt', temp)
+        temp.close()
+
+        # the temporary file was moved to the blob
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(storage.references(sha1), 1)
+        with storage.open(name) as f:
+            self.assertEqual(f.read(), content)
+
+        storage.delete(name)
+        self.assertEqual(storage.gc(grace=0), 1)
+
+    def test_gc_grace(self):
+        storage = ContentAddressedStorage()
+        content = b'0123456789' * 100
+        sha1 = hashlib.sha1(content).hexdigest()
+
+        name = storage.save('test/file.txt', ContentFile(content))
+        storage.delete(name)
+
+        # a new blob could be linked by a running save
+        self.assertEqual(storage.gc(), 0)
+        self.assertTrue(os.path.exists(storage.get_blob_path(sha1)))
+        self.assertEqual(storage.gc(grace=0), 1)
+
+    def test_removed_blob(self):
+        storage = RemovedBlobStorage()
+        content = b'0123456789' * 100
+        sha1 = hashlib.sha1(content).hexdigest()
+
+        # the blob is written again, if it was removed before it was linked
+        name = storage.save('test/file.txt', ContentFile(content))
+        self.assertEqual(storage.references(sha1), 1)
+        with storage.open(name) as f:
+            self.assertEqual(f.read(), content)
+
+        storage.delete(name)
+        self.assertEqual(storage.gc(grace=0), 1)
+
+
+class PreviewTests(TestCase):
+
+    def test_timeout(self):
+        check_call([sys.executable, '-c', 'pass'], 10)
+        with self.assertRaises(subprocess.CalledProcessError):
+            check_call([sys.executable, '-c', 'import time; time.sleep(10)'], 0.1)
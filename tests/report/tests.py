@@ -9,8 +9,38 @@ from django.core.urlresolvers import reverse
 from django.contrib.contenttypes.models import ContentType
 
 # from djangobmf.models import Report
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from django.utils import translation
 
+from djangobmf.core.report import get_artifact
+from djangobmf.core.report import get_batch
+from djangobmf.core.report import get_batch_name
+from djangobmf.core.report import get_artifact_version
+from djangobmf.core.report import purge_batches
+from djangobmf.core.report import remove_stale_artifacts
+from djangobmf.core.report import save_artifact
+from djangobmf.conf import settings
+from djangobmf.core.report import write_zip
+from djangobmf.models import CSVRenderer
+from djangobmf.models import Document
+from djangobmf.models import PDFRenderer
+from djangobmf.models.report import make_aware
+from djangobmf.storage import default_storage
 from djangobmf.utils.testcases import BaseTestCase
+from djangobmf.utils.testcases import DemoDataMixin
+from djangobmf.utils.testcases import TestCase
+
+from datetime import datetime
+from datetime import timedelta
+from io import BytesIO
+
+import codecs
+import pytz
+import zipfile
+
 
 class CoreTests(BaseTestCase):
     pass
@@ -48,3 +78,144 @@ class CoreTests(BaseTestCase):
 #       r = self.client.get(reverse(namespace + ':report', None, None, {'pk': obj.pk}))
 #       self.assertEqual(r.status_code, 200)
 #       self.assertNotEqual(r._headers['content-type'][1], "application/pdf")
+
+
+class PDFRendererTests(TestCase):
+
+    def test_options_cache(self):
+        background = Document(file=SimpleUploadedFile('background.png', b'first'))
+        background.save()
+        renderer = PDFRenderer.objects.create(name='test', page_background=background)
+
+        encoded = codecs.encode(b'first', 'base64').decode().replace('\n', '')
+        self.assertEqual(renderer.get_options()['page_background'], encoded)
+
+        # the file is not read again, while its sha1 is unchanged
+        with open(background.file.path, 'wb') as f:
+            f.write(b'second')
+        renderer = PDFRenderer.objects.get(pk=renderer.pk)
+        self.assertEqual(renderer.get_options()['page_background'], encoded)
+
+        # a new sha1 invalidates the options
+        Document.objects.filter(pk=background.pk).update(sha1='changed')
+        encoded = codecs.encode(b'second', 'base64').decode().replace('\n', '')
+        self.assertEqual(renderer.get_options()['page_background'], encoded)
+
+        # changes to the renderer invalidate the options
+        renderer.size = 'A5'
+        renderer.save()
+        self.assertEqual(renderer.get_options()['size'], 'A5')
+
+        background.file.delete(save=False)
+
+    def test_artifacts(self):
+        obj = Document(file=SimpleUploadedFile('test.txt', b'test'))
+        obj.save()
+        renderer = PDFRenderer.objects.create(name='test')
+
+        version = get_artifact_version(obj, renderer)
+        self.assertTrue(version)
+        self.assertEqual(get_artifact(obj, 'test', version), None)
+
+        name = save_artifact(obj, 'test', version, 'pdf', b'report')
+        self.assertEqual(get_artifact(obj, 'test', version), name)
+
+        # a changed renderer creates a new version and removes the old one
+        renderer.size = 'A5'
+        renderer.save()
+        new_version = get_artifact_version(obj, renderer)
+        self.assertNotEqual(version, new_version)
+        self.assertEqual(get_artifact(obj, 'test', new_version), None)
+
+        save_artifact(obj, 'test', new_version, 'pdf', b'report')
+        self.assertEqual(get_artifact(obj, 'test', version), None)
+
+        self.assertEqual(remove_stale_artifacts(), 0)
+        obj.file.delete(save=False)
+        obj.delete()
+        self.assertEqual(remove_stale_artifacts(), 1)
+
+    def test_write_zip(self):
+        output = BytesIO()
+        write_zip([(1, 'pdf', b'first'), (2, None, None), (3, 'pdf', b'third')], output, 'invoice')
+
+        archive = zipfile.ZipFile(output)
+        self.assertEqual(archive.namelist(), ['invoice-1.pdf', 'invoice-3.pdf'])
+        self.assertEqual(archive.read('invoice-3.pdf'), b'third')
+
+    def test_make_aware(self):
+        tz = pytz.timezone('Europe/Berlin')
+
+        # skipped by the DST transition
+        value = make_aware(datetime(2016, 3, 27, 2, 30), tz)
+        self.assertEqual(value.replace(tzinfo=None), datetime(2016, 3, 27, 3, 30))
+        self.assertEqual(value.utcoffset(), timedelta(hours=2))
+
+        # repeated by the DST transition
+        value = make_aware(datetime(2016, 10, 30, 2, 30), tz)
+        self.assertEqual(value.utcoffset(), timedelta(hours=1))
+
+    def test_batches(self):
+        user = self.create_user('batch')
+        other = self.create_user('other')
+        token = 'a' * 32
+        name = get_batch_name(user, token, 'zip')
+
+        self.assertEqual(get_batch(user, token, 'zip'), (None, name))
+
+        default_storage.save(name + '.pending', ContentFile(b''))
+        self.assertEqual(get_batch(user, token, 'zip'), ('pending', name))
+        self.assertEqual(get_batch(other, token, 'zip')[0], None)
+
+        default_storage.save(name, ContentFile(b'data'))
+        default_storage.delete(name + '.pending')
+        self.assertEqual(get_batch(user, token, 'zip'), ('done', name))
+
+        self.assertEqual(purge_batches(), 0)
+        self.assertEqual(purge_batches(timezone.now() + timedelta(days=2)), 1)
+        self.assertEqual(get_batch(user, token, 'zip')[0], None)
+
+
+class ArtifactVersionTests(DemoDataMixin, TestCase):
+
+    def test_related_objects(self):
+        model = apps.get_model(settings.CONTRIB_INVOICE)
+        renderer = PDFRenderer.objects.create(name='test')
+        obj = model.objects.filter(invoice_products__isnull=False).distinct().first()
+        version = get_artifact_version(obj, renderer)
+
+        # a changed item invalidates the stored report of the invoice
+        item = obj.invoice_products.first()
+        item.save()
+        new_version = get_artifact_version(obj, renderer)
+        self.assertNotEqual(version, new_version)
+
+        item.delete()
+        self.assertNotEqual(get_artifact_version(obj, renderer), new_version)
+
+    def test_language(self):
+        model = apps.get_model(settings.CONTRIB_INVOICE)
+        renderer = PDFRenderer.objects.create(name='test')
+        obj = model.objects.first()
+
+        with translation.override('en'):
+            version = get_artifact_version(obj, renderer)
+        with translation.override('de'):
+            self.assertNotEqual(get_artifact_version(obj, renderer), version)
+
+
+class CSVRendererTests(DemoDataMixin, TestCase):
+
+    def test_render(self):
+        model = apps.get_model(settings.CONTRIB_PROJECT)
+        renderer = CSVRenderer.objects.create(name='test', delimiter=';')
+        renderer.chunk_size = 1
+
+        suffix, mime, data, send = renderer.render(queryset=model.objects.all())
+        self.assertEqual(suffix, 'csv')
+        self.assertTrue(send)
+        self.assertFalse(isinstance(data, (bytes, str)))
+
+        lines = ''.join(data).splitlines()
+        self.assertEqual(len(lines), model.objects.count() + 1)
+        self.assertTrue(lines[0].startswith('pk;'))
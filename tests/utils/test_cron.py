@@ -0,0 +1,49 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+# flake8: noqa
+
+from __future__ import unicode_literals
+
+from django.test import TestCase
+
+from djangobmf.utils.cron import CronSchedule
+
+import datetime
+
+
+class CronScheduleTests(TestCase):
+    def test_invalid(self):
+        for expression in ['', '* * * *', '60 * * * *', '* * 0 * *', '*/0 * * * *', '5-1 * * * *', 'a * * * *']:
+            with self.assertRaises(ValueError):
+                CronSchedule(expression)
+
+    def test_daily(self):
+        cron = CronSchedule('0 6 * * *')
+        self.assertEqual(cron.next(datetime.datetime(2016, 1, 1, 5, 59)), datetime.datetime(2016, 1, 1, 6, 0))
+        self.assertEqual(cron.next(datetime.datetime(2016, 1, 1, 6, 0)), datetime.datetime(2016, 1, 2, 6, 0))
+
+    def test_steps(self):
+        cron = CronSchedule('*/15 8-18/2 * * *')
+        self.assertEqual(cron.next(datetime.datetime(2016, 1, 1, 8, 1)), datetime.datetime(2016, 1, 1, 8, 15))
+        self.assertEqual(cron.next(datetime.datetime(2016, 1, 1, 8, 45)), datetime.datetime(2016, 1, 1, 10, 0))
+        self.assertEqual(cron.next(datetime.datetime(2016, 1, 1, 18, 45)), datetime.datetime(2016, 1, 2, 8, 0))
+
+    def test_weekdays(self):
+        # 2016-01-01 is a friday
+        cron = CronSchedule('30 7 * * 1-5')
+        self.assertEqual(cron.next(datetime.datetime(2016, 1, 1, 8, 0)), datetime.datetime(2016, 1, 4, 7, 30))
+        self.assertEqual(CronSchedule('0 0 * * 7').weekdays, set([0, 7]))
+
+    def test_day_or_weekday(self):
+        # both fields are restricted: either one matches
+        cron = CronSchedule('0 0 15 * 1')
+        self.assertEqual(cron.next(datetime.datetime(2016, 1, 1)), datetime.datetime(2016, 1, 4))
+        self.assertEqual(cron.next(datetime.datetime(2016, 1, 12)), datetime.datetime(2016, 1, 15))
+
+    def test_leap_year(self):
+        cron = CronSchedule('0 0 29 2 *')
+        self.assertEqual(cron.next(datetime.datetime(2017, 3, 1)), datetime.datetime(2020, 2, 29))
+
+    def test_never(self):
+        with self.assertRaises(ValueError):
+            CronSchedule('0 0 31 2 *').next(datetime.datetime(2016, 1, 1))
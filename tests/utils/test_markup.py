@@ -58,3 +58,9 @@ class MarkdownTests(TestCase):
         text = "<http://www.example.com>"
         out = markdown_filter(text)
         self.assertEqual(out, '<p><a href="http://www.example.com">http://www.example.com</a></p>')
+
+    def test_reused_instance(self):
+        text = "```\ncode\n```\n\n[ ] Test"
+        out = markdown_filter(text)
+        self.assertEqual(markdown_filter(text), out)
+        self.assertEqual(markdown_filter("Test"), '<p>Test</p>')
@@ -0,0 +1,41 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.urlresolvers import reverse
+
+from djangobmf.utils.testcases import TestCase
+
+import json
+
+
+class ViewBatchTests(TestCase):
+
+    def setUp(self):  # noqa
+        super(ViewBatchTests, self).setUp()
+        self.user = self.create_user("user", is_superuser=True)
+        self.client_login("user")
+
+    def batch(self, data):
+        return self.client.post(
+            reverse('djangobmf:api-batch'),
+            json.dumps(data),
+            content_type='application/json',
+        )
+
+    def test_batch(self):
+        count = reverse('djangobmf:api-notification', kwargs={'action': 'count'})
+        batch = reverse('djangobmf:api-batch')
+
+        r = self.batch([count, {'url': count}, batch, '/does/not/exist/'])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([i['status'] for i in r.data], [200, 200, 400, 404])
+        self.assertEqual(r.data[0]['data']['count'], 0)
+
+    def test_batch_invalid(self):
+        r = self.batch({'url': '/'})
+        self.assertEqual(r.status_code, 400)
+
+        r = self.batch([{'url': '/', 'method': 'POST'}])
+        self.assertEqual(r.status_code, 400)
@@ -0,0 +1,242 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.urlresolvers import reverse
+from django.test import override_settings
+from django.utils.http import http_date
+
+from djangobmf.core.preview import PILLOW
+from djangobmf.core.preview import get_preview_name
+from djangobmf.models import Document
+from djangobmf.models import DocumentUpload
+from djangobmf.storage import default_storage
+from djangobmf.utils.testcases import TestCase
+
+from io import BytesIO
+from unittest import skipUnless
+
+import calendar
+import hashlib
+import json
+
+
+class ViewDocumentDownloadTests(TestCase):
+
+    def setUp(self):  # noqa
+        super(ViewDocumentDownloadTests, self).setUp()
+        self.user = self.create_user("user", is_superuser=True)
+        self.client_login("user")
+
+        self.content = b'0123456789' * 100
+        self.obj = Document(file=SimpleUploadedFile('test.txt', self.content))
+        self.obj.save()
+        self.obj = Document.objects.get(pk=self.obj.pk)
+        self.url = reverse('djangobmf:api-document-download', kwargs={'pk': self.obj.pk})
+
+    def tearDown(self):  # noqa
+        self.obj.file.delete(save=False)
+        super(ViewDocumentDownloadTests, self).tearDown()
+
+    def test_download(self):
+        r = self.client.get(self.url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(b''.join(r.streaming_content), self.content)
+        self.assertEqual(r['ETag'], '"%s"' % self.obj.sha1)
+        self.assertEqual(r['Accept-Ranges'], 'bytes')
+        self.assertEqual(r['Content-Type'], 'text/plain')
+
+    def test_range(self):
+        r = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(r.status_code, 206)
+        self.assertEqual(b''.join(r.streaming_content), self.content[10:20])
+        self.assertEqual(r['Content-Range'], 'bytes 10-19/1000')
+        self.assertEqual(r['Content-Length'], '10')
+
+        r = self.client.get(self.url, HTTP_RANGE='bytes=990-')
+        self.assertEqual(r.status_code, 206)
+        self.assertEqual(b''.join(r.streaming_content), self.content[990:])
+
+        r = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(r.status_code, 206)
+        self.assertEqual(b''.join(r.streaming_content), self.content[-5:])
+
+        r = self.client.get(self.url, HTTP_RANGE='bytes=2000-')
+        self.assertEqual(r.status_code, 416)
+        self.assertEqual(r['Content-Range'], 'bytes */1000')
+
+        # If-Range does not match, the whole file is send
+        r = self.client.get(self.url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"outdated"')
+        self.assertEqual(r.status_code, 200)
+
+        r = self.client.get(self.url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"%s"' % self.obj.sha1)
+        self.assertEqual(r.status_code, 206)
+
+    def test_conditional(self):
+        r = self.client.get(self.url, HTTP_IF_NONE_MATCH='"%s"' % self.obj.sha1)
+        self.assertEqual(r.status_code, 304)
+
+        r = self.client.get(self.url, HTTP_IF_NONE_MATCH='"outdated"')
+        self.assertEqual(r.status_code, 200)
+
+        modified = calendar.timegm(self.obj.modified.utctimetuple())
+        r = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(modified))
+        self.assertEqual(r.status_code, 304)
+
+        r = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(modified - 60))
+        self.assertEqual(r.status_code, 200)
+
+    @override_settings(BMF_DOCUMENT_SENDTYPE='xaccel')
+    def test_xaccel(self):
+        r = self.client.get(self.url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.content, b'')
+        self.assertEqual(r['X-Accel-Redirect'], self.obj.file.url)
+        self.assertEqual(r['ETag'], '"%s"' % self.obj.sha1)
+
+    @override_settings(BMF_DOCUMENT_SENDTYPE='xsendfile')
+    def test_xsendfile(self):
+        r = self.client.get(self.url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.content, b'')
+        self.assertEqual(r['X-Sendfile'], self.obj.file.path)
+
+
+@skipUnless(PILLOW, 'Pillow is not installed')
+class ViewDocumentPreviewTests(TestCase):
+
+    def setUp(self):  # noqa
+        super(ViewDocumentPreviewTests, self).setUp()
+        self.user = self.create_user("user", is_superuser=True)
+        self.client_login("user")
+
+        from PIL import Image
+        buf = BytesIO()
+        Image.new('RGBA', (400, 200), (255, 0, 0, 128)).save(buf, 'PNG')
+
+        self.obj = Document(file=SimpleUploadedFile('test.png', buf.getvalue()))
+        self.obj.save()
+        self.obj = Document.objects.get(pk=self.obj.pk)
+        self.url = reverse('djangobmf:api-document-preview', kwargs={'pk': self.obj.pk, 'size': 'thumbnail'})
+
+    def tearDown(self):  # noqa
+        self.obj.file.delete(save=False)
+        for size in (128, 1024):
+            default_storage.delete(get_preview_name(self.obj.sha1, size))
+        super(ViewDocumentPreviewTests, self).tearDown()
+
+    def test_preview(self):
+        r = self.client.get(self.url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r['Content-Type'], 'image/jpeg')
+        self.assertEqual(r['ETag'], '"%s-128"' % self.obj.sha1)
+        self.assertIn('max-age', r['Cache-Control'])
+
+        from PIL import Image
+        image = Image.open(BytesIO(b''.join(r.streaming_content)))
+        self.assertEqual(image.size, (128, 64))
+
+        # all sizes were created from one rendering
+        self.assertTrue(default_storage.exists(get_preview_name(self.obj.sha1, 1024)))
+
+        r = self.client.get(self.url, HTTP_IF_NONE_MATCH=r['ETag'])
+        self.assertEqual(r.status_code, 304)
+
+    def test_preview_unknown(self):
+        url = reverse('djangobmf:api-document-preview', kwargs={'pk': self.obj.pk, 'size': 'unknown'})
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 404)
+
+        obj = Document(file=SimpleUploadedFile('test.txt', b'text'))
+        obj.save()
+        url = reverse('djangobmf:api-document-preview', kwargs={'pk': obj.pk, 'size': 'thumbnail'})
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 404)
+        obj.file.delete(save=False)
+
+    def test_serializer(self):
+        r = self.client.get(reverse('djangobmf:api-documents', kwargs={'pk': self.obj.pk}))
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.data['preview']['thumbnail'].endswith(self.url))
+
+
+class ViewDocumentUploadTests(TestCase):
+
+    def setUp(self):  # noqa
+        super(ViewDocumentUploadTests, self).setUp()
+        self.user = self.create_user("user", is_superuser=True)
+        self.client_login("user")
+        self.content = b'0123456789' * 100
+
+    def put(self, url, offset, data):
+        return self.client.put(
+            '%s?offset=%s' % (url, offset),
+            data=data,
+            content_type='application/octet-stream',
+        )
+
+    def test_upload(self):
+        r = self.client.post(
+            reverse('djangobmf:api-document-upload'),
+            json.dumps({'name': 'test.txt', 'size': len(self.content)}),
+            content_type='application/json',
+        )
+        self.assertEqual(r.status_code, 201)
+        url = reverse('djangobmf:api-document-upload', kwargs={'token': r.data['token']})
+
+        r = self.put(url, 0, self.content[:500])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data['offset'], 500)
+
+        # resend the first chunk
+        r = self.put(url, 0, self.content[:500])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data['offset'], 500)
+
+        # missing chunk
+        r = self.put(url, 700, self.content[700:])
+        self.assertEqual(r.status_code, 409)
+        self.assertEqual(r.data['offset'], 500)
+
+        r = self.client.post(url)
+        self.assertEqual(r.status_code, 400)
+
+        r = self.put(url, 500, self.content[500:])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data['offset'], 1000)
+
+        # the chunks are hashed when they are received
+        upload = DocumentUpload.objects.get(token=r.data['token'])
+        self.assertEqual(upload.sha1, hashlib.sha1(self.content).hexdigest())
+
+        r = self.client.post(url)
+        self.assertEqual(r.status_code, 201)
+        self.assertFalse(default_storage.exists(upload.temp_name))
+
+        obj = Document.objects.get(pk=r.data['pk'])
+        self.assertEqual(obj.sha1, hashlib.sha1(self.content).hexdigest())
+        self.assertEqual(obj.size, len(self.content))
+        self.assertTrue(obj.is_static)
+        obj.file.delete(save=False)
+
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 404)
+
+    def test_upload_abort(self):
+        r = self.client.post(
+            reverse('djangobmf:api-document-upload'),
+            json.dumps({'name': 'test.txt'}),
+            content_type='application/json',
+        )
+        url = reverse('djangobmf:api-document-upload', kwargs={'token': r.data['token']})
+
+        r = self.put(url, 0, self.content)
+        self.assertEqual(r.status_code, 200)
+
+        r = self.client.delete(url)
+        self.assertEqual(r.status_code, 204)
+
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 404)
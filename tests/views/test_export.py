@@ -0,0 +1,52 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.core.urlresolvers import reverse
+
+from djangobmf.conf import settings
+from djangobmf.core.views.export import View
+from djangobmf.utils.testcases import DemoDataMixin
+from djangobmf.utils.testcases import TestCase
+
+import json
+
+
+class ViewExportTests(DemoDataMixin, TestCase):
+
+    def setUp(self):  # noqa
+        super(ViewExportTests, self).setUp()
+        self.user = self.create_user("user", is_superuser=True)
+        self.client_login("user")
+        self.model = apps.get_model(settings.CONTRIB_PROJECT)
+
+    def get_url(self, filetype):
+        return reverse('djangobmf:api-export', kwargs={
+            'app': self.model._meta.app_label,
+            'model': self.model._meta.model_name,
+            'filetype': filetype,
+        })
+
+    def test_export_csv(self):
+        r = self.client.get(self.get_url('csv'))
+        self.assertEqual(r.status_code, 200)
+        lines = b''.join(r.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), self.model.objects.count() + 1)
+        self.assertTrue(lines[0].startswith('pk,'))
+
+    def test_export_ndjson(self):
+        # use more than one chunk
+        View.chunk_size, chunk_size = 1, View.chunk_size
+        try:
+            r = self.client.get(self.get_url('ndjson'))
+            self.assertEqual(r.status_code, 200)
+            rows = [json.loads(line) for line in b''.join(r.streaming_content).decode('utf-8').splitlines()]
+        finally:
+            View.chunk_size = chunk_size
+
+        self.assertEqual(
+            [row['pk'] for row in rows],
+            list(self.model.objects.order_by('pk').values_list('pk', flat=True)),
+        )
@@ -0,0 +1,62 @@
+#!/usr/bin/python
+# ex:set fileencoding=utf-8:
+
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.core.urlresolvers import reverse
+from django.test import override_settings
+
+from djangobmf.conf import settings
+from djangobmf.utils.testcases import TestCase
+
+
+class ViewSearchTests(TestCase):
+
+    def setUp(self):  # noqa
+        super(ViewSearchTests, self).setUp()
+        self.model = apps.get_model(settings.CONTRIB_TEAM)
+        self.obj1 = self.model.objects.create(name='Garden Research')
+        self.obj2 = self.model.objects.create(name='Research')
+        self.model.objects.create(name='Sales')
+
+    def search(self, query, **kwargs):
+        kwargs['q'] = query
+        return self.client.get(reverse('djangobmf:api-search'), kwargs)
+
+    def get_items(self, response):
+        for result in response.data['results']:
+            if result['model'] == self.model._meta.model_name:
+                return [item['pk'] for item in result['items']]
+        return []
+
+    def test_search(self):
+        self.create_user("user", is_superuser=True)
+        self.client_login("user")
+
+        r = self.search('research')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self.get_items(r), [self.obj2.pk, self.obj1.pk])
+
+        r = self.search('research', limit=1)
+        self.assertEqual(self.get_items(r), [self.obj2.pk])
+
+        r = self.search('')
+        self.assertEqual(r.data['results'], [])
+
+    @override_settings(BMF_SEARCH_BACKEND=False)
+    def test_search_without_index(self):
+        self.create_user("user", is_superuser=True)
+        self.client_login("user")
+
+        r = self.search('research')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(set(self.get_items(r)), set([self.obj1.pk, self.obj2.pk]))
+
+    def test_search_permissions(self):
+        self.create_user("user")
+        self.client_login("user")
+
+        r = self.search('research')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data['results'], [])